@@ -7,8 +7,11 @@ from backend.database import (
     init_connection_pool,
     get_db_connection,
     get_db_cursor,
+    get_read_connection,
+    get_read_cursor,
     close_connection_pool,
-    test_connection
+    test_connection,
+    PoolSaturatedError,
 )
 
 __all__ = [
@@ -16,6 +19,9 @@ __all__ = [
     'init_connection_pool',
     'get_db_connection',
     'get_db_cursor',
+    'get_read_connection',
+    'get_read_cursor',
     'close_connection_pool',
     'test_connection',
+    'PoolSaturatedError',
 ]
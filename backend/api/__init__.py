@@ -13,6 +13,9 @@ from backend.api.otp import router as otp_router
 from backend.api.predictions import router as predictions_router
 from backend.api.weather import router as weather_router
 from backend.api.auto_predictor import router as auto_predictor_router
+from backend.api.metrics import router as metrics_router
+from backend.api.observations import router as observations_router
+from backend.api.bootstrap import router as bootstrap_router
 
 __all__ = [
     'users_router',
@@ -25,4 +28,7 @@ __all__ = [
     'predictions_router',
     'weather_router',
     'auto_predictor_router',
+    'metrics_router',
+    'observations_router',
+    'bootstrap_router',
 ]
@@ -6,7 +6,8 @@ from fastapi import APIRouter, HTTPException, status
 from typing import List
 
 from backend.models.admin import Admin, AdminCreate, AdminUpdate, AdminResponse
-from backend.database import get_db_cursor
+from backend.database import PoolSaturatedError
+from backend.async_database import get_async_cursor
 
 router = APIRouter(prefix="/api/admins", tags=["Admin Management"])
 
@@ -15,17 +16,17 @@ router = APIRouter(prefix="/api/admins", tags=["Admin Management"])
 async def create_admin(admin_data: AdminCreate):
     """Create a new admin"""
     try:
-        with get_db_cursor() as cur:
+        async with get_async_cursor() as cur:
             # Check if admin with same email already exists
-            cur.execute("SELECT id FROM admin WHERE email = %s", (admin_data.email,))
-            if cur.fetchone():
+            await cur.execute("SELECT id FROM admin WHERE email = %s", (admin_data.email,))
+            if await cur.fetchone():
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Admin with this email already exists"
                 )
             
             # Insert new admin
-            cur.execute("""
+            await cur.execute("""
                 INSERT INTO admin (email, role, username, uid)
                 VALUES (%s, %s, %s, %s)
                 RETURNING id, email, role, username, uid
@@ -36,11 +37,13 @@ async def create_admin(admin_data: AdminCreate):
                 admin_data.uid
             ))
             
-            new_admin = cur.fetchone()
+            new_admin = await cur.fetchone()
             return Admin(**new_admin)
             
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -52,11 +55,13 @@ async def create_admin(admin_data: AdminCreate):
 async def get_admins():
     """Get all admins"""
     try:
-        with get_db_cursor() as cur:
-            cur.execute("SELECT id, email, role, username, uid FROM admin ORDER BY id")
-            admins = cur.fetchall()
+        async with get_async_cursor() as cur:
+            await cur.execute("SELECT id, email, role, username, uid FROM admin ORDER BY id")
+            admins = await cur.fetchall()
             return [Admin(**admin) for admin in admins]
             
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -68,12 +73,12 @@ async def get_admins():
 async def get_admin(admin_id: int):
     """Get admin by ID"""
     try:
-        with get_db_cursor() as cur:
-            cur.execute(
+        async with get_async_cursor() as cur:
+            await cur.execute(
                 "SELECT id, email, role, username, uid FROM admin WHERE id = %s",
                 (admin_id,)
             )
-            admin_data = cur.fetchone()
+            admin_data = await cur.fetchone()
             
             if not admin_data:
                 raise HTTPException(
@@ -85,6 +90,8 @@ async def get_admin(admin_id: int):
             
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -96,8 +103,8 @@ async def get_admin(admin_id: int):
 async def update_admin(admin_id: int, admin_data: AdminCreate):
     """Update admin"""
     try:
-        with get_db_cursor() as cur:
-            cur.execute("""
+        async with get_async_cursor() as cur:
+            await cur.execute("""
                 UPDATE admin
                 SET email = %s, role = %s, username = %s, uid = %s
                 WHERE id = %s
@@ -110,7 +117,7 @@ async def update_admin(admin_id: int, admin_data: AdminCreate):
                 admin_id
             ))
             
-            updated_admin = cur.fetchone()
+            updated_admin = await cur.fetchone()
             
             if not updated_admin:
                 raise HTTPException(
@@ -122,6 +129,8 @@ async def update_admin(admin_id: int, admin_data: AdminCreate):
             
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -133,9 +142,9 @@ async def update_admin(admin_id: int, admin_data: AdminCreate):
 async def delete_admin(admin_id: int):
     """Delete admin"""
     try:
-        with get_db_cursor() as cur:
-            cur.execute("DELETE FROM admin WHERE id = %s RETURNING id", (admin_id,))
-            deleted = cur.fetchone()
+        async with get_async_cursor() as cur:
+            await cur.execute("DELETE FROM admin WHERE id = %s RETURNING id", (admin_id,))
+            deleted = await cur.fetchone()
             
             if not deleted:
                 raise HTTPException(
@@ -150,6 +159,8 @@ async def delete_admin(admin_id: int):
             
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
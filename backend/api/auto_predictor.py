@@ -107,7 +107,7 @@ async def run_once():
     
     try:
         predictor = get_auto_predictor()
-        summary = predictor.run_once()
+        summary = await asyncio.to_thread(predictor.run_once)
         
         _last_summary = summary
         
@@ -0,0 +1,38 @@
+"""
+App bootstrap API endpoint
+One response with everything the app loads on launch
+"""
+
+from fastapi import APIRouter, HTTPException, status, Header
+from typing import Optional
+
+from backend.database import PoolSaturatedError
+from backend.services.bootstrap import get_bootstrap_snapshot
+from backend.utils.responses import negotiate
+
+router = APIRouter(prefix="/api/bootstrap", tags=["Bootstrap"])
+
+
+# Both "/" and "", so GET /api/bootstrap isn't answered with a redirect
+@router.get("/")
+@router.get("")
+async def get_bootstrap(
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+):
+    """
+    Active hotlines, active safety categories, active tips per category,
+    latest notifications and the latest forecast summary
+
+    Served from an in-memory snapshot rebuilt in the background whenever
+    one of those changes; supports If-None-Match and msgpack/CBOR via Accept.
+    """
+    try:
+        return await get_bootstrap_snapshot().response(if_none_match, negotiate(accept))
+    except PoolSaturatedError:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error building bootstrap snapshot: {str(e)}"
+        )
@@ -2,26 +2,38 @@
 Emergency Hotlines API endpoints
 """
 
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Query, Header
+from typing import List, Optional
 from datetime import datetime
 import uuid
 
 from backend.models.hotline import EmergencyHotline, HotlineCreate, HotlineUpdate
-from backend.database import get_db_cursor
+from backend.database import PoolSaturatedError
+from backend.async_database import get_async_cursor
+from backend.services.collection_cache import HOTLINES, cached_response, collection_write_cursor
+from backend.utils.pagination import (
+    MAX_LIMIT, decode_cursor, page_limit, fetch_limit, parse_fields, select_list, paginate
+)
+from backend.utils.responses import negotiate, rows_response
 
 router = APIRouter(prefix="/api/hotlines", tags=["Emergency Hotlines"])
 
+HOTLINE_FIELDS = (
+    "id", "service_name", "phone_number", "category", "icon_color",
+    "icon_type", "is_active", "priority", "created_at", "updated_at",
+)
+HOTLINE_SORT_KEY = ("priority", "service_name", "id")
+
 
 @router.post("/", response_model=EmergencyHotline, status_code=status.HTTP_201_CREATED)
 async def create_hotline(hotline_data: HotlineCreate):
     """Create a new emergency hotline"""
     try:
-        with get_db_cursor() as cur:
+        async with collection_write_cursor(HOTLINES) as cur:
             hotline_id = str(uuid.uuid4())
             now = datetime.utcnow()
             
-            cur.execute("""
+            await cur.execute("""
                 INSERT INTO emergency_hotlines (
                     id, service_name, phone_number, category, icon_color, 
                     icon_type, is_active, priority, created_at, updated_at
@@ -42,9 +54,11 @@ async def create_hotline(hotline_data: HotlineCreate):
                 now
             ))
             
-            new_hotline = cur.fetchone()
+            new_hotline = await cur.fetchone()
             return EmergencyHotline(**new_hotline)
             
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -53,29 +67,57 @@ async def create_hotline(hotline_data: HotlineCreate):
 
 
 @router.get("/", response_model=List[EmergencyHotline])
-async def get_hotlines(active_only: bool = True):
-    """Get all emergency hotlines (active only by default, sorted by priority)"""
+async def get_hotlines(
+    active_only: bool = True,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_LIMIT),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+):
+    """
+    Get emergency hotlines (active only by default, sorted by priority)
+    
+    All of them unless `limit` or `after` is passed; then pass the
+    X-Next-Cursor response header as `after` for the next page
+    """
     try:
-        with get_db_cursor() as cur:
-            if active_only:
-                cur.execute("""
-                    SELECT id, service_name, phone_number, category, icon_color,
-                           icon_type, is_active, priority, created_at, updated_at
-                    FROM emergency_hotlines
-                    WHERE is_active = true
-                    ORDER BY priority ASC, service_name ASC
-                """)
-            else:
-                cur.execute("""
-                    SELECT id, service_name, phone_number, category, icon_color,
-                           icon_type, is_active, priority, created_at, updated_at
+        limit = page_limit(limit, after)
+        cursor = decode_cursor(after, (int, str, str))
+        columns = parse_fields(fields, HOTLINE_FIELDS)
+        media_type = negotiate(accept)
+        
+        conditions = []
+        if active_only:
+            conditions.append("is_active = true")
+        if cursor:
+            conditions.append("(priority, service_name, id) > (%s, %s, %s)")
+        
+        async def load():
+            async with get_async_cursor() as cur:
+                await cur.execute(f"""
+                    SELECT {select_list(columns, HOTLINE_FIELDS, HOTLINE_SORT_KEY)}
                     FROM emergency_hotlines
-                    ORDER BY priority ASC, service_name ASC
-                """)
-            
-            hotlines = cur.fetchall()
-            return [EmergencyHotline(**hotline) for hotline in hotlines]
+                    {"WHERE " + " AND ".join(conditions) if conditions else ""}
+                    ORDER BY priority ASC, service_name ASC, id ASC
+                    LIMIT %s
+                """, (*(cursor or ()), fetch_limit(limit)))
+                
+                hotlines = await cur.fetchall()
+                return paginate(
+                    hotlines, limit,
+                    lambda row: (row["priority"], row["service_name"], row["id"]),
+                    EmergencyHotline, columns, media_type
+                )
+        
+        return await cached_response(
+            HOTLINES, ("list", active_only, limit, after, tuple(columns or ()), media_type), load, if_none_match
+        )
             
+    except HTTPException:
+        raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -84,21 +126,32 @@ async def get_hotlines(active_only: bool = True):
 
 
 @router.get("/category/{category}", response_model=List[EmergencyHotline])
-async def get_hotlines_by_category(category: str):
+async def get_hotlines_by_category(
+    category: str,
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+):
     """Get hotlines by category (e.g., 'Medical', 'Fire', 'Police')"""
     try:
-        with get_db_cursor() as cur:
-            cur.execute("""
-                SELECT id, service_name, phone_number, category, icon_color,
-                       icon_type, is_active, priority, created_at, updated_at
-                FROM emergency_hotlines
-                WHERE category = %s AND is_active = true
-                ORDER BY priority ASC
-            """, (category,))
-            
-            hotlines = cur.fetchall()
-            return [EmergencyHotline(**hotline) for hotline in hotlines]
+        media_type = negotiate(accept)
+        
+        async def load():
+            async with get_async_cursor() as cur:
+                await cur.execute("""
+                    SELECT id, service_name, phone_number, category, icon_color,
+                           icon_type, is_active, priority, created_at, updated_at
+                    FROM emergency_hotlines
+                    WHERE category = %s AND is_active = true
+                    ORDER BY priority ASC
+                """, (category,))
+                
+                hotlines = await cur.fetchall()
+                return rows_response(hotlines, EmergencyHotline, media_type=media_type)
+        
+        return await cached_response(HOTLINES, ("category", category, media_type), load, if_none_match)
             
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -110,15 +163,15 @@ async def get_hotlines_by_category(category: str):
 async def get_hotline(hotline_id: str):
     """Get hotline by ID"""
     try:
-        with get_db_cursor() as cur:
-            cur.execute("""
+        async with get_async_cursor() as cur:
+            await cur.execute("""
                 SELECT id, service_name, phone_number, category, icon_color,
                        icon_type, is_active, priority, created_at, updated_at
                 FROM emergency_hotlines
                 WHERE id = %s
             """, (hotline_id,))
             
-            hotline_data = cur.fetchone()
+            hotline_data = await cur.fetchone()
             
             if not hotline_data:
                 raise HTTPException(
@@ -130,6 +183,8 @@ async def get_hotline(hotline_id: str):
             
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -141,7 +196,7 @@ async def get_hotline(hotline_id: str):
 async def update_hotline(hotline_id: str, hotline_data: HotlineUpdate):
     """Update hotline"""
     try:
-        with get_db_cursor() as cur:
+        async with collection_write_cursor(HOTLINES) as cur:
             # Build dynamic update query
             update_fields = []
             values = []
@@ -184,7 +239,7 @@ async def update_hotline(hotline_id: str, hotline_data: HotlineUpdate):
             values.append(datetime.utcnow())
             values.append(hotline_id)
             
-            cur.execute(f"""
+            await cur.execute(f"""
                 UPDATE emergency_hotlines
                 SET {', '.join(update_fields)}
                 WHERE id = %s
@@ -192,7 +247,7 @@ async def update_hotline(hotline_id: str, hotline_data: HotlineUpdate):
                           icon_type, is_active, priority, created_at, updated_at
             """, values)
             
-            updated_hotline = cur.fetchone()
+            updated_hotline = await cur.fetchone()
             
             if not updated_hotline:
                 raise HTTPException(
@@ -204,6 +259,8 @@ async def update_hotline(hotline_id: str, hotline_data: HotlineUpdate):
             
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -215,9 +272,9 @@ async def update_hotline(hotline_id: str, hotline_data: HotlineUpdate):
 async def delete_hotline(hotline_id: str):
     """Delete hotline"""
     try:
-        with get_db_cursor() as cur:
-            cur.execute("DELETE FROM emergency_hotlines WHERE id = %s RETURNING id", (hotline_id,))
-            deleted = cur.fetchone()
+        async with collection_write_cursor(HOTLINES) as cur:
+            await cur.execute("DELETE FROM emergency_hotlines WHERE id = %s RETURNING id", (hotline_id,))
+            deleted = await cur.fetchone()
             
             if not deleted:
                 raise HTTPException(
@@ -232,6 +289,8 @@ async def delete_hotline(hotline_id: str):
             
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
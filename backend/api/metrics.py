@@ -0,0 +1,120 @@
+"""
+Operational metrics API endpoints
+"""
+
+from fastapi import APIRouter, HTTPException, status, Query
+
+from backend.database import get_connection_pool, get_replica_metrics
+from backend.async_database import get_async_pool_metrics, get_async_replica_metrics
+from backend.services.api_quota import get_quota_manager
+from backend.services.collection_cache import get_collection_cache_metrics
+from backend.services.bootstrap import get_bootstrap_snapshot
+from backend.services.recipient_roster import get_recipient_roster
+from backend import query_metrics
+
+router = APIRouter(prefix="/api/metrics", tags=["Metrics"])
+
+
+@router.get("/quota")
+async def get_quota_metrics():
+    """Remaining upstream API budget per service (OpenWeather, WeatherLink)"""
+    try:
+        return {
+            "success": True,
+            "quotas": get_quota_manager().metrics()
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching quota metrics: {str(e)}"
+        )
+
+
+@router.get("/pool")
+async def get_pool_metrics():
+    """Database pool usage (sync and async): in use, idle, waiters and wait times, plus replica lag/routing"""
+    try:
+        return {
+            "success": True,
+            "pool": get_connection_pool().metrics(),
+            "async_pool": get_async_pool_metrics(),
+            "replicas": get_replica_metrics(),
+            "async_replicas": get_async_replica_metrics()
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching pool metrics: {str(e)}"
+        )
+
+
+@router.get("/cache")
+async def get_cache_metrics():
+    """Collection cache (hotlines, safety categories, safety tips), bootstrap snapshot and recipient roster state"""
+    try:
+        return {
+            "success": True,
+            "cache": get_collection_cache_metrics(),
+            "bootstrap": get_bootstrap_snapshot().metrics(),
+            "recipient_roster": get_recipient_roster().metrics()
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching cache metrics: {str(e)}"
+        )
+
+
+@router.get("/queries")
+async def get_query_metrics(limit: int = Query(50, ge=1, le=500)):
+    """Per-statement latency histograms (slowest total first), row counts and pool checkout wait"""
+    try:
+        if not query_metrics.enabled():
+            return {"success": True, "enabled": False, "statements": [], "pool_wait": {}}
+        
+        metrics = query_metrics.get_query_metrics()
+        return {
+            "success": True,
+            "enabled": True,
+            "statements": metrics.statements(limit),
+            "pool_wait": metrics.pool_wait()
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching query metrics: {str(e)}"
+        )
+
+
+@router.get("/slow-queries")
+async def get_slow_queries():
+    """Most recent statements over DB_SLOW_QUERY_MS, with EXPLAIN (ANALYZE, BUFFERS) plans for SELECTs"""
+    try:
+        if not query_metrics.enabled():
+            return {"success": True, "enabled": False, "threshold_ms": None, "queries": []}
+        
+        return {
+            "success": True,
+            "enabled": True,
+            "threshold_ms": query_metrics.get_query_metrics().slow_ms,
+            "queries": query_metrics.get_query_metrics().slow_queries()
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching slow queries: {str(e)}"
+        )
+
+
+@router.delete("/queries")
+async def reset_query_metrics():
+    """Clear query histograms and the slow-query buffer"""
+    try:
+        if query_metrics.enabled():
+            query_metrics.get_query_metrics().reset()
+        return {"success": True, "message": "Query metrics reset"}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error resetting query metrics: {str(e)}"
+        )
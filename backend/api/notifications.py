@@ -2,26 +2,40 @@
 Notifications API endpoints
 """
 
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Query, Header
+from typing import List, Optional
 from datetime import datetime
 import uuid
 
 from backend.models.notification import Notification, NotificationCreate, NotificationUpdate
-from backend.database import get_db_cursor
+from backend.database import PoolSaturatedError
+from backend.async_database import get_async_cursor, get_async_read_cursor
+from backend.services.collection_cache import NOTIFICATIONS, collection_version, collection_write_cursor
+from backend.utils.pagination import (
+    MAX_LIMIT, decode_cursor, page_limit, fetch_limit, parse_fields, select_list, paginate
+)
+from backend.utils.responses import negotiate
+from backend.utils.http_cache import LIVE_CACHE_CONTROL, etag_matches, not_modified, set_validators, version_etag
 
 router = APIRouter(prefix="/api/notifications", tags=["Notifications"])
 
+NOTIFICATION_FIELDS = ("id", "title", "message", "type", "sent_to", "status", "date_time")
+NOTIFICATION_SORT_KEY = ("date_time", "id")
+
+
+def _notification_key(row):
+    return (row["date_time"], row["id"])
+
 
 @router.post("/", response_model=Notification, status_code=status.HTTP_201_CREATED)
 async def create_notification(notification_data: NotificationCreate):
     """Create a new notification"""
     try:
-        with get_db_cursor() as cur:
+        async with collection_write_cursor(NOTIFICATIONS) as cur:
             notification_id = str(uuid.uuid4())
             now = datetime.utcnow()
             
-            cur.execute("""
+            await cur.execute("""
                 INSERT INTO notifications (id, title, message, type, sent_to, status, date_time)
                 VALUES (%s, %s, %s, %s, %s, %s, %s)
                 RETURNING id, title, message, type, sent_to, status, date_time
@@ -35,9 +49,11 @@ async def create_notification(notification_data: NotificationCreate):
                 now
             ))
             
-            new_notification = cur.fetchone()
+            new_notification = await cur.fetchone()
             return Notification(**new_notification)
             
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -46,18 +62,51 @@ async def create_notification(notification_data: NotificationCreate):
 
 
 @router.get("/", response_model=List[Notification])
-async def get_notifications():
-    """Get all notifications (newest first)"""
+async def get_notifications(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_LIMIT),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+):
+    """
+    Get notifications (newest first), all of them unless `limit` or `after` is passed
+    
+    - limit: page size
+    - after: cursor from the previous page's X-Next-Cursor header
+    - fields: comma-separated columns to return (e.g. "id,title,date_time")
+    """
     try:
-        with get_db_cursor() as cur:
-            cur.execute("""
-                SELECT id, title, message, type, sent_to, status, date_time
+        limit = page_limit(limit, after)
+        cursor = decode_cursor(after, (datetime, str))
+        columns = parse_fields(fields, NOTIFICATION_FIELDS)
+        media_type = negotiate(accept)
+        
+        async with get_async_read_cursor() as cur:
+            # Every write bumps the version, so a revalidation never reads the rows.
+            # Version first on the same connection: the rows are at least that new
+            version = await collection_version(cur, NOTIFICATIONS)
+            etag = version_etag(version, limit, after, columns, media_type)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag, LIVE_CACHE_CONTROL)
+            
+            await cur.execute(f"""
+                SELECT {select_list(columns, NOTIFICATION_FIELDS, NOTIFICATION_SORT_KEY)}
                 FROM notifications
-                ORDER BY date_time DESC
-            """)
-            notifications = cur.fetchall()
-            return [Notification(**notif) for notif in notifications]
+                {"WHERE (date_time, id) < (%s, %s)" if cursor else ""}
+                ORDER BY date_time DESC, id DESC
+                LIMIT %s
+            """, (*(cursor or ()), fetch_limit(limit)))
+            notifications = await cur.fetchall()
+            
+            response = paginate(notifications, limit, _notification_key, Notification, columns, media_type)
+            set_validators(response, LIVE_CACHE_CONTROL, etag)
+            return response
             
+    except HTTPException:
+        raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -69,14 +118,14 @@ async def get_notifications():
 async def get_notification(notification_id: str):
     """Get notification by ID"""
     try:
-        with get_db_cursor() as cur:
-            cur.execute("""
+        async with get_async_cursor() as cur:
+            await cur.execute("""
                 SELECT id, title, message, type, sent_to, status, date_time
                 FROM notifications
                 WHERE id = %s
             """, (notification_id,))
             
-            notification_data = cur.fetchone()
+            notification_data = await cur.fetchone()
             
             if not notification_data:
                 raise HTTPException(
@@ -88,6 +137,8 @@ async def get_notification(notification_id: str):
             
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -99,7 +150,7 @@ async def get_notification(notification_id: str):
 async def update_notification(notification_id: str, notification_data: NotificationUpdate):
     """Update notification"""
     try:
-        with get_db_cursor() as cur:
+        async with collection_write_cursor(NOTIFICATIONS) as cur:
             # Build dynamic update query based on provided fields
             update_fields = []
             values = []
@@ -132,14 +183,14 @@ async def update_notification(notification_id: str, notification_data: Notificat
             
             values.append(notification_id)
             
-            cur.execute(f"""
+            await cur.execute(f"""
                 UPDATE notifications
                 SET {', '.join(update_fields)}
                 WHERE id = %s
                 RETURNING id, title, message, type, sent_to, status, date_time
             """, values)
             
-            updated_notification = cur.fetchone()
+            updated_notification = await cur.fetchone()
             
             if not updated_notification:
                 raise HTTPException(
@@ -151,6 +202,8 @@ async def update_notification(notification_id: str, notification_data: Notificat
             
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -162,9 +215,9 @@ async def update_notification(notification_id: str, notification_data: Notificat
 async def delete_notification(notification_id: str):
     """Delete notification"""
     try:
-        with get_db_cursor() as cur:
-            cur.execute("DELETE FROM notifications WHERE id = %s RETURNING id", (notification_id,))
-            deleted = cur.fetchone()
+        async with collection_write_cursor(NOTIFICATIONS) as cur:
+            await cur.execute("DELETE FROM notifications WHERE id = %s RETURNING id", (notification_id,))
+            deleted = await cur.fetchone()
             
             if not deleted:
                 raise HTTPException(
@@ -179,6 +232,8 @@ async def delete_notification(notification_id: str):
             
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -187,20 +242,46 @@ async def delete_notification(notification_id: str):
 
 
 @router.get("/status/{status_filter}", response_model=List[Notification])
-async def get_notifications_by_status(status_filter: str):
-    """Get notifications by status (e.g., 'sent', 'pending', 'failed')"""
+async def get_notifications_by_status(
+    status_filter: str,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_LIMIT),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+):
+    """Get notifications by status (e.g., 'sent', 'pending', 'failed'), paginated like the full list"""
     try:
-        with get_db_cursor() as cur:
-            cur.execute("""
-                SELECT id, title, message, type, sent_to, status, date_time
+        limit = page_limit(limit, after)
+        cursor = decode_cursor(after, (datetime, str))
+        columns = parse_fields(fields, NOTIFICATION_FIELDS)
+        media_type = negotiate(accept)
+        
+        async with get_async_read_cursor() as cur:
+            version = await collection_version(cur, NOTIFICATIONS)
+            etag = version_etag(version, status_filter, limit, after, columns, media_type)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag, LIVE_CACHE_CONTROL)
+            
+            await cur.execute(f"""
+                SELECT {select_list(columns, NOTIFICATION_FIELDS, NOTIFICATION_SORT_KEY)}
                 FROM notifications
                 WHERE status = %s
-                ORDER BY date_time DESC
-            """, (status_filter,))
+                {"AND (date_time, id) < (%s, %s)" if cursor else ""}
+                ORDER BY date_time DESC, id DESC
+                LIMIT %s
+            """, (status_filter, *(cursor or ()), fetch_limit(limit)))
             
-            notifications = cur.fetchall()
-            return [Notification(**notif) for notif in notifications]
+            notifications = await cur.fetchall()
             
+            response = paginate(notifications, limit, _notification_key, Notification, columns, media_type)
+            set_validators(response, LIVE_CACHE_CONTROL, etag)
+            return response
+            
+    except HTTPException:
+        raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
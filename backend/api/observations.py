@@ -0,0 +1,113 @@
+"""
+Weather observation API endpoints
+Serves hourly/daily rollups maintained by the data pipeline
+"""
+
+from fastapi import APIRouter, HTTPException, status, Query
+from typing import Optional
+from datetime import datetime, timedelta, timezone
+
+from backend.database import PoolSaturatedError
+from backend.async_database import get_async_read_cursor
+from backend.utils.pagination import parse_fields
+
+router = APIRouter(prefix="/api/observations", tags=["Observations"])
+
+# Rollup tables written by scripts/database.py (DatabaseManager._refresh_rollups)
+ROLLUP_TABLES = {
+    "hour": "weather_hourly",
+    "day": "weather_daily",
+}
+
+ROLLUP_FIELDS = (
+    "samples",
+    "temp_avg", "temp_min", "temp_max",
+    "hum_avg", "hum_min", "hum_max",
+    "dew_point_avg", "heat_index_max",
+    "wind_speed_avg", "wind_speed_max",
+    "rainfall_mm_sum", "rain_rate_max_mm",
+    "pressure_avg", "pressure_min", "pressure_max",
+    "solar_rad_avg", "solar_rad_max", "solar_energy_sum",
+    "uv_index_avg", "uv_index_max",
+    "et_sum",
+)
+
+# Default window when start is omitted, and the widest window allowed
+DEFAULT_RANGE = {"hour": timedelta(days=7), "day": timedelta(days=365)}
+MAX_RANGE = {"hour": timedelta(days=366), "day": timedelta(days=366 * 20)}
+
+
+def _epoch(value: datetime) -> int:
+    """Naive datetimes are taken as UTC"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+@router.get("/rollups")
+async def get_rollups(
+    interval: str = Query("hour", pattern="^(hour|day)$"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    station_id: Optional[int] = None,
+    fields: Optional[str] = None,
+):
+    """
+    Hourly or daily weather aggregates (min/max/avg/sum) over a time range
+    
+    A year of daily buckets is 365 rows instead of ~35k raw observations.
+    Buckets are keyed by bucket_start (Unix seconds); daily buckets follow
+    the pipeline's ROLLUP_TIMEZONE day. `fields=temp_avg,rainfall_mm_sum`
+    limits the columns returned.
+    """
+    try:
+        end = end or datetime.now(timezone.utc)
+        start = start or end - DEFAULT_RANGE[interval]
+        start_ts, end_ts = _epoch(start), _epoch(end)
+        
+        if start_ts > end_ts:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="start must be before end"
+            )
+        if end_ts - start_ts > MAX_RANGE[interval].total_seconds():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Range too large for {interval} buckets (max {MAX_RANGE[interval].days} days)"
+            )
+        
+        columns = parse_fields(fields, ROLLUP_FIELDS) or list(ROLLUP_FIELDS)
+        
+        conditions = ["bucket_start >= %s", "bucket_start <= %s"]
+        params = [start_ts, end_ts]
+        if station_id is not None:
+            conditions.append("station_id = %s")
+            params.append(station_id)
+        
+        async with get_async_read_cursor() as cur:
+            await cur.execute(f"""
+                SELECT station_id, bucket_start, {", ".join(columns)}
+                FROM {ROLLUP_TABLES[interval]}
+                WHERE {" AND ".join(conditions)}
+                ORDER BY bucket_start ASC, station_id ASC
+            """, params)
+            
+            buckets = await cur.fetchall()
+            return {
+                "success": True,
+                "interval": interval,
+                "start": start_ts,
+                "end": end_ts,
+                "count": len(buckets),
+                "buckets": buckets
+            }
+            
+    except HTTPException:
+        raise
+    except PoolSaturatedError:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching observation rollups: {str(e)}"
+        )
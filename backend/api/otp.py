@@ -5,7 +5,9 @@ import random
 import requests
 from typing import Optional
 
-from backend.database import get_db_cursor
+from backend.database import PoolSaturatedError
+from backend.async_database import get_async_cursor
+from backend.statements import execute_statement, phone_variants
 from backend.utils.validators import normalize_phone_number
 from backend.config import Config 
 
@@ -33,19 +35,10 @@ async def send_otp(request: SendOTPRequest):
         print(f"📱 OTP request for: {phone_number}")
         
         # ✅ Check if user exists first
-        with get_db_cursor() as cur:
-            cur.execute("""
-                SELECT id, first_name, last_name, is_verified
-                FROM users
-                WHERE phone_number IN (%s, %s, %s)
-                LIMIT 1
-            """, (
-                phone_number,
-                phone_number.lstrip('63'),
-                '0' + phone_number.lstrip('63')
-            ))
+        async with get_async_cursor() as cur:
+            await execute_statement(cur, "user_by_phone_variants", phone_variants(phone_number))
             
-            user = cur.fetchone()
+            user = await cur.fetchone()
             
             if not user:
                 print(f"❌ User not found for phone: {phone_number}")
@@ -65,19 +58,8 @@ async def send_otp(request: SendOTPRequest):
         otp_hash = bcrypt.hashpw(otp_code.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
         
         # ✅ Save OTP to database with correct schema
-        with get_db_cursor() as cur:
-            cur.execute("""
-                INSERT INTO otp_requests (
-                    phone_number, 
-                    otp_hash, 
-                    expires_at,
-                    attempts_left,
-                    is_verified,
-                    is_invalidated
-                )
-                VALUES (%s, %s, %s, %s, %s, %s)
-                RETURNING id
-            """, (
+        async with get_async_cursor() as cur:
+            await execute_statement(cur, "otp_insert", (
                 phone_number,
                 otp_hash,
                 expires_at,
@@ -86,7 +68,7 @@ async def send_otp(request: SendOTPRequest):
                 False   # is_invalidated
             ))
             
-            otp_id = cur.fetchone()['id']
+            otp_id = (await cur.fetchone())['id']
         
                 # ✅ Send OTP via iProg SMS API
         sms_sent = False
@@ -135,6 +117,8 @@ async def send_otp(request: SendOTPRequest):
         )        
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         print(f"❌ Error sending OTP: {e}")
         raise HTTPException(
@@ -152,17 +136,11 @@ async def verify_otp(request: VerifyOTPRequest):
         print(f"🔍 Verifying OTP for phone: {phone_number}")
         print(f"🔍 OTP code: {request.otp_code}")
         
-        with get_db_cursor() as cur:
+        async with get_async_cursor() as cur:
             # ✅ Get latest OTP with correct column names
-            cur.execute("""
-                SELECT id, otp_hash, expires_at, is_verified, is_invalidated, attempts_left
-                FROM otp_requests
-                WHERE phone_number = %s AND is_invalidated = FALSE
-                ORDER BY created_at DESC
-                LIMIT 1
-            """, (phone_number,))
+            await execute_statement(cur, "otp_latest", (phone_number,))
             
-            otp_record = cur.fetchone()
+            otp_record = await cur.fetchone()
             
             if not otp_record:
                 print(f"❌ No OTP found for phone: {phone_number}")
@@ -205,11 +183,7 @@ async def verify_otp(request: VerifyOTPRequest):
             if not otp_match:
                 # Decrement attempts
                 new_attempts = otp_record['attempts_left'] - 1
-                cur.execute("""
-                    UPDATE otp_requests
-                    SET attempts_left = %s
-                    WHERE id = %s
-                """, (new_attempts, otp_record['id']))
+                await execute_statement(cur, "otp_update_attempts", (new_attempts, otp_record['id']))
                 
                 print(f"❌ Invalid OTP. Attempts left: {new_attempts}")
                 raise HTTPException(
@@ -218,11 +192,7 @@ async def verify_otp(request: VerifyOTPRequest):
                 )
             
             # ✅ Mark as verified
-            cur.execute("""
-                UPDATE otp_requests
-                SET is_verified = TRUE, verified_at = %s
-                WHERE id = %s
-            """, (datetime.utcnow(), otp_record['id']))
+            await execute_statement(cur, "otp_mark_verified", (datetime.utcnow(), otp_record['id']))
             
             print(f"✅ OTP verified successfully")
             
@@ -234,6 +204,8 @@ async def verify_otp(request: VerifyOTPRequest):
                 
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         print(f"❌ Error verifying OTP: {e}")
         raise HTTPException(
@@ -260,19 +232,8 @@ async def send_otp_registration(request: SendOTPRequest):
         otp_hash = bcrypt.hashpw(otp_code.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
         
         # ✅ Save OTP to database with correct column names
-        with get_db_cursor() as cur:
-            cur.execute("""
-                INSERT INTO otp_requests (
-                    phone_number, 
-                    otp_hash, 
-                    expires_at, 
-                    attempts_left,
-                    is_verified,
-                    is_invalidated
-                )
-                VALUES (%s, %s, %s, %s, %s, %s)
-                RETURNING id
-            """, (
+        async with get_async_cursor() as cur:
+            await execute_statement(cur, "otp_insert", (
                 phone_number, 
                 otp_hash,
                 expires_at,
@@ -281,7 +242,7 @@ async def send_otp_registration(request: SendOTPRequest):
                 False
             ))
             
-            otp_id = cur.fetchone()['id']
+            otp_id = (await cur.fetchone())['id']
             print(f"💾 OTP saved: ID {otp_id}")
         
         # ✅ Send OTP via iProg SMS API
@@ -330,6 +291,8 @@ async def send_otp_registration(request: SendOTPRequest):
                 "sms_sent": sms_sent
             }
         )
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         print(f"❌ Error sending registration OTP: {e}")
         import traceback
@@ -347,26 +310,18 @@ async def resend_otp(request: SendOTPRequest):
         print(f"🔄 Resending OTP for: {phone_number}")
         
         # ✅ Check if user exists
-        with get_db_cursor() as cur:
-            cur.execute("""
-                SELECT id FROM users
-                WHERE phone_number IN (%s, %s, %s)
-                LIMIT 1
-            """, (
-                phone_number,
-                phone_number.lstrip('63'),
-                '0' + phone_number.lstrip('63')
-            ))
+        async with get_async_cursor() as cur:
+            await execute_statement(cur, "user_by_phone_variants", phone_variants(phone_number))
             
-            if not cur.fetchone():
+            if not await cur.fetchone():
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="User not found. Please register first."
                 )
         
         # ✅ Invalidate previous OTPs
-        with get_db_cursor() as cur:
-            cur.execute("""
+        async with get_async_cursor() as cur:
+            await cur.execute("""
                 UPDATE otp_requests
                 SET is_invalidated = TRUE
                 WHERE phone_number = %s AND is_verified = FALSE AND is_invalidated = FALSE
@@ -377,6 +332,8 @@ async def resend_otp(request: SendOTPRequest):
         
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         print(f"❌ Error resending OTP: {e}")
         raise HTTPException(
@@ -2,13 +2,18 @@
 Safety Categories API endpoints
 """
 
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Header
+from typing import List, Optional
 from datetime import datetime
 import uuid
 
 from backend.models.safety import SafetyCategory, CategoryCreate, CategoryUpdate
-from backend.database import get_db_cursor
+from backend.database import PoolSaturatedError
+from backend.async_database import get_async_cursor
+from backend.services.collection_cache import (
+    SAFETY_CATEGORIES, SAFETY_TIPS, cached_response, collection_write_cursor
+)
+from backend.utils.responses import negotiate, rows_response
 
 router = APIRouter(prefix="/api/safety/categories", tags=["Safety Categories"])
 
@@ -17,11 +22,11 @@ router = APIRouter(prefix="/api/safety/categories", tags=["Safety Categories"])
 async def create_category(category_data: CategoryCreate):
     """Create a new safety category"""
     try:
-        with get_db_cursor() as cur:
+        async with collection_write_cursor(SAFETY_CATEGORIES) as cur:
             category_id = str(uuid.uuid4())
             now = datetime.utcnow()
             
-            cur.execute("""
+            await cur.execute("""
                 INSERT INTO safety_categories (
                     category_id, name, description, order_num, icon, 
                     gradient_colors, created_at, updated_at, is_active
@@ -41,9 +46,11 @@ async def create_category(category_data: CategoryCreate):
                 category_data.is_active
             ))
             
-            new_category = cur.fetchone()
+            new_category = await cur.fetchone()
             return SafetyCategory(**new_category)
             
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -52,29 +59,40 @@ async def create_category(category_data: CategoryCreate):
 
 
 @router.get("/", response_model=List[SafetyCategory])
-async def get_categories(active_only: bool = True):
+async def get_categories(
+    active_only: bool = True,
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+):
     """Get all safety categories (active only by default, sorted by order_num)"""
     try:
-        with get_db_cursor() as cur:
-            if active_only:
-                cur.execute("""
-                    SELECT category_id, name, description, order_num, icon,
-                           gradient_colors, created_at, updated_at, is_active
-                    FROM safety_categories
-                    WHERE is_active = true
-                    ORDER BY order_num ASC, name ASC
-                """)
-            else:
-                cur.execute("""
-                    SELECT category_id, name, description, order_num, icon,
-                           gradient_colors, created_at, updated_at, is_active
-                    FROM safety_categories
-                    ORDER BY order_num ASC, name ASC
-                """)
-            
-            categories = cur.fetchall()
-            return [SafetyCategory(**cat) for cat in categories]
-            
+        media_type = negotiate(accept)
+        
+        async def load():
+            async with get_async_cursor() as cur:
+                if active_only:
+                    await cur.execute("""
+                        SELECT category_id, name, description, order_num, icon,
+                               gradient_colors, created_at, updated_at, is_active
+                        FROM safety_categories
+                        WHERE is_active = true
+                        ORDER BY order_num ASC, name ASC
+                    """)
+                else:
+                    await cur.execute("""
+                        SELECT category_id, name, description, order_num, icon,
+                               gradient_colors, created_at, updated_at, is_active
+                        FROM safety_categories
+                        ORDER BY order_num ASC, name ASC
+                    """)
+            
+                categories = await cur.fetchall()
+                return rows_response(categories, SafetyCategory, media_type=media_type)
+        
+        return await cached_response(SAFETY_CATEGORIES, ("list", active_only, media_type), load, if_none_match)
+            
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -86,15 +104,15 @@ async def get_categories(active_only: bool = True):
 async def get_category(category_id: str):
     """Get category by ID"""
     try:
-        with get_db_cursor() as cur:
-            cur.execute("""
+        async with get_async_cursor() as cur:
+            await cur.execute("""
                 SELECT category_id, name, description, order_num, icon,
                        gradient_colors, created_at, updated_at, is_active
                 FROM safety_categories
                 WHERE category_id = %s
             """, (category_id,))
             
-            category_data = cur.fetchone()
+            category_data = await cur.fetchone()
             
             if not category_data:
                 raise HTTPException(
@@ -106,6 +124,8 @@ async def get_category(category_id: str):
             
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -117,7 +137,7 @@ async def get_category(category_id: str):
 async def update_category(category_id: str, category_data: CategoryUpdate):
     """Update category"""
     try:
-        with get_db_cursor() as cur:
+        async with collection_write_cursor(SAFETY_CATEGORIES) as cur:
             # Build dynamic update query
             update_fields = []
             values = []
@@ -156,7 +176,7 @@ async def update_category(category_id: str, category_data: CategoryUpdate):
             values.append(datetime.utcnow())
             values.append(category_id)
             
-            cur.execute(f"""
+            await cur.execute(f"""
                 UPDATE safety_categories
                 SET {', '.join(update_fields)}
                 WHERE category_id = %s
@@ -164,7 +184,7 @@ async def update_category(category_id: str, category_data: CategoryUpdate):
                           gradient_colors, created_at, updated_at, is_active
             """, values)
             
-            updated_category = cur.fetchone()
+            updated_category = await cur.fetchone()
             
             if not updated_category:
                 raise HTTPException(
@@ -176,6 +196,8 @@ async def update_category(category_id: str, category_data: CategoryUpdate):
             
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -187,9 +209,10 @@ async def update_category(category_id: str, category_data: CategoryUpdate):
 async def delete_category(category_id: str):
     """Delete category"""
     try:
-        with get_db_cursor() as cur:
-            cur.execute("DELETE FROM safety_categories WHERE category_id = %s RETURNING category_id", (category_id,))
-            deleted = cur.fetchone()
+        # Tips are deleted with their category (ON DELETE CASCADE)
+        async with collection_write_cursor(SAFETY_CATEGORIES, SAFETY_TIPS) as cur:
+            await cur.execute("DELETE FROM safety_categories WHERE category_id = %s RETURNING category_id", (category_id,))
+            deleted = await cur.fetchone()
             
             if not deleted:
                 raise HTTPException(
@@ -204,6 +227,8 @@ async def delete_category(category_id: str):
             
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
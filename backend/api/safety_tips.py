@@ -2,25 +2,38 @@
 Safety Tips API endpoints
 """
 
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Query, Header
+from typing import List, Optional
 from datetime import datetime
 import uuid
 
 from backend.models.safety import SafetyTip, TipCreate, TipUpdate
-from backend.database import get_db_cursor
+from backend.database import PoolSaturatedError
+from backend.async_database import get_async_cursor
+from backend.services.collection_cache import SAFETY_TIPS, cached_response, collection_write_cursor
+from backend.utils.pagination import (
+    MAX_LIMIT, decode_cursor, page_limit, fetch_limit, parse_fields, select_list, paginate
+)
+from backend.utils.responses import negotiate, rows_response
 
 router = APIRouter(prefix="/api/safety/tips", tags=["Safety Tips"])
 
+TIP_FIELDS = (
+    "tip_id", "category_id", "title", "content", "order_num",
+    "icon", "created_at", "updated_at", "is_active",
+)
+# order_num is nullable; ORDER BY puts NULLs last, which this sort value mirrors
+TIP_SORT_ORDER = "COALESCE(order_num, 2147483647)"
+
 
 @router.post("/", response_model=SafetyTip, status_code=status.HTTP_201_CREATED)
 async def create_tip(tip_data: TipCreate):
     """Create a new safety tip"""
     try:
-        with get_db_cursor() as cur:
+        async with collection_write_cursor(SAFETY_TIPS) as cur:
             # Verify category exists
-            cur.execute("SELECT category_id FROM safety_categories WHERE category_id = %s", (tip_data.category_id,))
-            if not cur.fetchone():
+            await cur.execute("SELECT category_id FROM safety_categories WHERE category_id = %s", (tip_data.category_id,))
+            if not await cur.fetchone():
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Category does not exist"
@@ -29,7 +42,7 @@ async def create_tip(tip_data: TipCreate):
             tip_id = str(uuid.uuid4())
             now = datetime.utcnow()
             
-            cur.execute("""
+            await cur.execute("""
                 INSERT INTO safety_tips (
                     tip_id, category_id, title, content, order_num, 
                     icon, created_at, updated_at, is_active
@@ -49,11 +62,13 @@ async def create_tip(tip_data: TipCreate):
                 tip_data.is_active
             ))
             
-            new_tip = cur.fetchone()
+            new_tip = await cur.fetchone()
             return SafetyTip(**new_tip)
             
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -62,29 +77,61 @@ async def create_tip(tip_data: TipCreate):
 
 
 @router.get("/", response_model=List[SafetyTip])
-async def get_tips(active_only: bool = True):
-    """Get all safety tips (active only by default, sorted by order_num)"""
+async def get_tips(
+    active_only: bool = True,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_LIMIT),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+):
+    """
+    Get safety tips (active only by default, sorted by order_num)
+    
+    All of them unless `limit` or `after` is passed; then pass the
+    X-Next-Cursor response header as `after` for the next page
+    """
     try:
-        with get_db_cursor() as cur:
-            if active_only:
-                cur.execute("""
-                    SELECT tip_id, category_id, title, content, order_num,
-                           icon, created_at, updated_at, is_active
+        limit = page_limit(limit, after)
+        cursor = decode_cursor(after, (int, str, str))
+        columns = parse_fields(fields, TIP_FIELDS)
+        media_type = negotiate(accept)
+        
+        conditions = []
+        if active_only:
+            conditions.append("is_active = true")
+        if cursor:
+            conditions.append(f"({TIP_SORT_ORDER}, title, tip_id) > (%s, %s, %s)")
+        
+        async def load():
+            async with get_async_cursor() as cur:
+                await cur.execute(f"""
+                    SELECT {select_list(columns, TIP_FIELDS, ("order_num", "title", "tip_id"))}
                     FROM safety_tips
-                    WHERE is_active = true
-                    ORDER BY order_num ASC, title ASC
-                """)
-            else:
-                cur.execute("""
-                    SELECT tip_id, category_id, title, content, order_num,
-                           icon, created_at, updated_at, is_active
-                    FROM safety_tips
-                    ORDER BY order_num ASC, title ASC
-                """)
+                    {"WHERE " + " AND ".join(conditions) if conditions else ""}
+                    ORDER BY {TIP_SORT_ORDER} ASC, title ASC, tip_id ASC
+                    LIMIT %s
+                """, (*(cursor or ()), fetch_limit(limit)))
             
-            tips = cur.fetchall()
-            return [SafetyTip(**tip) for tip in tips]
+                tips = await cur.fetchall()
+                return paginate(
+                    tips, limit,
+                    lambda row: (
+                        row["order_num"] if row["order_num"] is not None else 2147483647,
+                        row["title"],
+                        row["tip_id"],
+                    ),
+                    SafetyTip, columns, media_type
+                )
+        
+        return await cached_response(
+            SAFETY_TIPS, ("list", active_only, limit, after, tuple(columns or ()), media_type), load, if_none_match
+        )
             
+    except HTTPException:
+        raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -93,21 +140,32 @@ async def get_tips(active_only: bool = True):
 
 
 @router.get("/category/{category_id}", response_model=List[SafetyTip])
-async def get_tips_by_category(category_id: str):
+async def get_tips_by_category(
+    category_id: str,
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+):
     """Get all tips for a specific category"""
     try:
-        with get_db_cursor() as cur:
-            cur.execute("""
-                SELECT tip_id, category_id, title, content, order_num,
-                       icon, created_at, updated_at, is_active
-                FROM safety_tips
-                WHERE category_id = %s AND is_active = true
-                ORDER BY order_num ASC, title ASC
-            """, (category_id,))
-            
-            tips = cur.fetchall()
-            return [SafetyTip(**tip) for tip in tips]
+        media_type = negotiate(accept)
+        
+        async def load():
+            async with get_async_cursor() as cur:
+                await cur.execute("""
+                    SELECT tip_id, category_id, title, content, order_num,
+                           icon, created_at, updated_at, is_active
+                    FROM safety_tips
+                    WHERE category_id = %s AND is_active = true
+                    ORDER BY order_num ASC, title ASC
+                """, (category_id,))
+                
+                tips = await cur.fetchall()
+                return rows_response(tips, SafetyTip, media_type=media_type)
+        
+        return await cached_response(SAFETY_TIPS, ("category", category_id, media_type), load, if_none_match)
             
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -119,15 +177,15 @@ async def get_tips_by_category(category_id: str):
 async def get_tip(tip_id: str):
     """Get tip by ID"""
     try:
-        with get_db_cursor() as cur:
-            cur.execute("""
+        async with get_async_cursor() as cur:
+            await cur.execute("""
                 SELECT tip_id, category_id, title, content, order_num,
                        icon, created_at, updated_at, is_active
                 FROM safety_tips
                 WHERE tip_id = %s
             """, (tip_id,))
             
-            tip_data = cur.fetchone()
+            tip_data = await cur.fetchone()
             
             if not tip_data:
                 raise HTTPException(
@@ -139,6 +197,8 @@ async def get_tip(tip_id: str):
             
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -150,15 +210,15 @@ async def get_tip(tip_id: str):
 async def update_tip(tip_id: str, tip_data: TipUpdate):
     """Update tip"""
     try:
-        with get_db_cursor() as cur:
+        async with collection_write_cursor(SAFETY_TIPS) as cur:
             # Build dynamic update query
             update_fields = []
             values = []
             
             if tip_data.category_id is not None:
                 # Verify category exists
-                cur.execute("SELECT category_id FROM safety_categories WHERE category_id = %s", (tip_data.category_id,))
-                if not cur.fetchone():
+                await cur.execute("SELECT category_id FROM safety_categories WHERE category_id = %s", (tip_data.category_id,))
+                if not await cur.fetchone():
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
                         detail="Category does not exist"
@@ -196,7 +256,7 @@ async def update_tip(tip_id: str, tip_data: TipUpdate):
             values.append(datetime.utcnow())
             values.append(tip_id)
             
-            cur.execute(f"""
+            await cur.execute(f"""
                 UPDATE safety_tips
                 SET {', '.join(update_fields)}
                 WHERE tip_id = %s
@@ -204,7 +264,7 @@ async def update_tip(tip_id: str, tip_data: TipUpdate):
                           icon, created_at, updated_at, is_active
             """, values)
             
-            updated_tip = cur.fetchone()
+            updated_tip = await cur.fetchone()
             
             if not updated_tip:
                 raise HTTPException(
@@ -216,6 +276,8 @@ async def update_tip(tip_id: str, tip_data: TipUpdate):
             
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -227,9 +289,9 @@ async def update_tip(tip_id: str, tip_data: TipUpdate):
 async def delete_tip(tip_id: str):
     """Delete tip"""
     try:
-        with get_db_cursor() as cur:
-            cur.execute("DELETE FROM safety_tips WHERE tip_id = %s RETURNING tip_id", (tip_id,))
-            deleted = cur.fetchone()
+        async with collection_write_cursor(SAFETY_TIPS) as cur:
+            await cur.execute("DELETE FROM safety_tips WHERE tip_id = %s RETURNING tip_id", (tip_id,))
+            deleted = await cur.fetchone()
             
             if not deleted:
                 raise HTTPException(
@@ -244,6 +306,8 @@ async def delete_tip(tip_id: str):
             
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -2,17 +2,32 @@
 User and Authentication API endpoints
 """
 
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Query, Header
+from typing import List, Optional
 from datetime import datetime
 import uuid
 
 from backend.models.user import User, UserCreate, UserUpdate, CheckUserRequest, CheckUserResponse, LoginRequest, LoginResponse
-from backend.database import get_db_cursor
+from backend.database import PoolSaturatedError
+from backend.services.recipient_roster import NOTIFY_SQL, get_recipient_roster
+from backend.async_database import get_async_cursor, get_async_read_cursor
+from backend.statements import execute_statement, phone_variants
+from backend.utils.pagination import (
+    MAX_LIMIT, decode_cursor, page_limit, fetch_limit, parse_fields, select_list, paginate
+)
+from backend.utils.responses import negotiate
 from backend.utils.validators import normalize_phone_number
 
 router = APIRouter(prefix="/api/users", tags=["Users & Authentication"])
 
+USER_FIELDS = (
+    "id", "first_name", "middle_name", "last_name", "suffix",
+    "house_address", "barangay", "phone_number", "role",
+    "is_verified", "created_at", "updated_at",
+)
+USER_SORT_KEY = ("created_at", "id")
+
+
 @router.get("/phone/{phone_number}")
 async def get_user_by_phone(phone_number: str):
     """Get user by phone number"""
@@ -20,21 +35,10 @@ async def get_user_by_phone(phone_number: str):
         from backend.utils.validators import normalize_phone_number
         phone_number = normalize_phone_number(phone_number)
         
-        with get_db_cursor() as cur:
-            cur.execute("""
-                SELECT id, first_name, last_name, middle_name, suffix,
-                       phone_number, barangay, house_address,
-                       role, is_verified, created_at
-                FROM users
-                WHERE phone_number IN (%s, %s, %s)
-                LIMIT 1
-            """, (
-                phone_number,
-                phone_number.lstrip('63'),
-                '0' + phone_number.lstrip('63')
-            ))
+        async with get_async_cursor() as cur:
+            await execute_statement(cur, "user_by_phone_variants", phone_variants(phone_number))
             
-            user = cur.fetchone()
+            user = await cur.fetchone()
             
             if not user:
                 raise HTTPException(
@@ -46,6 +50,8 @@ async def get_user_by_phone(phone_number: str):
             
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         print(f"❌ Error fetching user: {e}")
         raise HTTPException(
@@ -59,17 +65,10 @@ async def check_user(request: CheckUserRequest):
     try:
         phone_number = normalize_phone_number(request.phone_number)
         
-        with get_db_cursor() as cur:
-            cur.execute("""
-                SELECT id, first_name, middle_name, last_name, suffix,
-                       house_address, barangay, phone_number, role,
-                       is_verified, created_at, updated_at
-                FROM users
-                WHERE phone_number = %s
-                LIMIT 1
-            """, (phone_number,))
+        async with get_async_cursor() as cur:
+            await execute_statement(cur, "user_by_phone", (phone_number,))
             
-            user_data = cur.fetchone()
+            user_data = await cur.fetchone()
             
             if user_data:
                 return CheckUserResponse(
@@ -86,6 +85,8 @@ async def check_user(request: CheckUserRequest):
                     user=None
                 )
                 
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -99,17 +100,10 @@ async def get_user(request: LoginRequest):
     try:
         phone_number = normalize_phone_number(request.phone_number)
         
-        with get_db_cursor() as cur:
-            cur.execute("""
-                SELECT id, first_name, middle_name, last_name, suffix,
-                       house_address, barangay, phone_number, role,
-                       is_verified, created_at, updated_at
-                FROM users
-                WHERE phone_number = %s
-                LIMIT 1
-            """, (phone_number,))
+        async with get_async_cursor() as cur:
+            await execute_statement(cur, "user_by_phone", (phone_number,))
             
-            user_data = cur.fetchone()
+            user_data = await cur.fetchone()
             
             if not user_data:
                 raise HTTPException(
@@ -118,22 +112,29 @@ async def get_user(request: LoginRequest):
                 )
             
             # Mark user as verified
-            if not user_data['is_verified']:
-                cur.execute("""
+            newly_verified = not user_data['is_verified']
+            if newly_verified:
+                await cur.execute("""
                     UPDATE users
                     SET is_verified = TRUE, updated_at = %s
                     WHERE phone_number = %s
                 """, (datetime.utcnow(), phone_number))
+                await cur.execute(NOTIFY_SQL, (str(user_data['id']),))
                 user_data['is_verified'] = True
-            
-            return LoginResponse(
-                success=True,
-                message="User retrieved successfully",
-                user=User(**user_data)
-            )
+        
+        if newly_verified:
+            get_recipient_roster().upsert(user_data)
+        
+        return LoginResponse(
+            success=True,
+            message="User retrieved successfully",
+            user=User(**user_data)
+        )
                 
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -149,10 +150,10 @@ async def create_user(user_data: UserCreate):
     try:
         phone_number = normalize_phone_number(user_data.phone_number)
         
-        with get_db_cursor() as cur:
+        async with get_async_cursor() as cur:
             # Check if user exists
-            cur.execute("SELECT id FROM users WHERE phone_number = %s", (phone_number,))
-            if cur.fetchone():
+            await cur.execute("SELECT id FROM users WHERE phone_number = %s", (phone_number,))
+            if await cur.fetchone():
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="User with this phone number already exists"
@@ -162,7 +163,7 @@ async def create_user(user_data: UserCreate):
             user_id = str(uuid.uuid4())
             now = datetime.utcnow()
             
-            cur.execute("""
+            await cur.execute("""
                 INSERT INTO users (
                     id, first_name, middle_name, last_name, suffix,
                     house_address, barangay, phone_number, role,
@@ -186,15 +187,19 @@ async def create_user(user_data: UserCreate):
                 now
             ))
             
-            new_user = cur.fetchone()
+            new_user = await cur.fetchone()
+            await cur.execute(NOTIFY_SQL, (str(new_user['id']),))
             
             # ✅ Add success logging
             print(f"✅ User created successfully: {user_id} | {phone_number}")
-            
-            return User(**new_user)
+        
+        get_recipient_roster().upsert(new_user)
+        return User(**new_user)
             
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         print(f"❌ Error creating user: {str(e)}")
         raise HTTPException(
@@ -206,25 +211,41 @@ async def create_user(user_data: UserCreate):
 # ✅ FIX: Handle both "/" and "" (with and without trailing slash)
 @router.get("/", response_model=List[User])
 @router.get("", response_model=List[User])
-async def get_users():
-    """Get all users"""
-    with get_db_cursor() as cur:
-        cur.execute("""
-            SELECT id, first_name, middle_name, last_name, suffix,
-                   house_address, barangay, phone_number, role,
-                   is_verified, created_at, updated_at
+async def get_users(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_LIMIT),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    accept: Optional[str] = Header(None),
+):
+    """
+    Get users (newest first)
+    
+    All of them unless `limit` or `after` is passed; then pass the
+    X-Next-Cursor response header as `after` for the next page.
+    `fields` limits the returned columns (e.g. "id,first_name,barangay")
+    """
+    limit = page_limit(limit, after)
+    cursor = decode_cursor(after, (datetime, str))
+    columns = parse_fields(fields, USER_FIELDS)
+    media_type = negotiate(accept)
+    
+    async with get_async_read_cursor() as cur:
+        await cur.execute(f"""
+            SELECT {select_list(columns, USER_FIELDS, USER_SORT_KEY)}
             FROM users
-            ORDER BY created_at DESC
-        """)
-        users = cur.fetchall()
-        return [User(**user) for user in users]
+            {"WHERE (created_at, id) < (%s, %s)" if cursor else ""}
+            ORDER BY created_at DESC, id DESC
+            LIMIT %s
+        """, (*(cursor or ()), fetch_limit(limit)))
+        users = await cur.fetchall()
+        return paginate(users, limit, lambda row: (row["created_at"], row["id"]), User, columns, media_type)
 
 
 @router.get("/{user_id}", response_model=User)
 async def get_user_by_id(user_id: str):
     """Get user by ID"""
-    with get_db_cursor() as cur:
-        cur.execute("""
+    async with get_async_cursor() as cur:
+        await cur.execute("""
             SELECT id, first_name, middle_name, last_name, suffix,
                    house_address, barangay, phone_number, role,
                    is_verified, created_at, updated_at
@@ -232,7 +253,7 @@ async def get_user_by_id(user_id: str):
             WHERE id = %s
         """, (user_id,))
         
-        user_data = cur.fetchone()
+        user_data = await cur.fetchone()
         if not user_data:
             raise HTTPException(status_code=404, detail="User not found")
         
@@ -245,8 +266,8 @@ async def update_user(user_id: str, user_data: UserUpdate):
     try:
         phone_number = normalize_phone_number(user_data.phone_number)
         
-        with get_db_cursor() as cur:
-            cur.execute("""
+        async with get_async_cursor() as cur:
+            await cur.execute("""
                 UPDATE users
                 SET first_name = %s, middle_name = %s, last_name = %s, suffix = %s,
                     house_address = %s, barangay = %s, phone_number = %s, role = %s,
@@ -269,14 +290,18 @@ async def update_user(user_id: str, user_data: UserUpdate):
                 user_id
             ))
             
-            updated_user = cur.fetchone()
+            updated_user = await cur.fetchone()
             if not updated_user:
                 raise HTTPException(status_code=404, detail="User not found")
-            
-            return User(**updated_user)
+            await cur.execute(NOTIFY_SQL, (str(user_id),))
+        
+        get_recipient_roster().upsert(updated_user)
+        return User(**updated_user)
             
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -287,11 +312,13 @@ async def update_user(user_id: str, user_data: UserUpdate):
 @router.delete("/{user_id}")
 async def delete_user(user_id: str):
     """Delete user"""
-    with get_db_cursor() as cur:
-        cur.execute("DELETE FROM users WHERE id = %s RETURNING id", (user_id,))
-        deleted = cur.fetchone()
+    async with get_async_cursor() as cur:
+        await cur.execute("DELETE FROM users WHERE id = %s RETURNING id", (user_id,))
+        deleted = await cur.fetchone()
         
         if not deleted:
             raise HTTPException(status_code=404, detail="User not found")
-        
-        return {"success": True, "message": "User deleted successfully"}
\ No newline at end of file
+        await cur.execute(NOTIFY_SQL, (str(user_id),))
+    
+    get_recipient_roster().remove(user_id)
+    return {"success": True, "message": "User deleted successfully"}
\ No newline at end of file
@@ -3,7 +3,7 @@ Weather Hazard Prediction API Endpoints
 ML-based weather hazard prediction and forecasting
 """
 
-from fastapi import APIRouter, HTTPException, status, Query
+from fastapi import APIRouter, HTTPException, status, Query, Header
 from typing import Optional
 from datetime import datetime
 
@@ -20,7 +20,9 @@ from backend.models.prediction import (
 from backend.ml.predictor import WeatherPredictor
 from backend.ml.hazard_analyzer import HazardAnalyzer
 from backend.ml.model_manager import ModelManager
+from backend.services.api_quota import QuotaExceededError
 from backend.utils.logger import get_logger
+from backend.utils.responses import columnar, negotiate, negotiated_response
 
 logger = get_logger(__name__)
 
@@ -58,7 +60,7 @@ async def health_check():
 
 
 @router.post("/predict", response_model=PredictionResponse)
-async def predict_from_weather_data(request: PredictionRequest):
+async def predict_from_weather_data(request: PredictionRequest, accept: Optional[str] = Header(None)):
     """
     Predict weather hazards from raw weather API data
     
@@ -110,12 +112,13 @@ async def predict_from_weather_data(request: PredictionRequest):
         
         logger.info(f"Prediction made: {prediction['hazard_type']} (risk={prediction['risk_level']})")
         
-        return PredictionResponse(
+        response = PredictionResponse(
             success=True,
             prediction=prediction,
             notification=hazard_info,
             features=features
         )
+        return negotiated_response(response.model_dump(), negotiate(accept))
         
     except HTTPException:
         raise
@@ -128,7 +131,7 @@ async def predict_from_weather_data(request: PredictionRequest):
 
 
 @router.post("/predict-custom", response_model=PredictionResponse)
-async def predict_from_custom_features(request: CustomFeaturesRequest):
+async def predict_from_custom_features(request: CustomFeaturesRequest, accept: Optional[str] = Header(None)):
     """
     Predict weather hazards from custom weather features
     
@@ -157,12 +160,13 @@ async def predict_from_custom_features(request: CustomFeaturesRequest):
         # Get notification template
         hazard_info = HazardAnalyzer.get_hazard_info(prediction["hazard_type"])
         
-        return PredictionResponse(
+        response = PredictionResponse(
             success=True,
             prediction=prediction,
             notification=hazard_info,
             features=request.features
         )
+        return negotiated_response(response.model_dump(), negotiate(accept))
         
     except Exception as e:
         logger.error(f"Custom prediction failed: {e}")
@@ -173,7 +177,11 @@ async def predict_from_custom_features(request: CustomFeaturesRequest):
 
 
 @router.post("/forecast", response_model=ForecastPredictionResponse)
-async def predict_forecast(request: ForecastPredictionRequest):
+async def predict_forecast(
+    request: ForecastPredictionRequest,
+    layout: str = Query(default="rows", pattern="^(rows|columns)$", description="'columns': predictions as one array per field"),
+    accept: Optional[str] = Header(None)
+):
     """
     Predict hazards for multiple forecast time points
     
@@ -212,13 +220,16 @@ async def predict_forecast(request: ForecastPredictionRequest):
         
         logger.info(f"Forecast predictions: {len(hazard_events)}/{len(predictions)} hazard events")
         
-        return ForecastPredictionResponse(
-            success=True,
-            total_predictions=len(predictions),
-            hazard_events=len(hazard_events),
-            predictions=predictions,
-            summary=summary
-        )
+        # Rendered directly: predictions carry pandas Timestamps and numpy floats
+        # that would otherwise go through response_model validation and jsonable_encoder
+        return negotiated_response({
+            "success": True,
+            "total_predictions": len(predictions),
+            "hazard_events": len(hazard_events),
+            "layout": layout,
+            "predictions": columnar(predictions) if layout == "columns" else predictions,
+            "summary": summary
+        }, negotiate(accept))
         
     except Exception as e:
         logger.error(f"Forecast prediction failed: {e}")
@@ -231,7 +242,9 @@ async def predict_forecast(request: ForecastPredictionRequest):
 @router.get("/forecast/summary", response_model=ForecastSummary)
 async def get_forecast_summary(
     source: str = Query(default="openweather", description="Weather data source"),
-    hours: int = Query(default=120, description="Forecast duration in hours (default 120 = 5 days)")
+    hours: int = Query(default=120, description="Forecast duration in hours (default 120 = 5 days)"),
+    layout: str = Query(default="rows", pattern="^(rows|columns)$", description="'columns': timeline as one array per field"),
+    accept: Optional[str] = Header(None)
 ):
     """
     Get summary of hazards in upcoming forecast period
@@ -253,12 +266,12 @@ async def get_forecast_summary(
     }
     """
     try:
-        from backend.ml.weather_client import OpenWeatherClient
+        from backend.ml.weather_client import AsyncOpenWeatherClient
         
-        # Fetch forecast
-        client = OpenWeatherClient()
+        # Fetch forecast (async client so the event loop isn't blocked)
+        client = AsyncOpenWeatherClient()
         cnt = min(hours // 3, 40)  # OpenWeather gives 3-hour intervals, max 40 points
-        forecasts = client.get_forecast(cnt=cnt)
+        forecasts = await client.get_forecast(cnt=cnt)
         
         # Make predictions
         predictions = predictor.predict_batch(forecasts, source)
@@ -273,8 +286,12 @@ async def get_forecast_summary(
         # Create summary
         summary = _create_forecast_summary(predictions, hazard_events)
         
-        return ForecastSummary(**summary)
+        if layout == "columns":
+            summary["timeline"] = columnar(summary["timeline"])
+        return negotiated_response({**summary, "layout": layout}, negotiate(accept))
         
+    except QuotaExceededError:
+        raise
     except Exception as e:
         logger.error(f"Forecast summary failed: {e}")
         raise HTTPException(
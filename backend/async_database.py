@@ -0,0 +1,253 @@
+"""
+Async database connection pool for the FastAPI routers
+Uses psycopg 3 so queries don't block the event loop
+"""
+
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from psycopg import OperationalError
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import dict_row
+from psycopg.types.string import TextLoader
+from psycopg_pool import AsyncConnectionPool, PoolTimeout
+from backend import query_metrics
+from backend.config import Config
+from backend.database import PoolSaturatedError, ReplicaRouter, REPLICA_LAG_SQL, parse_replica_host
+
+# Global async connection pool
+_async_pool = None
+
+# Async read replica pools and their lag state
+_async_replica_pools = {}
+_async_replica_router = None
+
+
+def _conninfo(host=None, port=None, **extra):
+    """libpq DSN with values quoted/escaped (passwords may contain spaces or quotes)"""
+    return make_conninfo(
+        dbname=Config.DB_NAME,
+        user=Config.DB_USER,
+        password=Config.DB_PASSWORD,
+        host=host or Config.DB_HOST,
+        port=port or Config.DB_PORT,
+        **extra,
+    )
+
+
+def _connection_kwargs():
+    kwargs = {"row_factory": dict_row}
+    if Config.DB_QUERY_METRICS:
+        kwargs["cursor_factory"] = query_metrics.InstrumentedAsyncCursor
+    return kwargs
+
+
+async def _configure(conn):
+    """Per-connection setup: return UUID columns as str, like psycopg2 does"""
+    conn.adapters.register_loader("uuid", TextLoader)
+
+
+async def init_async_pool():
+    """Open the async connection pool (call from the app startup event)"""
+    global _async_pool
+
+    if _async_pool is None:
+        try:
+            _async_pool = AsyncConnectionPool(
+                _conninfo(),
+                min_size=Config.DB_POOL_MIN,
+                max_size=Config.DB_POOL_MAX,
+                timeout=Config.DB_POOL_TIMEOUT,
+                max_lifetime=Config.DB_POOL_MAX_LIFETIME,
+                check=AsyncConnectionPool.check_connection,
+                kwargs=_connection_kwargs(),
+                configure=_configure,
+                name="hydromet-async",
+                open=False,
+            )
+            await _async_pool.open()
+            print(f"✅ Async database pool created: {Config.DB_HOST}:{Config.DB_PORT}/{Config.DB_NAME}")
+        except Exception as e:
+            _async_pool = None
+            print(f"❌ Error creating async connection pool: {e}")
+            raise
+        
+        await _init_async_replica_pools()
+
+    return _async_pool
+
+
+async def _init_async_replica_pools():
+    """One async pool per configured replica (opened without waiting, so a down replica can't block startup)"""
+    global _async_replica_router
+    
+    _async_replica_router = ReplicaRouter(Config.DB_REPLICA_HOSTS)
+    for name in Config.DB_REPLICA_HOSTS:
+        host, port = parse_replica_host(name)
+        replica_pool = AsyncConnectionPool(
+            _conninfo(host, port, connect_timeout=3),
+            min_size=0,
+            max_size=Config.DB_REPLICA_POOL_MAX,
+            timeout=Config.DB_POOL_TIMEOUT,
+            max_lifetime=Config.DB_POOL_MAX_LIFETIME,
+            check=AsyncConnectionPool.check_connection,
+            kwargs=_connection_kwargs(),
+            configure=_configure,
+            name=f"hydromet-replica-{name}",
+            open=False,
+        )
+        await replica_pool.open(wait=False)
+        _async_replica_pools[name] = replica_pool
+        print(f"✅ Async replica pool created: {name}")
+
+
+async def get_async_pool():
+    """Get the async connection pool (open if doesn't exist)"""
+    if _async_pool is None:
+        return await init_async_pool()
+    return _async_pool
+
+
+@asynccontextmanager
+async def get_async_connection():
+    """
+    Async context manager for database connections
+    Commits on success, rolls back on error
+
+    Usage:
+        async with get_async_connection() as conn:
+            await conn.execute("UPDATE users SET ...")
+
+    Raises:
+        PoolSaturatedError: no connection freed up within DB_POOL_TIMEOUT
+    """
+    pool_instance = await get_async_pool()
+    started = time.perf_counter()
+    try:
+        async with pool_instance.connection() as conn:
+            if Config.DB_QUERY_METRICS:
+                query_metrics.get_query_metrics().record_pool_wait((time.perf_counter() - started) * 1000)
+            yield conn
+    except PoolTimeout as e:
+        raise PoolSaturatedError(Config.DB_POOL_TIMEOUT, Config.DB_POOL_TIMEOUT) from e
+
+
+@asynccontextmanager
+async def get_async_cursor():
+    """
+    Async equivalent of get_db_cursor()
+    Rows are returned as dictionaries
+
+    Usage:
+        async with get_async_cursor() as cur:
+            await cur.execute("SELECT * FROM users")
+            users = await cur.fetchall()
+    """
+    async with get_async_connection() as conn:
+        async with conn.cursor() as cursor:
+            yield cursor
+
+
+@asynccontextmanager
+async def get_async_read_cursor(max_staleness=None):
+    """
+    Async read-only cursor on a replica, falling back to the primary
+    
+    Replicas are picked round-robin and skipped while their replay lag
+    exceeds max_staleness seconds (default DB_REPLICA_MAX_LAG), while
+    down, or while their pool is saturated. Only for queries that can
+    tolerate that staleness; writes always use get_async_cursor().
+    
+    Usage:
+        async with get_async_read_cursor() as cur:
+            await cur.execute("SELECT * FROM notifications")
+            rows = await cur.fetchall()
+    """
+    await get_async_pool()
+    
+    if _async_replica_pools:
+        max_staleness = Config.DB_REPLICA_MAX_LAG if max_staleness is None else max_staleness
+        router = _async_replica_router
+        
+        for name in router.order():
+            if router.skip(name):
+                continue
+            
+            replica_pool = _async_replica_pools[name]
+            stack = AsyncExitStack()
+            # Only acquiring is guarded: errors from the caller's block must propagate, not fall through
+            try:
+                conn = await stack.enter_async_context(
+                    replica_pool.connection(timeout=Config.DB_REPLICA_ACQUIRE_TIMEOUT)
+                )
+            except PoolTimeout:
+                # No connection at all means the replica is down, not busy
+                if replica_pool.get_stats().get("pool_size", 0) == 0:
+                    router.record_failure(name)
+                continue
+            except OperationalError:
+                router.record_failure(name)
+                continue
+            
+            async with stack:
+                if router.needs_check(name):
+                    try:
+                        cur = await conn.execute(REPLICA_LAG_SQL)
+                        router.record_lag(name, (await cur.fetchone())["lag"])
+                    except OperationalError:
+                        router.record_failure(name)
+                        continue
+                
+                if not router.usable(name, max_staleness):
+                    continue
+                
+                router.record_routed(name)
+                async with conn.cursor() as cursor:
+                    yield cursor
+                return
+        
+        router.record_fallback()
+    
+    async with get_async_cursor() as cursor:
+        yield cursor
+
+
+def get_async_replica_metrics():
+    """Async replica lag/health and routing counters (empty without replicas)"""
+    if not _async_replica_pools:
+        return {}
+    return _async_replica_router.metrics()
+
+
+async def close_async_pool():
+    """Close all connections in the async pool (and the replica pools)"""
+    global _async_pool
+    if _async_pool:
+        await _async_pool.close()
+        _async_pool = None
+        print("✅ Async database pool closed")
+    
+    for replica_pool in _async_replica_pools.values():
+        await replica_pool.close()
+    if _async_replica_pools:
+        _async_replica_pools.clear()
+        print("✅ Async replica pools closed")
+
+
+def get_async_pool_metrics():
+    """Async pool usage counters (empty if the pool isn't open)"""
+    if _async_pool is None:
+        return {}
+
+    stats = _async_pool.get_stats()
+    return {
+        "size": stats.get("pool_size", 0),
+        "max_size": stats.get("pool_max", Config.DB_POOL_MAX),
+        "in_use": stats.get("pool_size", 0) - stats.get("pool_available", 0),
+        "idle": stats.get("pool_available", 0),
+        "waiters": stats.get("requests_waiting", 0),
+        "acquired_total": stats.get("requests_num", 0),
+        "timeouts_total": stats.get("requests_errors", 0),
+        "wait_avg_ms": round(stats.get("requests_wait_ms", 0) / stats["requests_num"], 2)
+        if stats.get("requests_num") else 0.0,
+        "connections_lost_total": stats.get("connections_lost", 0),
+    }
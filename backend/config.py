@@ -17,10 +17,80 @@ class Config:
     DB_HOST = os.getenv("DB_HOST", "localhost")
     DB_PORT = os.getenv("DB_PORT", "5432")
     
+    # Database connection pool
+    DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", 1))
+    DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", 20))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 5))                      # seconds to wait for a free connection
+    DB_POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME", 1800))         # recycle connections older than this
+    DB_POOL_HEALTH_CHECK_IDLE = float(os.getenv("DB_POOL_HEALTH_CHECK_IDLE", 30))  # ping connections idle longer than this
+    DB_PREPARE_STATEMENTS = os.getenv("DB_PREPARE_STATEMENTS", "true").lower() == "true"   # prepare hot-path statements per connection
+    
+    # Read replicas ("host:port,host:port"; same database and credentials as the primary)
+    DB_REPLICA_HOSTS = [h.strip() for h in os.getenv("DB_REPLICA_HOSTS", "").split(",") if h.strip()]
+    DB_REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", 10))                # default staleness tolerated by read cursors (seconds)
+    DB_REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", 5))   # re-measure replay lag at most this often
+    DB_REPLICA_POOL_MAX = int(os.getenv("DB_REPLICA_POOL_MAX", 10))                # connections per replica
+    DB_REPLICA_ACQUIRE_TIMEOUT = float(os.getenv("DB_REPLICA_ACQUIRE_TIMEOUT", 1))  # wait for a replica connection before trying the next one / the primary
+    
+    # Query instrumentation (per-statement latency histograms, slow-query plans)
+    DB_QUERY_METRICS = os.getenv("DB_QUERY_METRICS", "false").lower() == "true"
+    DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", 250))                   # capture statements slower than this
+    DB_SLOW_QUERY_LOG_SIZE = int(os.getenv("DB_SLOW_QUERY_LOG_SIZE", 50))          # slow queries kept in the ring buffer
+    DB_SLOW_QUERY_EXPLAIN = os.getenv("DB_SLOW_QUERY_EXPLAIN", "true").lower() == "true"   # EXPLAIN slow statements (ANALYZE only for pure reads)
+    
+    # Per-process cache for hotlines / safety categories / safety tips
+    CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    CACHE_VERSION_CHECK_INTERVAL = float(os.getenv("CACHE_VERSION_CHECK_INTERVAL", 2))   # re-read cache_versions at most this often (seconds)
+    CACHE_TTL = float(os.getenv("CACHE_TTL", 300))                                       # upper bound on entry age, for writes made outside the API
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 1000))                        # oldest entries evicted beyond this
+
+    # Response rendering
+    VALIDATE_DB_ROWS = os.getenv("VALIDATE_DB_ROWS", "false").lower() == "true"   # build a Pydantic model per row before rendering lists
+
+    # HTTP caching hints
+    HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", 60))   # Cache-Control max-age for hotlines / safety lists (seconds)
+
+    # GET /api/bootstrap snapshot
+    BOOTSTRAP_REFRESH_INTERVAL = float(os.getenv("BOOTSTRAP_REFRESH_INTERVAL", 5))   # poll sources for changes this often (seconds)
+    BOOTSTRAP_MAX_AGE = float(os.getenv("BOOTSTRAP_MAX_AGE", 300))                   # rebuild at least this often, for writes outside the API
+    BOOTSTRAP_NOTIFICATIONS = int(os.getenv("BOOTSTRAP_NOTIFICATIONS", 20))          # latest notifications included
+
+    # Alert outbox (scripts/alert_worker.py delivers queued in-app / SMS alerts)
+    ALERT_OUTBOX_ENABLED = os.getenv("ALERT_OUTBOX_ENABLED", "false").lower() == "true"  # queue alerts instead of sending them inline (needs a running worker)
+    ALERT_BATCH_SIZE = int(os.getenv("ALERT_BATCH_SIZE", 50))              # rows claimed per worker round trip
+    ALERT_MAX_ATTEMPTS = int(os.getenv("ALERT_MAX_ATTEMPTS", 8))           # deliveries tried before a row is marked failed
+    ALERT_RETRY_BASE = float(os.getenv("ALERT_RETRY_BASE", 5))             # first retry within this many seconds, doubling per attempt
+    ALERT_RETRY_MAX = float(os.getenv("ALERT_RETRY_MAX", 900))             # cap on the retry delay (seconds)
+    ALERT_LEASE_SECONDS = float(os.getenv("ALERT_LEASE_SECONDS", 120))     # claimed rows return to the queue if not recorded by then
+    ALERT_POLL_INTERVAL = float(os.getenv("ALERT_POLL_INTERVAL", 1))       # idle worker checks for due rows this often (seconds)
+
+    # SMS recipient roster (verified users kept in memory for alert fan-out)
+    ROSTER_RESYNC_INTERVAL = float(os.getenv("ROSTER_RESYNC_INTERVAL", 300))   # full reload from users this often, for writes outside this process
+
+    # Weather APIs (override base URLs to point at local stubs)
+    OPENWEATHER_BASE_URL = os.getenv("OPENWEATHER_BASE_URL", "https://api.openweathermap.org/data/2.5")
+    WEATHERLINK_BASE_URL = os.getenv("WEATHERLINK_BASE_URL", "https://api.weatherlink.com/v2")
+    
+    # Upstream API budgets shared across processes (file | postgres | off)
+    API_QUOTA_BACKEND = os.getenv("API_QUOTA_BACKEND", "file")
+    API_QUOTA_FILE = os.getenv("API_QUOTA_FILE")
+    API_QUOTAS_PER_MINUTE = {
+        "openweather": float(os.getenv("OPENWEATHER_QUOTA_PER_MINUTE", 60)),
+        "weatherlink": float(os.getenv("WEATHERLINK_QUOTA_PER_MINUTE", 60)),
+    }
+    
     # iProg SMS API
     IPROG_API_TOKEN = os.getenv("IPROG_API_TOKEN")
     IPROG_BASE_URL = os.getenv("IPROG_BASE_URL", "https://sms.iprogtech.com/api/v1")     
+    SMS_CHUNK_SIZE = int(os.getenv("SMS_CHUNK_SIZE", 100))             # recipients per send_bulk request
+    SMS_CONCURRENCY = int(os.getenv("SMS_CONCURRENCY", 8))             # chunks in flight at once (pooled connections)
+    SMS_TIMEOUT = float(os.getenv("SMS_TIMEOUT", 10))                  # seconds per send_bulk request
+    SMS_CHUNK_RETRIES = int(os.getenv("SMS_CHUNK_RETRIES", 2))         # extra rounds for failed chunks only
+    SMS_RETRY_BACKOFF = float(os.getenv("SMS_RETRY_BACKOFF", 1))       # seconds before the first retry round, doubling
 
+    # Outbound HTTP (weather API clients)
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", 20))
+    
     # OTP Settings
     OTP_VALIDITY_MINUTES = int(os.getenv("OTP_VALIDITY_MINUTES", 5))
     OTP_MAX_ATTEMPTS = int(os.getenv("OTP_MAX_ATTEMPTS", 3))
@@ -3,15 +3,330 @@ Shared database connection pool for all APIs
 Uses connection pooling for optimal performance
 """
 
+import time
+import threading
 import psycopg2
 from psycopg2 import pool
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
 from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
 from backend.config import Config
+from backend import query_metrics
 
 # Global connection pool
 _connection_pool = None
 
+# Read replica pools and their lag state
+_replica_pools = None
+_replica_router = None
+
+# Replay lag in seconds (0 on a primary, or a streaming replica that has
+# replayed everything it received - an idle primary must not look like lag).
+# NULL while the WAL receiver isn't streaming: receive = replay then only
+# means nothing new arrived, so the replica's staleness is unknown.
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END AS lag
+"""
+
+
+class PoolSaturatedError(pool.PoolError):
+    """Raised when no connection frees up within the acquisition timeout"""
+    
+    def __init__(self, timeout: float, retry_after: float):
+        self.timeout = timeout
+        self.retry_after = retry_after
+        super().__init__(f"Database pool saturated: no connection available within {timeout:.1f}s")
+
+
+class BoundedConnectionPool:
+    """
+    Thread-safe connection pool with a bounded wait
+    
+    - getconn() blocks up to `timeout` seconds for a free connection, then
+      raises PoolSaturatedError instead of failing immediately
+    - Connections idle longer than `health_check_idle` are pinged on checkout
+    - Connections older than `max_lifetime` are closed and replaced
+    """
+    
+    def __init__(self, minconn, maxconn, timeout=5.0, max_lifetime=1800.0,
+                 health_check_idle=30.0, **conn_kwargs):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_idle = health_check_idle
+        self.conn_kwargs = conn_kwargs
+        
+        self._cond = threading.Condition()
+        self._idle = []          # [(conn, last_used)] most recently used last
+        self._created = {}       # id(conn) -> created_at
+        self._in_use = set()
+        self._opening = 0
+        self._waiters = 0
+        self._closed = False
+        
+        self._stats = {
+            "acquired": 0,
+            "timeouts": 0,
+            "wait_total": 0.0,
+            "wait_max": 0.0,
+            "recycled": 0,
+            "health_check_failures": 0,
+        }
+        
+        for _ in range(minconn):
+            conn = self._connect()
+            self._idle.append((conn, time.monotonic()))
+    
+    # ----- Internals -----
+    
+    def _connect(self):
+        conn = psycopg2.connect(**self.conn_kwargs)
+        self._created[id(conn)] = time.monotonic()
+        return conn
+    
+    def _discard(self, conn):
+        self._created.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+    
+    def _expired(self, conn, now):
+        created = self._created.get(id(conn), now)
+        return self.max_lifetime and now - created > self.max_lifetime
+    
+    def _healthy(self, conn, last_used, now):
+        if conn.closed:
+            return False
+        if now - last_used < self.health_check_idle:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+    
+    @property
+    def _size(self):
+        return len(self._idle) + len(self._in_use) + self._opening
+    
+    # ----- Public API -----
+    
+    def getconn(self, timeout=None):
+        """
+        Check out a connection, waiting up to `timeout` seconds
+        
+        Raises:
+            PoolSaturatedError: pool still exhausted after the timeout
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        
+        while True:
+            conn, last_used = self._reserve(timeout, deadline)
+            
+            if conn is None:
+                # Slot reserved: open a new connection outside the lock
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._opening -= 1
+                        self._cond.notify()
+                    raise
+                
+                with self._cond:
+                    self._opening -= 1
+                    self._in_use.add(conn)
+                    return self._record_wait(conn, started)
+            
+            # Ping outside the lock so other threads aren't held up
+            if self._healthy(conn, last_used, time.monotonic()):
+                with self._cond:
+                    return self._record_wait(conn, started)
+            
+            with self._cond:
+                self._stats["health_check_failures"] += 1
+                self._in_use.discard(conn)
+                self._discard(conn)
+                self._cond.notify()
+    
+    def _reserve(self, timeout, deadline):
+        """Take an idle connection, or reserve a slot for a new one (returns None)"""
+        with self._cond:
+            if self._closed:
+                raise pool.PoolError("connection pool is closed")
+            
+            self._waiters += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    
+                    while self._idle:
+                        conn, last_used = self._idle.pop()
+                        if self._expired(conn, now):
+                            self._stats["recycled"] += 1
+                            self._discard(conn)
+                            continue
+                        self._in_use.add(conn)
+                        return conn, last_used
+                    
+                    if self._size < self.maxconn:
+                        self._opening += 1
+                        return None, None
+                    
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolSaturatedError(timeout, self._retry_after())
+                    self._cond.wait(remaining)
+            finally:
+                self._waiters -= 1
+    
+    def _record_wait(self, conn, started):
+        wait = time.monotonic() - started
+        self._stats["acquired"] += 1
+        self._stats["wait_total"] += wait
+        self._stats["wait_max"] = max(self._stats["wait_max"], wait)
+        return conn
+    
+    def _retry_after(self):
+        # Rough hint: one acquisition timeout per queued waiter ahead of us
+        return max(1.0, self.timeout * self._waiters / max(1, self.maxconn))
+    
+    def putconn(self, conn, close=False):
+        """Return a connection; broken, dirty or expired ones are closed"""
+        with self._cond:
+            self._in_use.discard(conn)
+            now = time.monotonic()
+            
+            if (close or self._closed or conn.closed or self._expired(conn, now)
+                    or conn.get_transaction_status() != TRANSACTION_STATUS_IDLE):
+                if not close and not conn.closed and self._expired(conn, now):
+                    self._stats["recycled"] += 1
+                self._discard(conn)
+            else:
+                self._idle.append((conn, now))
+            
+            self._cond.notify()
+    
+    def closeall(self):
+        """Close idle connections now; in-use ones are closed when returned"""
+        with self._cond:
+            self._closed = True
+            for conn, _ in self._idle:
+                self._discard(conn)
+            self._idle = []
+            self._cond.notify_all()
+    
+    def metrics(self):
+        """Snapshot of pool usage and wait statistics"""
+        with self._cond:
+            acquired = self._stats["acquired"]
+            return {
+                "size": self._size,
+                "max_size": self.maxconn,
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "waiters": self._waiters,
+                "acquired_total": acquired,
+                "timeouts_total": self._stats["timeouts"],
+                "wait_avg_ms": round(1000 * self._stats["wait_total"] / acquired, 2) if acquired else 0.0,
+                "wait_max_ms": round(1000 * self._stats["wait_max"], 2),
+                "recycled_total": self._stats["recycled"],
+                "health_check_failures_total": self._stats["health_check_failures"],
+            }
+
+
+class ReplicaRouter:
+    """
+    Round-robin replica selection with a staleness bound
+    
+    Tracks the last measured replay lag of each replica. Lag is
+    re-measured on checkout once DB_REPLICA_CHECK_INTERVAL has passed;
+    a replica that fails to connect sits out until its next check.
+    """
+    
+    def __init__(self, names):
+        self.names = list(names)
+        self._lock = threading.Lock()
+        self._next = 0
+        self._state = {
+            name: {"lag": None, "checked_at": 0.0, "healthy": True, "routed": 0, "errors": 0}
+            for name in self.names
+        }
+        self._fallbacks = 0
+    
+    def order(self):
+        """Replica names, rotated one step per call"""
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % max(len(self.names), 1)
+        return self.names[start:] + self.names[:start]
+    
+    def needs_check(self, name):
+        state = self._state[name]
+        return time.monotonic() - state["checked_at"] >= Config.DB_REPLICA_CHECK_INTERVAL
+    
+    def skip(self, name):
+        """True while a failed replica waits for its next check"""
+        return not self._state[name]["healthy"] and not self.needs_check(name)
+    
+    def record_lag(self, name, lag):
+        """lag None (WAL receiver not streaming) keeps the replica out of rotation until the next check"""
+        with self._lock:
+            self._state[name].update(
+                lag=float(lag) if lag is not None else None, checked_at=time.monotonic(), healthy=True
+            )
+    
+    def record_failure(self, name):
+        with self._lock:
+            state = self._state[name]
+            state.update(healthy=False, checked_at=time.monotonic())
+            state["errors"] += 1
+    
+    def usable(self, name, max_staleness):
+        state = self._state[name]
+        return state["healthy"] and state["lag"] is not None and state["lag"] <= max_staleness
+    
+    def record_routed(self, name):
+        with self._lock:
+            self._state[name]["routed"] += 1
+    
+    def record_fallback(self):
+        with self._lock:
+            self._fallbacks += 1
+    
+    def metrics(self):
+        with self._lock:
+            return {
+                "replicas": {
+                    name: {
+                        "healthy": state["healthy"],
+                        "lag_seconds": state["lag"],
+                        "routed_total": state["routed"],
+                        "errors_total": state["errors"],
+                    }
+                    for name, state in self._state.items()
+                },
+                "primary_fallbacks_total": self._fallbacks,
+            }
+
+
+def parse_replica_host(name):
+    """'host:port' (or 'host') -> (host, port)"""
+    host, _, port = name.partition(":")
+    return host, port or Config.DB_PORT
+
 
 def init_connection_pool():
     """Initialize the database connection pool"""
@@ -19,9 +334,12 @@ def init_connection_pool():
     
     if _connection_pool is None:
         try:
-            _connection_pool = pool.SimpleConnectionPool(
-                minconn=1,
-                maxconn=20,
+            _connection_pool = BoundedConnectionPool(
+                minconn=Config.DB_POOL_MIN,
+                maxconn=Config.DB_POOL_MAX,
+                timeout=Config.DB_POOL_TIMEOUT,
+                max_lifetime=Config.DB_POOL_MAX_LIFETIME,
+                health_check_idle=Config.DB_POOL_HEALTH_CHECK_IDLE,
                 dbname=Config.DB_NAME,
                 user=Config.DB_USER,
                 password=Config.DB_PASSWORD,
@@ -56,15 +374,25 @@ def get_db_connection():
                 result = cur.fetchall()
     """
     pool_instance = get_connection_pool()
+    started = time.perf_counter()
     conn = pool_instance.getconn()
+    if Config.DB_QUERY_METRICS:
+        query_metrics.get_query_metrics().record_pool_wait((time.perf_counter() - started) * 1000)
+    broken = False
     try:
         yield conn
         conn.commit()
     except Exception as e:
-        conn.rollback()
+        broken = isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+        if not conn.closed:
+            conn.rollback()
         raise e
     finally:
-        pool_instance.putconn(conn)
+        pool_instance.putconn(conn, close=broken)
+
+
+def _dict_cursor_factory():
+    return query_metrics.InstrumentedDictCursor if Config.DB_QUERY_METRICS else RealDictCursor
 
 
 @contextmanager
@@ -80,20 +408,166 @@ def get_db_cursor():
             # users is a list of dicts
     """
     with get_db_connection() as conn:
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor = conn.cursor(cursor_factory=_dict_cursor_factory())
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+
+
+def _get_replica_pools():
+    """Lazily create one bounded pool per configured replica"""
+    global _replica_pools, _replica_router
+    
+    if _replica_pools is None:
+        _replica_router = ReplicaRouter(Config.DB_REPLICA_HOSTS)
+        _replica_pools = {}
+        for name in Config.DB_REPLICA_HOSTS:
+            host, port = parse_replica_host(name)
+            _replica_pools[name] = BoundedConnectionPool(
+                minconn=0,
+                maxconn=Config.DB_REPLICA_POOL_MAX,
+                timeout=Config.DB_POOL_TIMEOUT,
+                max_lifetime=Config.DB_POOL_MAX_LIFETIME,
+                health_check_idle=Config.DB_POOL_HEALTH_CHECK_IDLE,
+                dbname=Config.DB_NAME,
+                user=Config.DB_USER,
+                password=Config.DB_PASSWORD,
+                host=host,
+                port=port,
+                connect_timeout=3,
+            )
+    
+    return _replica_pools
+
+
+def _checkout_replica(max_staleness):
+    """
+    First replica (round-robin) within max_staleness seconds of the primary
+    
+    Returns:
+        (name, pool, conn), or None when every replica is down, lagging or saturated
+    """
+    pools = _get_replica_pools()
+    
+    for name in _replica_router.order():
+        if _replica_router.skip(name):
+            continue
+        
+        replica_pool = pools[name]
+        try:
+            conn = replica_pool.getconn(timeout=Config.DB_REPLICA_ACQUIRE_TIMEOUT)
+        except PoolSaturatedError:
+            continue
+        except psycopg2.Error:
+            _replica_router.record_failure(name)
+            continue
+        
+        try:
+            if _replica_router.needs_check(name):
+                with conn.cursor() as cur:
+                    cur.execute(REPLICA_LAG_SQL)
+                    _replica_router.record_lag(name, cur.fetchone()[0])
+                conn.rollback()
+        except psycopg2.Error:
+            _replica_router.record_failure(name)
+            replica_pool.putconn(conn, close=True)
+            continue
+        
+        if _replica_router.usable(name, max_staleness):
+            _replica_router.record_routed(name)
+            return name, replica_pool, conn
+        
+        replica_pool.putconn(conn)
+    
+    return None
+
+
+@contextmanager
+def get_read_connection(max_staleness=None):
+    """
+    Read-only connection from a replica, falling back to the primary
+    
+    Replicas are load-balanced round-robin; one whose replay lag exceeds
+    max_staleness seconds (default DB_REPLICA_MAX_LAG) is skipped. Use
+    max_staleness=0 to read your own just-committed writes. Without
+    replicas configured this is the primary connection.
+    
+    Usage:
+        with get_read_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT * FROM notifications")
+    """
+    checkout = None
+    if Config.DB_REPLICA_HOSTS:
+        max_staleness = Config.DB_REPLICA_MAX_LAG if max_staleness is None else max_staleness
+        checkout = _checkout_replica(max_staleness)
+        if checkout is None:
+            _replica_router.record_fallback()
+    
+    if checkout is None:
+        with get_db_connection() as conn:
+            yield conn
+        return
+    
+    name, replica_pool, conn = checkout
+    broken = False
+    try:
+        yield conn
+        conn.rollback()
+    except Exception as e:
+        broken = isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+        if broken:
+            _replica_router.record_failure(name)
+        if not conn.closed:
+            conn.rollback()
+        raise e
+    finally:
+        replica_pool.putconn(conn, close=broken)
+
+
+@contextmanager
+def get_read_cursor(max_staleness=None):
+    """
+    get_db_cursor() for read-only queries, routed like get_read_connection()
+    
+    Usage:
+        with get_read_cursor() as cur:
+            cur.execute("SELECT * FROM users")
+            users = cur.fetchall()
+    """
+    with get_read_connection(max_staleness) as conn:
+        cursor = conn.cursor(cursor_factory=_dict_cursor_factory())
         try:
             yield cursor
         finally:
             cursor.close()
 
 
+def get_replica_metrics():
+    """Replica lag/health and routing counters (empty without replicas)"""
+    if _replica_router is None:
+        return {}
+    metrics = _replica_router.metrics()
+    for name, replica_pool in (_replica_pools or {}).items():
+        metrics["replicas"][name]["pool"] = replica_pool.metrics()
+    return metrics
+
+
 def close_connection_pool():
-    """Close all connections in the pool"""
-    global _connection_pool
+    """Close all connections in the pool (and the replica pools)"""
+    global _connection_pool, _replica_pools, _replica_router
     if _connection_pool:
         _connection_pool.closeall()
         _connection_pool = None
         print("✅ Database connection pool closed")
+    
+    if _replica_pools:
+        for replica_pool in _replica_pools.values():
+            replica_pool.closeall()
+        _replica_pools = None
+        _replica_router = None
+        print("✅ Replica connection pools closed")
 
 
 def test_connection():
@@ -0,0 +1,93 @@
+-- Core application tables used by the API routers.
+-- IF NOT EXISTS so databases created by hand before migrations existed are adopted as-is.
+
+CREATE TABLE IF NOT EXISTS users (
+    id VARCHAR(64) PRIMARY KEY,
+    first_name VARCHAR(64) NOT NULL,
+    middle_name VARCHAR(64),
+    last_name VARCHAR(64) NOT NULL,
+    suffix VARCHAR(16),
+    house_address TEXT NOT NULL,
+    barangay VARCHAR(64) NOT NULL,
+    phone_number VARCHAR(20) NOT NULL,
+    role VARCHAR(32) NOT NULL DEFAULT 'resident',
+    is_verified BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS otp_requests (
+    id SERIAL PRIMARY KEY,
+    phone_number VARCHAR(20) NOT NULL,
+    otp_hash TEXT NOT NULL,
+    expires_at TIMESTAMP NOT NULL,
+    attempts_left INTEGER NOT NULL DEFAULT 3,
+    is_verified BOOLEAN NOT NULL DEFAULT FALSE,
+    is_invalidated BOOLEAN NOT NULL DEFAULT FALSE,
+    verified_at TIMESTAMP,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS notifications (
+    id VARCHAR(64) PRIMARY KEY,
+    title VARCHAR(255) NOT NULL,
+    message TEXT NOT NULL,
+    type VARCHAR(50) NOT NULL,
+    sent_to VARCHAR(50) NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    date_time TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS emergency_hotlines (
+    id VARCHAR(64) PRIMARY KEY,
+    service_name VARCHAR(255) NOT NULL,
+    phone_number VARCHAR(20) NOT NULL,
+    category VARCHAR(100) NOT NULL,
+    icon_color VARCHAR(50) NOT NULL,
+    icon_type VARCHAR(50) NOT NULL,
+    is_active BOOLEAN NOT NULL DEFAULT TRUE,
+    priority INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS safety_categories (
+    category_id VARCHAR(128) PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    description TEXT,
+    order_num INTEGER,
+    icon VARCHAR(100),
+    gradient_colors TEXT,
+    is_active BOOLEAN NOT NULL DEFAULT TRUE,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS safety_tips (
+    tip_id VARCHAR(128) PRIMARY KEY,
+    category_id VARCHAR(128) NOT NULL REFERENCES safety_categories(category_id) ON DELETE CASCADE,
+    title VARCHAR(255) NOT NULL,
+    content TEXT NOT NULL,
+    order_num INTEGER,
+    icon VARCHAR(100),
+    is_active BOOLEAN NOT NULL DEFAULT TRUE,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS admin (
+    id SERIAL PRIMARY KEY,
+    email VARCHAR(255) NOT NULL UNIQUE,
+    role VARCHAR(50) NOT NULL,
+    username VARCHAR(50) NOT NULL,
+    uid VARCHAR(128) NOT NULL
+);
+
+-- Shared upstream API budgets (backend/services/api_quota.py, API_QUOTA_BACKEND=postgres)
+CREATE TABLE IF NOT EXISTS api_quota_buckets (
+    key VARCHAR(64) PRIMARY KEY,
+    tokens DOUBLE PRECISION,
+    updated_at DOUBLE PRECISION,
+    used_total DOUBLE PRECISION NOT NULL DEFAULT 0,
+    denied_total DOUBLE PRECISION NOT NULL DEFAULT 0
+);
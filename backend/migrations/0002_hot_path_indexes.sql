@@ -0,0 +1,51 @@
+-- Indexes for the queries every login, OTP and app refresh runs.
+-- `python -m backend.migrations check` verifies none of them fall back to a sequential scan.
+-- List endpoints page by keyset (backend/utils/pagination.py), so their sort-key
+-- indexes end in the primary key: a (sort key, id) cursor is a single index range scan.
+
+-- Login / registration: user lookup by phone (users.py, otp.py)
+CREATE INDEX IF NOT EXISTS idx_users_phone_number
+    ON users (phone_number);
+
+-- Latest live OTP for a phone (verify), and invalidating live OTPs (resend).
+-- Partial: invalidated rows are never read again, so they stay out of the index.
+CREATE INDEX IF NOT EXISTS idx_otp_requests_phone_live
+    ON otp_requests (phone_number, created_at DESC)
+    WHERE is_invalidated = FALSE;
+
+-- OTP rate limiting: requests per phone in a time window
+CREATE INDEX IF NOT EXISTS idx_otp_requests_phone_created
+    ON otp_requests (phone_number, created_at);
+
+-- Notification feed, newest first, optionally by status: (date_time, id) DESC
+CREATE INDEX IF NOT EXISTS idx_notifications_date_time_id
+    ON notifications (date_time DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_notifications_status_date_time_id
+    ON notifications (status, date_time DESC, id DESC);
+
+-- User list, newest first: (created_at, id) DESC
+CREATE INDEX IF NOT EXISTS idx_users_created_at_id
+    ON users (created_at DESC, id DESC);
+
+-- Safety tips in display order (order_num NULLs last, title, tip_id): active or all, and per category
+CREATE INDEX IF NOT EXISTS idx_safety_tips_active_sort
+    ON safety_tips ((COALESCE(order_num, 2147483647)), title, tip_id)
+    WHERE is_active = TRUE;
+CREATE INDEX IF NOT EXISTS idx_safety_tips_sort
+    ON safety_tips ((COALESCE(order_num, 2147483647)), title, tip_id);
+CREATE INDEX IF NOT EXISTS idx_safety_tips_category_active_order
+    ON safety_tips (category_id, order_num, title)
+    WHERE is_active = TRUE;
+
+-- Safety categories and hotlines: active rows in display order
+CREATE INDEX IF NOT EXISTS idx_safety_categories_active_order
+    ON safety_categories (order_num, name)
+    WHERE is_active = TRUE;
+CREATE INDEX IF NOT EXISTS idx_emergency_hotlines_active_sort
+    ON emergency_hotlines (priority, service_name, id)
+    WHERE is_active = TRUE;
+CREATE INDEX IF NOT EXISTS idx_emergency_hotlines_sort
+    ON emergency_hotlines (priority, service_name, id);
+CREATE INDEX IF NOT EXISTS idx_emergency_hotlines_category_priority
+    ON emergency_hotlines (category, priority)
+    WHERE is_active = TRUE;
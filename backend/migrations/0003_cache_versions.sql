@@ -0,0 +1,15 @@
+-- Version counters for the per-process collection cache (backend/services/collection_cache.py).
+-- Writes through the API bump a row in the same transaction; workers poll this table
+-- to drop cached hotlines / safety categories / safety tips written elsewhere.
+
+CREATE TABLE IF NOT EXISTS cache_versions (
+    name VARCHAR(64) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO cache_versions (name) VALUES
+    ('emergency_hotlines'),
+    ('safety_categories'),
+    ('safety_tips')
+ON CONFLICT (name) DO NOTHING;
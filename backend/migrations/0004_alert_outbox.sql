@@ -0,0 +1,43 @@
+-- Durable outbox for hazard alerts (backend/services/alert_outbox.py).
+-- NotificationService enqueues one row per channel; scripts/alert_worker.py claims due rows
+-- with FOR UPDATE SKIP LOCKED, delivers them and records every attempt.
+
+CREATE TABLE IF NOT EXISTS alert_outbox (
+    id BIGSERIAL PRIMARY KEY,
+    channel VARCHAR(16) NOT NULL CHECK (channel IN ('in_app', 'sms')),
+    payload JSONB NOT NULL,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'sending', 'delivered', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    locked_by VARCHAR(128),
+    locked_until TIMESTAMP,
+    last_error TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    delivered_at TIMESTAMP
+);
+
+-- Due rows, oldest first. Partial: delivered/failed rows are never claimed again
+CREATE INDEX IF NOT EXISTS idx_alert_outbox_due
+    ON alert_outbox (next_attempt_at, id)
+    WHERE status = 'pending';
+
+-- Rows whose worker died mid-delivery (lease expired)
+CREATE INDEX IF NOT EXISTS idx_alert_outbox_leased
+    ON alert_outbox (locked_until)
+    WHERE status = 'sending';
+
+CREATE TABLE IF NOT EXISTS alert_delivery_attempts (
+    id BIGSERIAL PRIMARY KEY,
+    outbox_id BIGINT NOT NULL REFERENCES alert_outbox (id) ON DELETE CASCADE,
+    attempt INTEGER NOT NULL,
+    worker VARCHAR(128) NOT NULL,
+    started_at TIMESTAMP NOT NULL,
+    duration_ms REAL NOT NULL,
+    success BOOLEAN NOT NULL,
+    error TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_alert_delivery_attempts_outbox
+    ON alert_delivery_attempts (outbox_id, attempt);
@@ -0,0 +1,9 @@
+-- Latest auto-predictor cycle summary (backend/services/auto_predictor.py), shared by
+-- every API worker: whichever process runs the cycle saves it, the bootstrap snapshot
+-- in each worker reads it.
+
+CREATE TABLE IF NOT EXISTS prediction_summary (
+    id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    summary JSONB NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
@@ -0,0 +1,19 @@
+"""
+Database schema migrations
+
+Usage:
+    python -m backend.migrations migrate
+    python -m backend.migrations status
+    python -m backend.migrations check
+"""
+
+from backend.migrations.runner import migrate, migration_status, discover_migrations
+from backend.migrations.plan_check import check_query_plans, HOT_QUERIES
+
+__all__ = [
+    'migrate',
+    'migration_status',
+    'discover_migrations',
+    'check_query_plans',
+    'HOT_QUERIES',
+]
@@ -0,0 +1,66 @@
+"""
+Migration CLI
+
+Usage:
+    python -m backend.migrations migrate [--target N]
+    python -m backend.migrations status
+    python -m backend.migrations check
+"""
+
+import sys
+import argparse
+
+from backend.migrations import migrate, migration_status, check_query_plans
+
+
+def cmd_migrate(args):
+    applied = migrate(target=args.target)
+    print(f"✅ Applied {len(applied)} migration(s)" if applied else "✅ Schema is up to date")
+    return 0
+
+
+def cmd_status(args):
+    for row in migration_status():
+        state = row["applied_at"].strftime("%Y-%m-%d %H:%M") if row["applied_at"] else "pending"
+        flag = "  ⚠️ modified since applied" if row["modified"] else ""
+        print(f"  {row['version']:04d}_{row['name']:<32} {state}{flag}")
+    return 0
+
+
+def cmd_check(args):
+    results = check_query_plans()
+    for result in results:
+        if result["ok"]:
+            print(f"  ✅ {result['name']:<32} {result['node']}")
+        else:
+            print(f"  ❌ {result['name']:<32} Seq Scan on {', '.join(result['seq_scans'])}")
+
+    failed = [r for r in results if not r["ok"]]
+    if failed:
+        print(f"\n❌ {len(failed)} hot quer{'y' if len(failed) == 1 else 'ies'} without a usable index")
+        return 1
+
+    print(f"\n✅ All {len(results)} hot queries use an index")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hydromet database migrations")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p = subparsers.add_parser("migrate", help="Apply pending migrations")
+    p.add_argument("--target", type=int, help="Stop after this version")
+    p.set_defaults(func=cmd_migrate)
+
+    p = subparsers.add_parser("status", help="List migrations and whether they are applied")
+    p.set_defaults(func=cmd_status)
+
+    p = subparsers.add_parser("check", help="Fail if any hot query plan uses a sequential scan")
+    p.set_defaults(func=cmd_check)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
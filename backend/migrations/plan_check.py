@@ -0,0 +1,125 @@
+"""
+Query plan check for the hot-path queries
+Runs EXPLAIN on each one with sequential scans disabled; any plan that still
+contains a Seq Scan has no usable index and fails the check
+"""
+
+from typing import List, Dict, Any
+
+from backend.database import get_db_connection
+from backend.statements import STATEMENTS
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SAMPLE_PHONE = "09170000000"
+
+# (name, sql, sample params) - list queries mirror the routers
+HOT_QUERIES = [
+    ("users.by_phone", STATEMENTS["user_by_phone"], (SAMPLE_PHONE,)),
+    ("users.by_phone_variants", STATEMENTS["user_by_phone_variants"],
+     (SAMPLE_PHONE, "9170000000", "09170000000")),
+    ("otp.latest", STATEMENTS["otp_latest"], (SAMPLE_PHONE,)),
+    ("otp.update_attempts", STATEMENTS["otp_update_attempts"], (2, 1)),
+    ("otp.mark_verified", STATEMENTS["otp_mark_verified"], ("2025-01-01", 1)),
+    ("otp.invalidate_live", """
+        UPDATE otp_requests
+        SET is_invalidated = TRUE
+        WHERE phone_number = %s AND is_verified = FALSE AND is_invalidated = FALSE
+    """, (SAMPLE_PHONE,)),
+    ("notifications.page", """
+        SELECT id, title, date_time FROM notifications
+        WHERE (date_time, id) < (%s, %s)
+        ORDER BY date_time DESC, id DESC
+        LIMIT 51
+    """, ("2025-01-01", "x")),
+    ("notifications.by_status_page", """
+        SELECT id, title, date_time FROM notifications
+        WHERE status = %s AND (date_time, id) < (%s, %s)
+        ORDER BY date_time DESC, id DESC
+        LIMIT 51
+    """, ("sent", "2025-01-01", "x")),
+    ("users.page", """
+        SELECT id, created_at FROM users
+        WHERE (created_at, id) < (%s, %s)
+        ORDER BY created_at DESC, id DESC
+        LIMIT 51
+    """, ("2025-01-01", "x")),
+    ("hotlines.active_page", """
+        SELECT id FROM emergency_hotlines
+        WHERE is_active = true AND (priority, service_name, id) > (%s, %s, %s)
+        ORDER BY priority ASC, service_name ASC, id ASC
+        LIMIT 51
+    """, (0, "", "")),
+    ("safety_tips.active_page", """
+        SELECT tip_id FROM safety_tips
+        WHERE is_active = true
+        AND (COALESCE(order_num, 2147483647), title, tip_id) > (%s, %s, %s)
+        ORDER BY COALESCE(order_num, 2147483647) ASC, title ASC, tip_id ASC
+        LIMIT 51
+    """, (0, "", "")),
+    ("safety_tips.by_category", """
+        SELECT tip_id FROM safety_tips
+        WHERE category_id = %s AND is_active = true
+        ORDER BY order_num ASC, title ASC
+    """, ("flood",)),
+    ("safety_categories.list_active", """
+        SELECT category_id FROM safety_categories
+        WHERE is_active = true
+        ORDER BY order_num ASC, name ASC
+    """, ()),
+    ("alert_outbox.claim_due", """
+        SELECT id FROM alert_outbox
+        WHERE (status = 'pending' AND next_attempt_at <= NOW())
+           OR (status = 'sending' AND locked_until < NOW())
+        ORDER BY next_attempt_at, id
+        LIMIT 50
+        FOR UPDATE SKIP LOCKED
+    """, ()),
+    ("hotlines.by_category", """
+        SELECT id FROM emergency_hotlines
+        WHERE category = %s AND is_active = true
+        ORDER BY priority ASC
+    """, ("Medical",)),
+]
+
+
+def _seq_scans(plan: Dict[str, Any]) -> List[str]:
+    """Relations read by Seq Scan nodes anywhere in a JSON plan tree"""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+def check_query_plans(queries=None) -> List[Dict[str, Any]]:
+    """
+    EXPLAIN every hot query (nothing is executed)
+
+    Returns:
+        One result per query: name, ok, seq_scans, plan root node type
+    """
+    results = []
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            # Small tables would make a seq scan the cheapest plan anyway;
+            # with it disabled, a seq scan only remains if no index applies
+            cur.execute("SET LOCAL enable_seqscan = off")
+
+            for name, sql, params in queries or HOT_QUERIES:
+                cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+                plan = cur.fetchone()[0][0]["Plan"]
+                seq_scans = _seq_scans(plan)
+                results.append({
+                    "name": name,
+                    "ok": not seq_scans,
+                    "seq_scans": seq_scans,
+                    "node": plan.get("Node Type"),
+                })
+
+        conn.rollback()
+
+    return results
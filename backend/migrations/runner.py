@@ -0,0 +1,127 @@
+"""
+Versioned SQL migrations
+Applies backend/migrations/NNNN_name.sql files in order, once each
+"""
+
+import os
+import re
+import hashlib
+from typing import List, Dict, Any
+
+from backend.database import get_db_connection
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+MIGRATION_FILE = re.compile(r"^(\d{4})_([a-z0-9_]+)\.sql$")
+
+# Serializes concurrent runners (several workers starting at once)
+ADVISORY_LOCK_ID = 727_001
+
+
+def discover_migrations() -> List[Dict[str, Any]]:
+    """Migration files sorted by version"""
+    migrations = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = MIGRATION_FILE.match(filename)
+        if not match:
+            continue
+        with open(os.path.join(MIGRATIONS_DIR, filename), encoding="utf-8") as f:
+            sql = f.read()
+        migrations.append({
+            "version": int(match.group(1)),
+            "name": match.group(2),
+            "sql": sql,
+            "checksum": hashlib.sha256(sql.encode("utf-8")).hexdigest(),
+        })
+    return migrations
+
+
+def _ensure_migrations_table(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            checksum VARCHAR(64) NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+        )
+    """)
+
+
+def _applied(cur) -> Dict[int, str]:
+    cur.execute("SELECT version, checksum FROM schema_migrations")
+    return {version: checksum for version, checksum in cur.fetchall()}
+
+
+def migrate(target: int = None) -> List[int]:
+    """
+    Apply pending migrations (each in its own transaction)
+
+    Args:
+        target: Stop after this version (default: latest)
+
+    Returns:
+        Versions applied by this run
+    """
+    applied_now = []
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_lock(%s)", (ADVISORY_LOCK_ID,))
+            try:
+                _ensure_migrations_table(cur)
+                conn.commit()
+                applied = _applied(cur)
+
+                for migration in discover_migrations():
+                    version = migration["version"]
+                    if target is not None and version > target:
+                        break
+
+                    if version in applied:
+                        if applied[version] != migration["checksum"]:
+                            logger.warning(f"⚠️ Migration {version:04d}_{migration['name']} changed after it was applied")
+                        continue
+
+                    logger.info(f"⏳ Applying {version:04d}_{migration['name']}...")
+                    try:
+                        cur.execute(migration["sql"])
+                        cur.execute(
+                            "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                            (version, migration["name"], migration["checksum"])
+                        )
+                        conn.commit()
+                    except Exception as e:
+                        conn.rollback()
+                        logger.error(f"❌ Migration {version:04d}_{migration['name']} failed: {e}")
+                        raise
+
+                    applied_now.append(version)
+                    logger.info(f"✅ Applied {version:04d}_{migration['name']}")
+            finally:
+                cur.execute("SELECT pg_advisory_unlock(%s)", (ADVISORY_LOCK_ID,))
+
+    if not applied_now:
+        logger.info("✅ Schema is up to date")
+    return applied_now
+
+
+def migration_status() -> List[Dict[str, Any]]:
+    """Every known migration with its applied state"""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            _ensure_migrations_table(cur)
+            cur.execute("SELECT version, checksum, applied_at FROM schema_migrations")
+            applied = {version: (checksum, applied_at) for version, checksum, applied_at in cur.fetchall()}
+
+    status = []
+    for migration in discover_migrations():
+        checksum, applied_at = applied.get(migration["version"], (None, None))
+        status.append({
+            "version": migration["version"],
+            "name": migration["name"],
+            "applied_at": applied_at,
+            "modified": checksum is not None and checksum != migration["checksum"],
+        })
+    return status
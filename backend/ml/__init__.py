@@ -5,7 +5,12 @@ Weather hazard prediction system
 
 from backend.ml.model_manager import ModelManager
 from backend.ml.predictor import WeatherPredictor
-from backend.ml.weather_client import OpenWeatherClient, WeatherLinkClient
+from backend.ml.weather_client import (
+    OpenWeatherClient,
+    WeatherLinkClient,
+    AsyncOpenWeatherClient,
+    AsyncWeatherLinkClient,
+)
 from backend.ml.hazard_analyzer import HazardAnalyzer, determine_hazard_type
 
 __all__ = [
@@ -13,6 +18,8 @@ __all__ = [
     'WeatherPredictor',
     'OpenWeatherClient',
     'WeatherLinkClient',
+    'AsyncOpenWeatherClient',
+    'AsyncWeatherLinkClient',
     'HazardAnalyzer',
     'determine_hazard_type',
 ]
\ No newline at end of file
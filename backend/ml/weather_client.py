@@ -5,45 +5,123 @@ OpenWeather and WeatherLink API integrations
 
 import os
 import requests
-from typing import Dict, List, Any, Optional
+import httpx
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timezone
 
 from backend.config import Config
+from backend.services.api_quota import get_quota_manager, PRIORITY_UI
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Shared HTTP connection pools (one per process)
+_http_session: Optional[requests.Session] = None
+_async_http_client: Optional[httpx.AsyncClient] = None
 
-class OpenWeatherClient:
-    """Client for OpenWeather API"""
+
+def get_http_session() -> requests.Session:
+    """Get the shared requests session used by the sync clients"""
+    global _http_session
+    if _http_session is None:
+        _http_session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=Config.HTTP_POOL_SIZE,
+            pool_maxsize=Config.HTTP_POOL_SIZE
+        )
+        _http_session.mount("https://", adapter)
+        _http_session.mount("http://", adapter)
+    return _http_session
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Get the shared httpx client used by the async clients"""
+    global _async_http_client
+    if _async_http_client is None or _async_http_client.is_closed:
+        _async_http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=Config.HTTP_POOL_SIZE,
+                max_keepalive_connections=Config.HTTP_POOL_SIZE
+            )
+        )
+    return _async_http_client
+
+
+async def close_http_clients():
+    """Close the shared HTTP connection pools"""
+    global _http_session, _async_http_client
+    if _async_http_client is not None:
+        await _async_http_client.aclose()
+        _async_http_client = None
+    if _http_session is not None:
+        _http_session.close()
+        _http_session = None
+
+
+class _OpenWeatherBase:
+    """Settings, request building and response parsing shared by the OpenWeather clients"""
     
-    BASE_URL = "https://api.openweathermap.org/data/2.5"
+    BASE_URL = Config.OPENWEATHER_BASE_URL.rstrip("/")
     
-    def __init__(self, api_key: Optional[str] = None, lat: Optional[float] = None, lon: Optional[float] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        lat: Optional[float] = None,
+        lon: Optional[float] = None,
+        priority: str = PRIORITY_UI
+    ):
         self.api_key = api_key or os.getenv("OPENWEATHER_API_KEY")
         self.lat = lat or float(os.getenv("OPENWEATHER_LAT", "14.3644"))
         self.lon = lon or float(os.getenv("OPENWEATHER_LON", "121.0619"))
+        self.priority = priority
         
         if not self.api_key:
             raise ValueError("OpenWeather API key not configured")
     
-    def get_current_weather(self) -> Dict[str, Any]:
-        """Get current weather data"""
-        url = f"{self.BASE_URL}/weather"
-        params = {
+    def _current_request(self) -> Tuple[str, Dict[str, Any]]:
+        """(url, params) for the current weather"""
+        return f"{self.BASE_URL}/weather", {
             "lat": self.lat,
             "lon": self.lon,
             "appid": self.api_key,
             "units": "metric"
         }
+    
+    def _forecast_request(self, cnt: int) -> Tuple[str, Dict[str, Any]]:
+        """(url, params) for the 5-day forecast"""
+        return f"{self.BASE_URL}/forecast", {
+            "lat": self.lat,
+            "lon": self.lon,
+            "appid": self.api_key,
+            "units": "metric",
+            "cnt": cnt
+        }
+    
+    def _parse_current(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        logger.info(f"✅ Current weather fetched for ({self.lat}, {self.lon})")
+        return data
+    
+    @staticmethod
+    def _parse_forecast(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        forecasts = data.get("list", [])
+        logger.info(f"✅ Forecast fetched: {len(forecasts)} time points")
+        return forecasts
+
+
+class OpenWeatherClient(_OpenWeatherBase):
+    """Client for OpenWeather API"""
+    
+    def get_current_weather(self) -> Dict[str, Any]:
+        """Get current weather data"""
+        url, params = self._current_request()
+        
+        get_quota_manager().acquire("openweather", self.priority)
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = get_http_session().get(url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
-            
-            logger.info(f"✅ Current weather fetched for ({self.lat}, {self.lon})")
-            return data
+            return self._parse_current(response.json())
             
         except requests.exceptions.RequestException as e:
             logger.error(f"❌ Failed to fetch current weather: {e}")
@@ -59,58 +137,137 @@ class OpenWeatherClient:
         Returns:
             List of forecast data points
         """
-        url = f"{self.BASE_URL}/forecast"
-        params = {
-            "lat": self.lat,
-            "lon": self.lon,
-            "appid": self.api_key,
-            "units": "metric",
-            "cnt": cnt
-        }
+        url, params = self._forecast_request(cnt)
+        
+        get_quota_manager().acquire("openweather", self.priority)
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = get_http_session().get(url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
+            return self._parse_forecast(response.json())
             
-            forecasts = data.get("list", [])
-            logger.info(f"✅ Forecast fetched: {len(forecasts)} time points")
+        except requests.exceptions.RequestException as e:
+            logger.error(f"❌ Failed to fetch forecast: {e}")
+            raise
+
+
+class AsyncOpenWeatherClient(_OpenWeatherBase):
+    """Async client for OpenWeather API (for use inside async routes)"""
+    
+    async def get_current_weather(self) -> Dict[str, Any]:
+        """Get current weather data"""
+        url, params = self._current_request()
+        
+        await get_quota_manager().acquire_async("openweather", self.priority)
+        
+        try:
+            response = await get_async_http_client().get(url, params=params, timeout=10)
+            response.raise_for_status()
+            return self._parse_current(response.json())
             
-            return forecasts
+        except httpx.HTTPError as e:
+            logger.error(f"❌ Failed to fetch current weather: {e}")
+            raise
+    
+    async def get_forecast(self, cnt: int = 40) -> List[Dict[str, Any]]:
+        """
+        Get 5-day weather forecast (3-hour intervals)
+        
+        Args:
+            cnt: Number of timestamps (default 40 = 5 days * 8 readings/day)
+        
+        Returns:
+            List of forecast data points
+        """
+        url, params = self._forecast_request(cnt)
+        
+        await get_quota_manager().acquire_async("openweather", self.priority)
+        
+        try:
+            response = await get_async_http_client().get(url, params=params, timeout=10)
+            response.raise_for_status()
+            return self._parse_forecast(response.json())
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"❌ Failed to fetch forecast: {e}")
             raise
 
 
-class WeatherLinkClient:
-    """Client for WeatherLink API"""
+class _WeatherLinkBase:
+    """Settings, request building and response parsing shared by the WeatherLink clients"""
     
-    BASE_URL = "https://api.weatherlink.com/v2"
+    BASE_URL = Config.WEATHERLINK_BASE_URL.rstrip("/")
     
     def __init__(
         self,
         api_key: Optional[str] = None,
         api_secret: Optional[str] = None,
         station_id: Optional[str] = None,
-        lsid: Optional[int] = None
+        lsid: Optional[int] = None,
+        priority: str = PRIORITY_UI
     ):
         self.api_key = api_key or os.getenv("WEATHERLINK_API_KEY")
         self.api_secret = api_secret or os.getenv("WEATHERLINK_API_SECRET")
         self.station_id = station_id or os.getenv("WEATHERLINK_STATION_ID")
         self.lsid = lsid or int(os.getenv("WEATHERLINK_LSID", "813260"))
+        self.priority = priority
         
         if not all([self.api_key, self.api_secret, self.station_id]):
             raise ValueError("WeatherLink credentials not configured")
     
+    def _current_request(self) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+        """(url, params, headers) for the current conditions"""
+        return (
+            f"{self.BASE_URL}/current/{self.station_id}",
+            {"api-key": self.api_key},
+            {"x-api-secret": self.api_secret},
+        )
+    
+    def _historic_request(self, start_timestamp: int, end_timestamp: int) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+        """(url, params, headers) for an archive range"""
+        return (
+            f"{self.BASE_URL}/historic/{self.station_id}",
+            {
+                "api-key": self.api_key,
+                "start-timestamp": start_timestamp,
+                "end-timestamp": end_timestamp,
+            },
+            {"x-api-secret": self.api_secret},
+        )
+    
+    def _parse_historic(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Records of the sensor with our LSID ([] if the station didn't report it)"""
+        sensor = next(
+            (s for s in payload.get("sensors", []) if int(s.get("lsid", -1)) == self.lsid),
+            None
+        )
+        
+        if not sensor:
+            logger.error(f"Sensor LSID {self.lsid} not found")
+            return []
+        
+        records = sensor.get("data", [])
+        logger.info(f"✅ WeatherLink historic data: {len(records)} records")
+        
+        return records
+    
+    @staticmethod
+    def _last_24h_range() -> Tuple[int, int]:
+        end_ts = int(datetime.now(timezone.utc).timestamp())
+        return end_ts - (24 * 3600), end_ts
+
+
+class WeatherLinkClient(_WeatherLinkBase):
+    """Client for WeatherLink API"""
+    
     def get_current_conditions(self) -> Dict[str, Any]:
         """Get current weather conditions from WeatherLink"""
-        url = f"{self.BASE_URL}/current/{self.station_id}"
-        params = {"api-key": self.api_key}
-        headers = {"x-api-secret": self.api_secret}
+        url, params, headers = self._current_request()
+        
+        get_quota_manager().acquire("weatherlink", self.priority)
         
         try:
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+            response = get_http_session().get(url, params=params, headers=headers, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -132,33 +289,14 @@ class WeatherLinkClient:
         Returns:
             List of weather observations
         """
-        url = f"{self.BASE_URL}/historic/{self.station_id}"
-        params = {
-            "api-key": self.api_key,
-            "start-timestamp": start_timestamp,
-            "end-timestamp": end_timestamp,
-        }
-        headers = {"x-api-secret": self.api_secret}
+        url, params, headers = self._historic_request(start_timestamp, end_timestamp)
+        
+        get_quota_manager().acquire("weatherlink", self.priority)
         
         try:
-            response = requests.get(url, params=params, headers=headers, timeout=30)
+            response = get_http_session().get(url, params=params, headers=headers, timeout=30)
             response.raise_for_status()
-            payload = response.json()
-            
-            # Find sensor with matching LSID
-            sensor = next(
-                (s for s in payload.get("sensors", []) if int(s.get("lsid", -1)) == self.lsid),
-                None
-            )
-            
-            if not sensor:
-                logger.error(f"Sensor LSID {self.lsid} not found")
-                return []
-            
-            records = sensor.get("data", [])
-            logger.info(f"✅ WeatherLink historic data: {len(records)} records")
-            
-            return records
+            return self._parse_historic(response.json())
             
         except requests.exceptions.RequestException as e:
             logger.error(f"❌ Failed to fetch historic data: {e}")
@@ -166,7 +304,54 @@ class WeatherLinkClient:
     
     def get_last_24h(self) -> List[Dict[str, Any]]:
         """Get last 24 hours of data"""
-        end_ts = int(datetime.now(timezone.utc).timestamp())
-        start_ts = end_ts - (24 * 3600)
+        return self.get_historic_data(*self._last_24h_range())
+
+
+class AsyncWeatherLinkClient(_WeatherLinkBase):
+    """Async client for WeatherLink API (for use inside async routes)"""
+    
+    async def get_current_conditions(self) -> Dict[str, Any]:
+        """Get current weather conditions from WeatherLink"""
+        url, params, headers = self._current_request()
+        
+        await get_quota_manager().acquire_async("weatherlink", self.priority)
+        
+        try:
+            response = await get_async_http_client().get(url, params=params, headers=headers, timeout=10)
+            response.raise_for_status()
+            data = response.json()
+            
+            logger.info(f"✅ WeatherLink current conditions fetched")
+            return data
+            
+        except httpx.HTTPError as e:
+            logger.error(f"❌ Failed to fetch WeatherLink data: {e}")
+            raise
+    
+    async def get_historic_data(self, start_timestamp: int, end_timestamp: int) -> List[Dict[str, Any]]:
+        """
+        Get historic weather data
         
-        return self.get_historic_data(start_ts, end_ts)
\ No newline at end of file
+        Args:
+            start_timestamp: Unix timestamp start
+            end_timestamp: Unix timestamp end
+        
+        Returns:
+            List of weather observations
+        """
+        url, params, headers = self._historic_request(start_timestamp, end_timestamp)
+        
+        await get_quota_manager().acquire_async("weatherlink", self.priority)
+        
+        try:
+            response = await get_async_http_client().get(url, params=params, headers=headers, timeout=30)
+            response.raise_for_status()
+            return self._parse_historic(response.json())
+            
+        except httpx.HTTPError as e:
+            logger.error(f"❌ Failed to fetch historic data: {e}")
+            raise
+    
+    async def get_last_24h(self) -> List[Dict[str, Any]]:
+        """Get last 24 hours of data"""
+        return await self.get_historic_data(*self._last_24h_range())
@@ -0,0 +1,290 @@
+"""
+Per-statement query latency metrics and slow-query capture
+Enabled with DB_QUERY_METRICS=true; when off, the pools use their plain
+cursor classes and nothing here runs on the query path
+"""
+
+import re
+import time
+import bisect
+import threading
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+
+import psycopg
+from psycopg.rows import tuple_row
+from psycopg2.extras import RealDictCursor
+from psycopg2.extensions import cursor as TupleCursor
+
+from backend.config import Config
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Histogram upper bounds in milliseconds (last bucket is everything above)
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# At most one EXPLAIN per statement in this many seconds
+EXPLAIN_COOLDOWN = 60.0
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+")
+_VALUE_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_VALUE_ROWS = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_WHITESPACE = re.compile(r"\s+")
+_WRITES = re.compile(
+    r"\b(?:INSERT|UPDATE|DELETE|MERGE|NEXTVAL)\b|\bFOR\s+(?:NO\s+KEY\s+|KEY\s+)?(?:UPDATE|SHARE)\b",
+    re.IGNORECASE,
+)
+
+
+@lru_cache(maxsize=2048)
+def normalize(sql: str) -> str:
+    """Collapse a statement to its shape: literals and placeholders become ?"""
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _VALUE_LIST.sub("(?)", sql)
+    sql = _VALUE_ROWS.sub("(?), ...", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def _sql_text(query) -> str:
+    if isinstance(query, str):
+        return query
+    if isinstance(query, bytes):
+        return query.decode("utf-8", "replace")
+    return str(query)
+
+
+def _head(sql: str) -> str:
+    head = sql.lstrip().split(None, 1)[:1]
+    return head[0].upper() if head else ""
+
+
+def _explainable(sql: str) -> bool:
+    return _head(sql) in ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "MERGE")
+
+
+def _explain_command(sql: str) -> str:
+    # ANALYZE runs the statement again; only do that for pure reads. A WITH
+    # can hide a data-modifying CTE (alert_outbox.CLAIM_SQL), and row locks
+    # or nextval have side effects too, so those get the estimated plan only
+    if _head(sql) in ("SELECT", "WITH") and not _WRITES.search(sql):
+        return "EXPLAIN (ANALYZE, BUFFERS) "
+    return "EXPLAIN "
+
+
+class _Histogram:
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, ms):
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.buckets[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 2),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets": {
+                (f"le_{bound}" if i < len(BUCKETS_MS) else "inf"): n
+                for i, (bound, n) in enumerate(zip(BUCKETS_MS + (None,), self.buckets))
+            },
+        }
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th observation"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else round(self.max_ms, 2)
+        return round(self.max_ms, 2)
+
+
+class QueryMetrics:
+    """Latency histograms per normalized statement, pool wait times and a slow-query ring buffer"""
+
+    def __init__(self, slow_ms: float, slow_log_size: int, explain: bool):
+        self.slow_ms = slow_ms
+        self.explain = explain
+        self._lock = threading.Lock()
+        self._statements = {}
+        self._pool_wait = _Histogram()
+        self._slow = deque(maxlen=slow_log_size)
+        self._explained_at = {}
+
+    def record(self, sql: str, elapsed_ms: float, rows: int):
+        """Record one execution. Returns True if it should be EXPLAINed"""
+        key = normalize(sql)
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                stats = self._statements[key] = {"latency": _Histogram(), "rows": 0}
+            stats["latency"].add(elapsed_ms)
+            if rows and rows > 0:
+                stats["rows"] += rows
+
+            if elapsed_ms < self.slow_ms:
+                return False
+
+            now = time.monotonic()
+            wants_plan = (
+                self.explain and _explainable(sql)
+                and now - self._explained_at.get(key, -EXPLAIN_COOLDOWN) >= EXPLAIN_COOLDOWN
+            )
+            if wants_plan:
+                self._explained_at[key] = now
+            else:
+                self._slow.append(self._slow_entry(key, elapsed_ms, rows, None))
+            return wants_plan
+
+    def record_plan(self, sql: str, elapsed_ms: float, rows: int, plan: str):
+        with self._lock:
+            self._slow.append(self._slow_entry(normalize(sql), elapsed_ms, rows, plan))
+
+    @staticmethod
+    def _slow_entry(key, elapsed_ms, rows, plan):
+        # Normalized SQL only: parameters (phone numbers, OTP hashes) are never stored
+        return {
+            "statement": key,
+            "elapsed_ms": round(elapsed_ms, 2),
+            "rows": rows,
+            "captured_at": datetime.utcnow().isoformat(),
+            "plan": plan,
+        }
+
+    def record_pool_wait(self, elapsed_ms: float):
+        with self._lock:
+            self._pool_wait.add(elapsed_ms)
+
+    def statements(self, limit: int = 50):
+        """Statements ordered by total time spent"""
+        with self._lock:
+            items = [
+                {"statement": key, "rows_total": stats["rows"], **stats["latency"].snapshot()}
+                for key, stats in self._statements.items()
+            ]
+        items.sort(key=lambda s: s["total_ms"], reverse=True)
+        return items[:limit]
+
+    def pool_wait(self):
+        with self._lock:
+            return self._pool_wait.snapshot()
+
+    def slow_queries(self):
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            self._pool_wait = _Histogram()
+            self._slow.clear()
+            self._explained_at.clear()
+
+
+# Singleton instance
+_query_metrics = None
+
+
+def enabled() -> bool:
+    return Config.DB_QUERY_METRICS
+
+
+def get_query_metrics() -> QueryMetrics:
+    """Get or create the process-wide query metrics"""
+    global _query_metrics
+    if _query_metrics is None:
+        _query_metrics = QueryMetrics(
+            slow_ms=Config.DB_SLOW_QUERY_MS,
+            slow_log_size=Config.DB_SLOW_QUERY_LOG_SIZE,
+            explain=Config.DB_SLOW_QUERY_EXPLAIN,
+        )
+    return _query_metrics
+
+
+# ===== psycopg2 (sync) =====
+
+class _InstrumentedMixin:
+    def execute(self, query, vars=None):
+        started = time.perf_counter()
+        result = super().execute(query, vars)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        sql = _sql_text(query)
+        metrics = get_query_metrics()
+        if metrics.record(sql, elapsed_ms, self.rowcount):
+            metrics.record_plan(sql, elapsed_ms, self.rowcount, self._explain(query, vars))
+        return result
+
+    def _explain(self, query, vars):
+        """EXPLAIN on a separate cursor, inside a savepoint"""
+        conn = self.connection
+        try:
+            with conn.cursor(cursor_factory=TupleCursor) as cur:
+                cur.execute("SAVEPOINT query_metrics_explain")
+                try:
+                    cur.execute(_explain_command(_sql_text(query)).encode() + cur.mogrify(query, vars))
+                    plan = "\n".join(row[0] for row in cur.fetchall())
+                finally:
+                    cur.execute("ROLLBACK TO SAVEPOINT query_metrics_explain")
+                    cur.execute("RELEASE SAVEPOINT query_metrics_explain")
+            return plan
+        except Exception as e:
+            logger.warning(f"⚠️ Could not capture query plan: {e}")
+            return None
+
+
+class InstrumentedCursor(_InstrumentedMixin, TupleCursor):
+    """Tuple-row psycopg2 cursor that records statement latency"""
+
+
+class InstrumentedDictCursor(_InstrumentedMixin, RealDictCursor):
+    """RealDictCursor that records statement latency"""
+
+
+# ===== psycopg 3 (async) =====
+
+class InstrumentedAsyncCursor(psycopg.AsyncCursor):
+    """psycopg 3 async cursor that records statement latency"""
+
+    async def execute(self, query, params=None, **kwargs):
+        started = time.perf_counter()
+        result = await super().execute(query, params, **kwargs)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        sql = _sql_text(query)
+        metrics = get_query_metrics()
+        if metrics.record(sql, elapsed_ms, self.rowcount):
+            metrics.record_plan(sql, elapsed_ms, self.rowcount, await self._explain(query, params))
+        return result
+
+    async def _explain(self, query, params):
+        try:
+            async with self.connection.transaction(force_rollback=True):
+                # Plain cursor class, so the EXPLAIN itself isn't recorded
+                async with psycopg.AsyncCursor(self.connection, row_factory=tuple_row) as cur:
+                    sql = _sql_text(query)
+                    await cur.execute(_explain_command(sql) + sql, params)
+                    rows = await cur.fetchall()
+            return "\n".join(row[0] for row in rows)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not capture query plan: {e}")
+            return None
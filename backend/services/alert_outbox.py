@@ -0,0 +1,291 @@
+"""
+Alert Outbox
+Durable queue between whoever raises a hazard alert and the channels that
+deliver it (Firestore in-app notification, iProg SMS)
+
+Alerts are written to alert_outbox, one row per channel, and the caller
+returns. Workers (scripts/alert_worker.py) claim due rows in batches with
+FOR UPDATE SKIP LOCKED, so any number of them can run side by side without
+delivering a row twice at the same time. A claimed batch is leased for
+ALERT_LEASE_SECONDS and the lease is renewed every third of that while the
+batch is being delivered (a slow provider can't let rows expire mid-batch);
+if the worker dies, another one picks the rows up once the lease runs out.
+Failed deliveries are retried with exponential backoff until
+ALERT_MAX_ATTEMPTS, and every attempt is recorded in alert_delivery_attempts.
+
+Delivery is at-least-once: a worker that sends and then loses its database
+connection before recording the outcome will see the row sent again.
+"""
+
+import os
+import time
+import random
+import socket
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from psycopg2.extras import Json, execute_values
+
+from backend.config import Config
+from backend.database import get_db_cursor
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Channels (alert_outbox.channel)
+CHANNEL_IN_APP = "in_app"
+CHANNEL_SMS = "sms"
+
+# A handler delivers claimed rows of one channel and returns
+# {row id: None on success, error message on failure}; raising fails them all
+Handler = Callable[[List[Dict[str, Any]]], Dict[int, Optional[str]]]
+
+CLAIM_SQL = """
+    WITH due AS (
+        SELECT id FROM alert_outbox
+        WHERE (status = 'pending' AND next_attempt_at <= NOW())
+           OR (status = 'sending' AND locked_until < NOW())
+        ORDER BY next_attempt_at, id
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE alert_outbox o
+    SET status = 'sending',
+        attempts = o.attempts + 1,
+        locked_by = %s,
+        locked_until = NOW() + make_interval(secs => %s),
+        updated_at = NOW()
+    FROM due
+    WHERE o.id = due.id
+    RETURNING o.id, o.channel, o.payload, o.attempts, o.created_at
+"""
+
+
+def enqueue_alerts(messages: List[Tuple[str, Dict[str, Any]]]) -> List[int]:
+    """
+    Queue (channel, payload) pairs in one transaction
+
+    Usage:
+        enqueue_alerts([
+            (CHANNEL_IN_APP, {"title": title, "message": message, ...}),
+            (CHANNEL_SMS, {"message": sms, "recipients": None}),
+        ])
+    """
+    if not messages:
+        return []
+
+    with get_db_cursor() as cur:
+        rows = execute_values(
+            cur,
+            "INSERT INTO alert_outbox (channel, payload) VALUES %s RETURNING id",
+            [(channel, Json(payload)) for channel, payload in messages],
+            fetch=True,
+        )
+    return [row["id"] for row in rows]
+
+
+def update_payload(row_id: int, payload: Dict[str, Any]):
+    """
+    Replace a claimed row's payload before its retry (e.g. keep only the
+    SMS recipients whose chunks failed, so delivered ones aren't re-sent)
+    """
+    with get_db_cursor() as cur:
+        cur.execute(
+            "UPDATE alert_outbox SET payload = %s, updated_at = NOW() WHERE id = %s AND status = 'sending'",
+            (Json(payload), row_id)
+        )
+
+
+def retry_delay(attempts: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter for the attempt that just failed (1-based)"""
+    return random.uniform(0, min(cap, base * 2 ** (attempts - 1)))
+
+
+class AlertOutboxWorker:
+    """Claims due outbox rows, delivers them through per-channel handlers and records the outcomes"""
+
+    def __init__(
+        self,
+        handlers: Dict[str, Handler],
+        worker_id: Optional[str] = None,
+        batch_size: int = Config.ALERT_BATCH_SIZE,
+        max_attempts: int = Config.ALERT_MAX_ATTEMPTS,
+        lease_seconds: float = Config.ALERT_LEASE_SECONDS,
+        retry_base: float = Config.ALERT_RETRY_BASE,
+        retry_max: float = Config.ALERT_RETRY_MAX,
+        poll_interval: float = Config.ALERT_POLL_INTERVAL,
+    ):
+        self.handlers = handlers
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.poll_interval = poll_interval
+        self.stats = {"claimed": 0, "delivered": 0, "retried": 0, "failed": 0}
+
+    def claim(self) -> List[Dict[str, Any]]:
+        with get_db_cursor() as cur:
+            cur.execute(CLAIM_SQL, (self.batch_size, self.worker_id, self.lease_seconds))
+            rows = cur.fetchall()
+        self.stats["claimed"] += len(rows)
+        return rows
+
+    def deliver(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run each channel's handler on its rows; one outcome per row"""
+        by_channel = {}
+        for row in rows:
+            by_channel.setdefault(row["channel"], []).append(row)
+
+        outcomes = []
+        for channel, channel_rows in by_channel.items():
+            started_at = datetime.utcnow()
+            started = time.perf_counter()
+            handler = self.handlers.get(channel)
+            try:
+                if handler is None:
+                    raise RuntimeError(f"No handler for channel '{channel}'")
+                errors = handler(channel_rows)
+            except Exception as e:
+                errors = {row["id"]: f"{type(e).__name__}: {e}" for row in channel_rows}
+            duration_ms = (time.perf_counter() - started) * 1000
+
+            for row in channel_rows:
+                outcomes.append({
+                    "row": row,
+                    "error": errors.get(row["id"]),
+                    "started_at": started_at,
+                    "duration_ms": duration_ms,
+                })
+        return outcomes
+
+    def record(self, outcomes: List[Dict[str, Any]]):
+        """Store the attempts and move each row to delivered, pending (retry) or failed"""
+        delivered, rescheduled = [], []
+        for outcome in outcomes:
+            row, error = outcome["row"], outcome["error"]
+            if error is None:
+                delivered.append(row["id"])
+            elif row["attempts"] >= self.max_attempts:
+                rescheduled.append((row["id"], "failed", 0.0, error))
+            else:
+                delay = retry_delay(row["attempts"], self.retry_base, self.retry_max)
+                rescheduled.append((row["id"], "pending", delay, error))
+
+        with get_db_cursor() as cur:
+            execute_values(cur, """
+                INSERT INTO alert_delivery_attempts
+                    (outbox_id, attempt, worker, started_at, duration_ms, success, error)
+                VALUES %s
+            """, [
+                (o["row"]["id"], o["row"]["attempts"], self.worker_id, o["started_at"],
+                 o["duration_ms"], o["error"] is None, o["error"])
+                for o in outcomes
+            ])
+
+            # Only rows this worker still holds: if the lease ran out, the new holder records them
+            if delivered:
+                cur.execute("""
+                    UPDATE alert_outbox
+                    SET status = 'delivered', delivered_at = NOW(), updated_at = NOW(),
+                        locked_by = NULL, locked_until = NULL, last_error = NULL
+                    WHERE id = ANY(%s) AND locked_by = %s AND status = 'sending'
+                """, (delivered, self.worker_id))
+
+            if rescheduled:
+                execute_values(cur, """
+                    UPDATE alert_outbox o
+                    SET status = v.status,
+                        next_attempt_at = NOW() + make_interval(secs => v.delay),
+                        last_error = v.error,
+                        updated_at = NOW(),
+                        locked_by = NULL,
+                        locked_until = NULL
+                    FROM (VALUES %s) AS v (id, status, delay, error, worker)
+                    WHERE o.id = v.id AND o.locked_by = v.worker AND o.status = 'sending'
+                """, [
+                    (row_id, status, delay, error, self.worker_id)
+                    for row_id, status, delay, error in rescheduled
+                ], template="(%s::bigint, %s, %s::float8, %s, %s)")
+
+        self.stats["delivered"] += len(delivered)
+        for _, status, _, error in rescheduled:
+            self.stats["failed" if status == "failed" else "retried"] += 1
+            if status == "failed":
+                logger.error(f"❌ Alert delivery gave up after {self.max_attempts} attempts: {error}")
+
+    def extend_lease(self, ids: List[int]) -> int:
+        """Push locked_until out by lease_seconds for rows this worker still holds; returns how many"""
+        with get_db_cursor() as cur:
+            cur.execute("""
+                UPDATE alert_outbox
+                SET locked_until = NOW() + make_interval(secs => %s)
+                WHERE id = ANY(%s) AND locked_by = %s AND status = 'sending'
+            """, (self.lease_seconds, ids, self.worker_id))
+            return cur.rowcount
+
+    def _keep_leased(self, ids: List[int], done: threading.Event):
+        """Renew the batch's lease every lease_seconds / 3 until delivery finishes"""
+        while not done.wait(self.lease_seconds / 3):
+            try:
+                held = self.extend_lease(ids)
+                if held < len(ids):
+                    logger.warning(f"⚠️ Alert outbox worker {self.worker_id} lost the lease on "
+                                   f"{len(ids) - held}/{len(ids)} rows mid-delivery")
+            except Exception as e:
+                logger.error(f"❌ Alert outbox worker {self.worker_id} could not renew its lease: {e}")
+
+    def run_once(self) -> int:
+        """Claim, deliver and record one batch. Returns the number of rows handled"""
+        rows = self.claim()
+        if rows:
+            done = threading.Event()
+            keeper = threading.Thread(
+                target=self._keep_leased, args=([row["id"] for row in rows], done),
+                name=f"{self.worker_id}-lease", daemon=True
+            )
+            keeper.start()
+            try:
+                outcomes = self.deliver(rows)
+            finally:
+                done.set()
+                keeper.join()
+            self.record(outcomes)
+        return len(rows)
+
+    def run(self, stop: threading.Event):
+        """Process batches until `stop` is set, polling every poll_interval while idle"""
+        logger.info(f"📨 Alert outbox worker {self.worker_id} started")
+        while not stop.is_set():
+            try:
+                # A full batch means more may be waiting: go again without sleeping
+                if self.run_once() >= self.batch_size:
+                    continue
+            except Exception as e:
+                logger.error(f"❌ Alert outbox worker {self.worker_id}: {e}")
+            stop.wait(self.poll_interval)
+        logger.info(f"🛑 Alert outbox worker {self.worker_id} stopped ({self.stats})")
+
+
+def outbox_status() -> Dict[str, Any]:
+    """Row counts per channel and status, and the age of the oldest due row"""
+    with get_db_cursor() as cur:
+        cur.execute("""
+            SELECT channel, status, COUNT(*) AS count
+            FROM alert_outbox
+            GROUP BY channel, status
+        """)
+        counts = {}
+        for row in cur.fetchall():
+            counts.setdefault(row["channel"], {})[row["status"]] = row["count"]
+
+        cur.execute("""
+            SELECT EXTRACT(EPOCH FROM NOW() - MIN(next_attempt_at)) AS lag
+            FROM alert_outbox
+            WHERE status = 'pending' AND next_attempt_at <= NOW()
+        """)
+        lag = cur.fetchone()["lag"]
+
+    return {"counts": counts, "oldest_due_seconds": round(float(lag), 1) if lag is not None else None}
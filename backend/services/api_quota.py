@@ -0,0 +1,235 @@
+"""
+API Quota Manager
+Cross-process token buckets for upstream weather API calls
+"""
+
+import os
+import json
+import time
+import fcntl
+import asyncio
+import tempfile
+from typing import Dict, Any, Optional, Tuple
+
+from backend.config import Config
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Call priorities (highest first)
+PRIORITY_ALERT = "alert"      # hazard predictions that may trigger alerts
+PRIORITY_INGEST = "ingest"    # data pipeline / backfills
+PRIORITY_UI = "ui"            # app refreshes
+
+# Fraction of each bucket held back from a priority.
+# UI refreshes stop early so alerts always find tokens left.
+PRIORITY_RESERVE = {
+    PRIORITY_ALERT: 0.0,
+    PRIORITY_INGEST: 0.2,
+    PRIORITY_UI: 0.4,
+}
+
+
+class QuotaExceededError(Exception):
+    """Raised when an upstream API budget is exhausted for a priority"""
+
+    def __init__(self, key: str, priority: str, retry_after: float):
+        self.key = key
+        self.priority = priority
+        self.retry_after = retry_after
+        super().__init__(f"{key} API quota exhausted for {priority} calls (retry in {retry_after:.0f}s)")
+
+
+def _take(bucket: Dict[str, Any], per_minute: float, priority: str, cost: float, now: float) -> Tuple[bool, float]:
+    """
+    Refill a bucket and try to take `cost` tokens from it (mutates bucket)
+
+    Returns:
+        (allowed, retry_after_seconds)
+    """
+    capacity = per_minute
+    rate = per_minute / 60.0
+
+    elapsed = max(0.0, now - bucket.get("updated_at", now))
+    tokens = min(capacity, bucket.get("tokens", capacity) + elapsed * rate)
+    floor = capacity * PRIORITY_RESERVE.get(priority, PRIORITY_RESERVE[PRIORITY_UI])
+
+    bucket["updated_at"] = now
+
+    if tokens - cost >= floor:
+        bucket["tokens"] = tokens - cost
+        bucket["used_total"] = bucket.get("used_total", 0) + cost
+        return True, 0.0
+
+    bucket["tokens"] = tokens
+    bucket["denied_total"] = bucket.get("denied_total", 0) + cost
+    return False, (floor + cost - tokens) / rate
+
+
+class FileQuotaBackend:
+    """Bucket state in a JSON file guarded by flock (single host, many processes)"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(tempfile.gettempdir(), "hydromet_api_quota.json")
+
+    def update(self, fn):
+        """Run fn(state) under an exclusive lock and persist the state"""
+        with open(self.path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read()
+                state = json.loads(raw) if raw else {}
+                result = fn(state)
+                f.seek(0)
+                f.truncate()
+                json.dump(state, f)
+                f.flush()
+                return result
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def take(self, key, per_minute, priority, cost):
+        now = time.time()
+        return self.update(
+            lambda state: _take(state.setdefault(key, {}), per_minute, priority, cost, now)
+        )
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return self.update(lambda state: json.loads(json.dumps(state)))
+
+
+class PostgresQuotaBackend:
+    """
+    Bucket state in Postgres rows locked with SELECT ... FOR UPDATE (many hosts)
+
+    The api_quota_buckets table comes from migration 0001
+    (python -m backend.migrations migrate).
+    """
+
+    def take(self, key, per_minute, priority, cost):
+        from backend.database import get_db_cursor
+
+        now = time.time()
+        with get_db_cursor() as cur:
+            cur.execute(
+                "INSERT INTO api_quota_buckets (key) VALUES (%s) ON CONFLICT (key) DO NOTHING",
+                (key,)
+            )
+            cur.execute("""
+                SELECT tokens, updated_at, used_total, denied_total
+                FROM api_quota_buckets
+                WHERE key = %s
+                FOR UPDATE
+            """, (key,))
+            bucket = {k: v for k, v in cur.fetchone().items() if v is not None}
+
+            result = _take(bucket, per_minute, priority, cost, now)
+
+            cur.execute("""
+                UPDATE api_quota_buckets
+                SET tokens = %s, updated_at = %s, used_total = %s, denied_total = %s
+                WHERE key = %s
+            """, (bucket["tokens"], bucket["updated_at"], bucket.get("used_total", 0),
+                  bucket.get("denied_total", 0), key))
+            return result
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        from backend.database import get_db_cursor
+
+        with get_db_cursor() as cur:
+            cur.execute("SELECT key, tokens, updated_at, used_total, denied_total FROM api_quota_buckets")
+            return {row.pop("key"): dict(row) for row in cur.fetchall()}
+
+
+class QuotaManager:
+    """Per-key token-bucket budgets shared by every process using the same backend"""
+
+    def __init__(self, backend=None, budgets: Optional[Dict[str, float]] = None, enabled: bool = True):
+        self.backend = backend or FileQuotaBackend()
+        self.budgets = budgets if budgets is not None else dict(Config.API_QUOTAS_PER_MINUTE)
+        self.enabled = enabled
+
+    def try_acquire(self, key: str, priority: str = PRIORITY_UI, cost: float = 1) -> Tuple[bool, float]:
+        """Take tokens without waiting. Returns (allowed, retry_after_seconds)"""
+        per_minute = self.budgets.get(key)
+        if not self.enabled or not per_minute:
+            return True, 0.0
+
+        try:
+            return self.backend.take(key, per_minute, priority, cost)
+        except Exception as e:
+            # Accounting must never take the API down; fail open
+            logger.error(f"❌ Quota backend error for {key}: {e}")
+            return True, 0.0
+
+    def acquire(self, key: str, priority: str = PRIORITY_UI, cost: float = 1, wait: float = 0):
+        """
+        Take tokens, waiting up to `wait` seconds for a refill
+
+        Raises:
+            QuotaExceededError: budget still exhausted after waiting
+        """
+        deadline = time.monotonic() + wait
+        while True:
+            allowed, retry_after = self.try_acquire(key, priority, cost)
+            if allowed:
+                return
+            if time.monotonic() + retry_after > deadline:
+                logger.warning(f"⚠️ {key} quota exhausted for {priority} calls")
+                raise QuotaExceededError(key, priority, retry_after)
+            time.sleep(retry_after)
+
+    async def acquire_async(self, key: str, priority: str = PRIORITY_UI, cost: float = 1, wait: float = 0):
+        """Async variant of acquire() (backend I/O runs in a worker thread)"""
+        deadline = time.monotonic() + wait
+        while True:
+            allowed, retry_after = await asyncio.to_thread(self.try_acquire, key, priority, cost)
+            if allowed:
+                return
+            if time.monotonic() + retry_after > deadline:
+                logger.warning(f"⚠️ {key} quota exhausted for {priority} calls")
+                raise QuotaExceededError(key, priority, retry_after)
+            await asyncio.sleep(retry_after)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Remaining budget per key (refilled to now)"""
+        state = self.backend.snapshot()
+        now = time.time()
+        result = {}
+
+        for key, per_minute in self.budgets.items():
+            bucket = dict(state.get(key, {}))
+            elapsed = max(0.0, now - bucket.get("updated_at", now))
+            tokens = min(per_minute, bucket.get("tokens", per_minute) + elapsed * per_minute / 60.0)
+
+            result[key] = {
+                "budget_per_minute": per_minute,
+                "remaining": round(tokens, 2),
+                "remaining_pct": round(100 * tokens / per_minute, 1) if per_minute else None,
+                "used_total": bucket.get("used_total", 0),
+                "denied_total": bucket.get("denied_total", 0),
+                "available_to": [
+                    p for p, reserve in PRIORITY_RESERVE.items()
+                    if tokens - 1 >= per_minute * reserve
+                ],
+            }
+
+        return result
+
+
+# Singleton instance
+_quota_manager = None
+
+
+def get_quota_manager() -> QuotaManager:
+    """Get or create the quota manager configured from Config"""
+    global _quota_manager
+    if _quota_manager is None:
+        backend_name = Config.API_QUOTA_BACKEND
+        if backend_name == "postgres":
+            backend = PostgresQuotaBackend()
+        else:
+            backend = FileQuotaBackend(Config.API_QUOTA_FILE)
+        _quota_manager = QuotaManager(backend=backend, enabled=backend_name != "off")
+    return _quota_manager
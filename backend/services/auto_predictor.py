@@ -6,7 +6,7 @@ Fetches hourly forecast and runs predictions automatically
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import sys
 import os
 
@@ -14,7 +14,11 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
 import requests
+from psycopg2.extras import Json
+from backend.database import get_db_cursor
 from backend.ml.predictor import WeatherPredictor
+from backend.services.api_quota import get_quota_manager, QuotaExceededError, PRIORITY_ALERT
+from backend.utils.responses import dumps
 from scripts.config import (
     OPENWEATHER_API_KEY,
     OPENWEATHER_LAT,
@@ -24,6 +28,13 @@ from scripts.config import (
 
 logger = logging.getLogger(__name__)
 
+# One row shared by all workers (migration 0005); read by the app bootstrap snapshot
+SAVE_SUMMARY_SQL = """
+    INSERT INTO prediction_summary (id, summary, updated_at)
+    VALUES (1, %s, NOW())
+    ON CONFLICT (id) DO UPDATE SET summary = EXCLUDED.summary, updated_at = EXCLUDED.updated_at
+"""
+
 
 class AutoPredictor:
     """Automatically fetch forecast and run predictions"""
@@ -35,6 +46,9 @@ class AutoPredictor:
         self.lon = OPENWEATHER_LON
         self.base_url = OPENWEATHER_BASE_URL
         
+        # Summary of the most recent cycle (also saved to prediction_summary)
+        self.last_summary = None
+        
         if not self.api_key:
             raise ValueError("❌ OPENWEATHER_API_KEY not set in .env!")
         
@@ -67,6 +81,8 @@ class AutoPredictor:
             logger.debug(f"   URL: {url}")
             logger.debug(f"   Params: lat={self.lat}, lon={self.lon}")
             
+            # Blocks up to 60s: callers run the cycle in a worker thread (asyncio.to_thread)
+            get_quota_manager().acquire("openweather", PRIORITY_ALERT, wait=60)
             response = requests.get(url, params=params, timeout=10)
             
             # Check for API errors
@@ -89,6 +105,9 @@ class AutoPredictor:
             
             return forecast_list
             
+        except QuotaExceededError as e:
+            logger.error(f"❌ {e}")
+            return []
         except requests.exceptions.Timeout:
             logger.error("❌ OpenWeather API timeout")
             return []
@@ -126,6 +145,8 @@ class AutoPredictor:
         try:
             logger.info("🌤️  Fetching 3-hour forecast from OpenWeather (free tier)...")
             
+            # Blocks up to 60s: callers run the cycle in a worker thread (asyncio.to_thread)
+            get_quota_manager().acquire("openweather", PRIORITY_ALERT, wait=60)
             response = requests.get(url, params=params, timeout=10)
             response.raise_for_status()
             
@@ -225,11 +246,11 @@ class AutoPredictor:
         
         if not forecast_list:
             logger.error("❌ No forecast data available")
-            return {
+            return self._record_summary({
                 'success': False,
                 'error': 'No forecast data',
                 'timestamp': start_time.isoformat()
-            }
+            })
         
         # Run predictions
         hazards = self.run_predictions_on_forecast(forecast_list)
@@ -264,6 +285,16 @@ class AutoPredictor:
         logger.info(f"⏱️  Cycle completed in {duration:.1f}s")
         logger.info("=" * 80)
         
+        return self._record_summary(summary)
+    
+    def _record_summary(self, summary: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep the cycle summary and save it for the other workers (a failed save only logs)"""
+        self.last_summary = summary
+        try:
+            with get_db_cursor() as cur:
+                cur.execute(SAVE_SUMMARY_SQL, (Json(summary, dumps=lambda obj: dumps(obj).decode("utf-8")),))
+        except Exception as e:
+            logger.error(f"❌ Could not save prediction summary: {e}")
         return summary
     
     async def run_continuous(self, interval_hours: int = 1):
@@ -281,7 +312,8 @@ class AutoPredictor:
         while True:
             try:
                 # Run prediction cycle
-                summary = self.run_once()
+                # Blocking I/O (quota wait, HTTP, DB): keep it off the event loop
+                summary = await asyncio.to_thread(self.run_once)
                 
                 # Wait for next cycle
                 next_run = datetime.now() + timedelta(hours=interval_hours)
@@ -312,3 +344,4 @@ def get_auto_predictor() -> AutoPredictor:
     if _auto_predictor is None:
         _auto_predictor = AutoPredictor()
     return _auto_predictor
+
@@ -0,0 +1,209 @@
+"""
+App Bootstrap Snapshot
+Everything the app loads on launch (hotlines, safety categories, tips per
+category, latest notifications, forecast summary) rendered into a single
+JSON body, held in memory and rebuilt in the background
+
+A background task polls the cache_versions counters and the auto-predictor's
+latest cycle (prediction_summary, saved by whichever worker ran it) every
+BOOTSTRAP_REFRESH_INTERVAL seconds and rebuilds the body only when one of
+them moved (or it is older than BOOTSTRAP_MAX_AGE, for writes made outside
+the API). Requests never touch the database; msgpack/CBOR bodies are
+encoded on first request per build, like the JSON one is at build time.
+"""
+
+import time
+import asyncio
+from typing import Any, Dict, Optional
+
+from fastapi.responses import Response
+
+from backend.config import Config
+from backend.async_database import get_async_cursor
+from backend.services.collection_cache import HOTLINES, NOTIFICATIONS, SAFETY_CATEGORIES, SAFETY_TIPS
+from backend.utils.http_cache import LIVE_CACHE_CONTROL, etag_matches, make_etag, not_modified
+from backend.utils.logger import get_logger
+from backend.utils.responses import MEDIA_JSON, encode
+
+logger = get_logger(__name__)
+
+SOURCE_COLLECTIONS = [HOTLINES, SAFETY_CATEGORIES, SAFETY_TIPS, NOTIFICATIONS]
+
+
+class BootstrapSnapshot:
+    """Precomputed /api/bootstrap body, rebuilt when its sources change"""
+
+    def __init__(self, refresh_interval: float, max_age: float, notification_limit: int):
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.notification_limit = notification_limit
+        self._content = None
+        # media type -> (body, ETag) for the current build
+        self._bodies: Dict[str, tuple] = {}
+        self._sources = None
+        self._built_at = None
+        self._build_lock = asyncio.Lock()
+        self._task = None
+        self._stats = {"builds": 0, "build_errors": 0, "last_build_ms": 0.0}
+
+    async def _current_sources(self):
+        """Version counters plus the latest prediction cycle, in a comparable form"""
+        async with get_async_cursor() as cur:
+            await cur.execute(
+                "SELECT name, version FROM cache_versions WHERE name = ANY(%s)",
+                (SOURCE_COLLECTIONS,)
+            )
+            versions = {row["name"]: row["version"] for row in await cur.fetchall()}
+
+            await cur.execute("SELECT updated_at FROM prediction_summary WHERE id = 1")
+            summary = await cur.fetchone()
+
+        return (
+            tuple(versions.get(name, 0) for name in SOURCE_COLLECTIONS),
+            summary["updated_at"] if summary else None,
+        )
+
+    async def _build(self) -> Dict[str, Any]:
+        async with get_async_cursor() as cur:
+            await cur.execute("""
+                SELECT id, service_name, phone_number, category, icon_color,
+                       icon_type, is_active, priority, created_at, updated_at
+                FROM emergency_hotlines
+                WHERE is_active = true
+                ORDER BY priority ASC, service_name ASC, id ASC
+            """)
+            hotlines = await cur.fetchall()
+
+            await cur.execute("""
+                SELECT category_id, name, description, order_num, icon,
+                       gradient_colors, created_at, updated_at, is_active
+                FROM safety_categories
+                WHERE is_active = true
+                ORDER BY order_num ASC, name ASC
+            """)
+            categories = await cur.fetchall()
+
+            await cur.execute("""
+                SELECT tip_id, category_id, title, content, order_num,
+                       icon, created_at, updated_at, is_active
+                FROM safety_tips
+                WHERE is_active = true
+                ORDER BY category_id ASC, order_num ASC, title ASC
+            """)
+            tips = {category["category_id"]: [] for category in categories}
+            for row in await cur.fetchall():
+                if row["category_id"] in tips:
+                    tips[row["category_id"]].append(row)
+
+            await cur.execute("""
+                SELECT id, title, message, type, sent_to, status, date_time
+                FROM notifications
+                ORDER BY date_time DESC, id DESC
+                LIMIT %s
+            """, (self.notification_limit,))
+            notifications = await cur.fetchall()
+
+            await cur.execute("SELECT summary FROM prediction_summary WHERE id = 1")
+            summary = await cur.fetchone()
+
+        return {
+            "success": True,
+            "hotlines": hotlines,
+            "safety_categories": categories,
+            "safety_tips": tips,
+            "notifications": notifications,
+            "forecast": summary["summary"] if summary else None,
+        }
+
+    async def refresh(self, force: bool = False) -> bool:
+        """Rebuild if a source changed, the snapshot is too old, or `force`. Returns True if rebuilt"""
+        async with self._build_lock:
+            # Read the sources before the data: a write landing in between
+            # just triggers one more rebuild on the next poll
+            sources = await self._current_sources()
+            expired = self._built_at is None or time.monotonic() - self._built_at >= self.max_age
+            if not force and not expired and sources == self._sources:
+                return False
+
+            started = time.perf_counter()
+            content = await self._build()
+            body = encode(content, MEDIA_JSON)
+            # Same content (e.g. a max-age rebuild) keeps the same ETag, so clients still get 304s
+            self._content = content
+            self._bodies = {MEDIA_JSON: (body, make_etag(body))}
+            self._sources = sources
+            self._built_at = time.monotonic()
+            self._stats["builds"] += 1
+            self._stats["last_build_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            return True
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats["build_errors"] += 1
+                logger.error(f"❌ Bootstrap snapshot refresh failed: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self):
+        """Start the background refresh task (call from the app startup event)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _encoded(self, media_type: str) -> tuple:
+        """(body, ETag) of the current build in a negotiated media type"""
+        bodies = self._bodies
+        if media_type not in bodies:
+            body = encode(self._content, media_type)
+            bodies[media_type] = (body, make_etag(body))
+        return bodies[media_type]
+
+    async def response(self, if_none_match: Optional[str] = None, media_type: str = MEDIA_JSON) -> Response:
+        """The snapshot as a response (built inline only before the first background build)"""
+        if self._content is None:
+            await self.refresh()
+
+        body, etag = self._encoded(media_type)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, LIVE_CACHE_CONTROL)
+        return Response(
+            content=body,
+            media_type=media_type,
+            headers={"ETag": etag, "Cache-Control": LIVE_CACHE_CONTROL, "Vary": "Accept"},
+        )
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "built": self._content is not None,
+            "age_seconds": round(time.monotonic() - self._built_at, 1) if self._built_at else None,
+            "size_bytes": len(self._bodies[MEDIA_JSON][0]) if MEDIA_JSON in self._bodies else 0,
+            **self._stats,
+        }
+
+
+# Singleton instance
+_bootstrap_snapshot: Optional[BootstrapSnapshot] = None
+
+
+def get_bootstrap_snapshot() -> BootstrapSnapshot:
+    """Get or create the process-wide bootstrap snapshot"""
+    global _bootstrap_snapshot
+    if _bootstrap_snapshot is None:
+        _bootstrap_snapshot = BootstrapSnapshot(
+            refresh_interval=Config.BOOTSTRAP_REFRESH_INTERVAL,
+            max_age=Config.BOOTSTRAP_MAX_AGE,
+            notification_limit=Config.BOOTSTRAP_NOTIFICATIONS,
+        )
+    return _bootstrap_snapshot
@@ -0,0 +1,230 @@
+"""
+Collection Cache
+Per-process read-through cache for the reference collections every app
+launch reads (emergency hotlines, safety categories, safety tips)
+
+Entries are rendered JSON bodies keyed by collection and filter. Each
+collection has a version counter in the cache_versions table, bumped in
+the same transaction as any write to it; a worker re-reads the counters at
+most every CACHE_VERSION_CHECK_INTERVAL seconds, so a write made through
+another worker is picked up within that interval and a write made through
+this one immediately.
+"""
+
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from fastapi.responses import Response
+
+from backend.config import Config
+from backend.async_database import get_async_cursor
+from backend.utils.http_cache import REFERENCE_CACHE_CONTROL, etag_matches, not_modified, set_validators
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Collection names (rows in cache_versions)
+HOTLINES = "emergency_hotlines"
+SAFETY_CATEGORIES = "safety_categories"
+SAFETY_TIPS = "safety_tips"
+# Not cached here; versioned so the bootstrap snapshot sees new alerts
+NOTIFICATIONS = "notifications"
+
+BUMP_VERSIONS_SQL = """
+    INSERT INTO cache_versions (name, version, updated_at)
+    SELECT unnest(%s::text[]), 1, NOW()
+    ON CONFLICT (name) DO UPDATE
+        SET version = cache_versions.version + 1, updated_at = NOW()
+    RETURNING name, version
+"""
+
+# Headers recomputed when a cached body is served
+_RENDERED_HEADERS = ("content-length", "content-type")
+
+
+class CollectionCache:
+    """Rendered list responses per (collection, filter), valid while the collection version is unchanged"""
+
+    def __init__(self, check_interval: float, ttl: float, max_entries: int):
+        self.check_interval = check_interval
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._versions = {}
+        self._available = False
+        self._checked_at = None
+        self._check_lock = asyncio.Lock()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "version_checks": 0}
+
+    async def _refresh_versions(self):
+        """Re-read the version counters if the last check is older than check_interval"""
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return
+
+        async with self._check_lock:
+            if self._checked_at is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return
+            try:
+                async with get_async_cursor() as cur:
+                    await cur.execute("SELECT name, version FROM cache_versions")
+                    rows = await cur.fetchall()
+                for row in rows:
+                    # Never move backwards past a bump this worker already applied
+                    self._versions[row["name"]] = max(row["version"], self._versions.get(row["name"], 0))
+                self._available = True
+            except Exception as e:
+                # No counters (migration not applied, primary down): serve uncached
+                if self._available or self._checked_at is None:
+                    logger.warning(f"⚠️ Collection cache disabled, cannot read cache_versions: {e}")
+                self._available = False
+            self._checked_at = time.monotonic()
+            self._stats["version_checks"] += 1
+
+    async def get_or_load(
+        self,
+        collection: str,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Response]],
+    ) -> Response:
+        """
+        Serve a cached response, or build it with `loader` and cache it
+
+        Exceptions from the loader propagate and nothing is cached.
+        """
+        await self._refresh_versions()
+        if not self._available:
+            return await loader()
+
+        version = self._versions.get(collection, 0)
+        entry = self._entries.get((collection, key))
+        if entry and entry["version"] == version and entry["expires_at"] > time.monotonic():
+            self._stats["hits"] += 1
+            return Response(content=entry["body"], media_type=entry["media_type"], headers=entry["headers"])
+
+        self._stats["misses"] += 1
+        response = await loader()
+
+        # A write committed while loading: the rows may predate it, don't keep them
+        if self._versions.get(collection, 0) != version:
+            return response
+
+        if len(self._entries) >= self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[(collection, key)] = {
+            "version": version,
+            "expires_at": time.monotonic() + self.ttl,
+            "body": response.body,
+            "media_type": response.media_type,
+            "headers": {k: v for k, v in response.headers.items() if k not in _RENDERED_HEADERS},
+        }
+        return response
+
+    def invalidate(self, versions: Dict[str, int]):
+        """Drop entries of written collections and adopt their new versions"""
+        for collection, version in versions.items():
+            self._versions[collection] = max(version, self._versions.get(collection, 0))
+            for entry_key in [k for k in self._entries if k[0] == collection]:
+                del self._entries[entry_key]
+            self._stats["invalidations"] += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._checked_at = None
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "enabled": True,
+            "available": self._available,
+            "entries": len(self._entries),
+            "versions": dict(self._versions),
+            **self._stats,
+        }
+
+
+# Singleton instance
+_collection_cache: Optional[CollectionCache] = None
+
+
+def get_collection_cache() -> CollectionCache:
+    """Get or create the process-wide collection cache"""
+    global _collection_cache
+    if _collection_cache is None:
+        _collection_cache = CollectionCache(
+            check_interval=Config.CACHE_VERSION_CHECK_INTERVAL,
+            ttl=Config.CACHE_TTL,
+            max_entries=Config.CACHE_MAX_ENTRIES,
+        )
+    return _collection_cache
+
+
+async def cached_response(
+    collection: str,
+    key: Hashable,
+    loader: Callable[[], Awaitable[Response]],
+    if_none_match: Optional[str] = None,
+) -> Response:
+    """
+    Read-through lookup for a list endpoint, with conditional GET
+
+    Responses get a strong ETag (hash of the body, computed once per cache
+    entry); a matching If-None-Match is answered with an empty 304.
+
+    Loaders should query the primary (get_async_cursor): a lagging replica
+    would otherwise pin pre-write rows in the cache under the new version.
+
+    Usage:
+        return await cached_response(HOTLINES, ("category", category), load, if_none_match)
+    """
+    async def load():
+        response = await loader()
+        set_validators(response, REFERENCE_CACHE_CONTROL)
+        return response
+
+    if Config.CACHE_ENABLED:
+        response = await get_collection_cache().get_or_load(collection, key, load)
+    else:
+        response = await load()
+
+    etag = response.headers["ETag"]
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, REFERENCE_CACHE_CONTROL)
+    return response
+
+
+async def collection_version(cur, collection: str) -> Optional[int]:
+    """Current version of a collection on `cur`'s connection (None before its first write)"""
+    await cur.execute("SELECT version FROM cache_versions WHERE name = %s", (collection,))
+    row = await cur.fetchone()
+    return row["version"] if row else None
+
+
+@asynccontextmanager
+async def collection_write_cursor(*collections: str):
+    """
+    get_async_cursor() for writes to cached collections
+
+    Bumps the collections' versions inside the write transaction, then
+    invalidates this worker's entries once it has committed. Nothing is
+    bumped if the block raises (e.g. a 404), since the write rolls back.
+
+    Usage:
+        async with collection_write_cursor(HOTLINES) as cur:
+            await cur.execute("UPDATE emergency_hotlines SET ...")
+    """
+    async with get_async_cursor() as cur:
+        yield cur
+        await cur.execute(BUMP_VERSIONS_SQL, (list(collections),))
+        versions = {row["name"]: row["version"] for row in await cur.fetchall()}
+
+    if Config.CACHE_ENABLED:
+        get_collection_cache().invalidate(versions)
+
+
+def get_collection_cache_metrics() -> Dict[str, Any]:
+    """Hit/miss counters and current versions ({"enabled": False} when CACHE_ENABLED is off)"""
+    if not Config.CACHE_ENABLED:
+        return {"enabled": False}
+    return get_collection_cache().metrics()
@@ -11,7 +11,7 @@ from datetime import datetime, timedelta
 from typing import Optional, Tuple
 import bcrypt
 
-from backend.database import get_db_cursor
+from backend.database import get_db_cursor, PoolSaturatedError
 from backend.config import Config
 from backend.utils.validators import format_phone_for_sms
 
@@ -27,7 +27,7 @@ class OTPManager:
         self.max_attempts = Config.OTP_MAX_ATTEMPTS
         self.rate_limit_hours = Config.OTP_RATE_LIMIT_HOURS
         self.max_requests_per_period = Config.OTP_MAX_REQUESTS_PER_PERIOD
-        self.sms_endpoint = "https://sms.iprogtech.com/api/v1/sms_messages"
+        self.sms_endpoint = f"{Config.IPROG_BASE_URL.rstrip('/')}/sms_messages"
     
     def _generate_otp(self, length: int = 6) -> str:
         """Generate a random numeric OTP"""
@@ -136,6 +136,8 @@ class OTPManager:
                     "validity_minutes": self.otp_validity_minutes
                 }
                 
+        except PoolSaturatedError:
+            raise
         except Exception as e:
             return False, f"Error sending OTP: {str(e)}", None
     
@@ -216,6 +218,8 @@ class OTPManager:
                         """, (otp_record['id'],))
                         return False, "Invalid OTP. Maximum attempts exceeded. Please request a new OTP", None
                 
+        except PoolSaturatedError:
+            raise
         except Exception as e:
             return False, f"Error verifying OTP: {str(e)}", None
     
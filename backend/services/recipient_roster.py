@@ -0,0 +1,228 @@
+"""
+Recipient Roster
+In-memory list of SMS alert recipients (verified users with a phone number)
+
+Loaded from the users table once per process, then kept current
+incrementally in every process that reads it:
+
+- the user endpoints (create, verify, update, delete) send
+  NOTIFY recipient_roster with the user id inside their write transaction
+  (NOTIFY_SQL), so it is delivered when the write commits
+- each roster LISTENs on a dedicated connection and re-reads just the
+  notified users by primary key
+- the process that made the write also applies it directly (upsert/remove)
+
+A full resync every ROSTER_RESYNC_INTERVAL seconds, and after the listen
+connection reconnects, covers notifications that were missed and writes
+made outside the API. It runs in a background thread, so only the very
+first lookup waits on the database.
+
+Phone numbers and names are never logged, only counts.
+"""
+
+import time
+import select
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import psycopg2
+
+from backend.config import Config
+from backend.database import get_connection_pool, get_db_cursor
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+LOAD_SQL = """
+    SELECT id, phone_number
+    FROM users
+    WHERE phone_number IS NOT NULL
+    AND phone_number != ''
+    AND is_verified = true
+"""
+
+ROSTER_CHANNEL = "recipient_roster"
+
+# Run in the users write transaction with the user id (delivered on commit; no PII in the payload)
+NOTIFY_SQL = f"SELECT pg_notify('{ROSTER_CHANNEL}', %s)"
+
+USERS_BY_ID_SQL = """
+    SELECT id, phone_number, is_verified
+    FROM users
+    WHERE id = ANY(%s)
+"""
+
+# Seconds between reconnect attempts of the listen connection
+LISTEN_RETRY_SECONDS = 5
+
+
+class RecipientRoster:
+    """user id -> phone number for every verified user"""
+
+    def __init__(self, resync_interval: float):
+        self.resync_interval = resync_interval
+        self._phones: Optional[Dict[str, str]] = None
+        self._loaded_at = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.RLock()
+        # Changes applied while a resync is reading the table, replayed on top of its result
+        self._pending: Optional[List[tuple]] = None
+        self._resyncing = False
+        self._listener = None
+        self._listening = threading.Event()
+        self._stats = {"loads": 0, "load_errors": 0, "updates": 0, "notifications": 0}
+
+    def _load(self):
+        """Full read of the users table, swapped in atomically"""
+        with self._load_lock:
+            with self._lock:
+                self._pending = []
+            try:
+                started = time.perf_counter()
+                with get_db_cursor() as cur:
+                    cur.execute(LOAD_SQL)
+                    phones = {row["id"]: row["phone_number"] for row in cur.fetchall()}
+            except Exception:
+                with self._lock:
+                    self._pending = None
+                    self._stats["load_errors"] += 1
+                raise
+
+            with self._lock:
+                for user_id, phone in self._pending:
+                    self._apply(phones, user_id, phone)
+                self._pending = None
+                self._phones = phones
+                self._loaded_at = time.monotonic()
+                self._stats["loads"] += 1
+            logger.info(f"📱 Recipient roster loaded: {len(phones)} verified users "
+                        f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    def _resync(self):
+        try:
+            self._load()
+        except Exception as e:
+            logger.error(f"❌ Recipient roster resync failed: {e}")
+        finally:
+            self._resyncing = False
+
+    @staticmethod
+    def _apply(phones: Dict[str, str], user_id: str, phone: Optional[str]):
+        if phone:
+            phones[user_id] = phone
+        else:
+            phones.pop(user_id, None)
+
+    def _update(self, user_id: str, phone: Optional[str]):
+        with self._lock:
+            if self._phones is not None:
+                self._apply(self._phones, user_id, phone)
+            if self._pending is not None:
+                self._pending.append((user_id, phone))
+            self._stats["updates"] += 1
+
+    def upsert(self, user: Dict[str, Any]):
+        """Apply a created/updated user row (dropped from the roster unless verified with a phone)"""
+        phone = user.get("phone_number") if user.get("is_verified") else None
+        self._update(user["id"], phone or None)
+
+    def remove(self, user_id: str):
+        """Apply a deleted user"""
+        self._update(user_id, None)
+
+    def refresh_users(self, user_ids: Iterable[str]):
+        """Re-read notified users by id (missing ones were deleted)"""
+        user_ids = list(user_ids)
+        with get_db_cursor() as cur:
+            cur.execute(USERS_BY_ID_SQL, (user_ids,))
+            rows = {row["id"]: row for row in cur.fetchall()}
+        for user_id in user_ids:
+            if user_id in rows:
+                self.upsert(rows[user_id])
+            else:
+                self.remove(user_id)
+
+    def _listen(self):
+        """LISTEN for user changes on a dedicated connection, reconnecting (and resyncing) if it drops"""
+        connected_before = False
+        while True:
+            conn = None
+            try:
+                conn = psycopg2.connect(**get_connection_pool().conn_kwargs)
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {ROSTER_CHANNEL}")
+                if connected_before:
+                    # Notifications sent while disconnected are lost
+                    self._load()
+                connected_before = True
+                self._listening.set()
+
+                while True:
+                    if select.select([conn], [], [], 60) == ([], [], []):
+                        continue
+                    conn.poll()
+                    user_ids = set()
+                    while conn.notifies:
+                        user_ids.add(conn.notifies.pop(0).payload)
+                    if user_ids:
+                        self._stats["notifications"] += len(user_ids)
+                        self.refresh_users(user_ids)
+            except Exception as e:
+                logger.error(f"❌ Recipient roster listener: {e}")
+            finally:
+                self._listening.clear()
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+            time.sleep(LISTEN_RETRY_SECONDS)
+
+    def _start_listener(self):
+        if self._listener is None:
+            self._listener = threading.Thread(target=self._listen, name="recipient-roster-listen", daemon=True)
+            self._listener.start()
+            # LISTEN before the first load, so no commit falls between the two
+            self._listening.wait(timeout=5)
+
+    def phones(self) -> List[str]:
+        """
+        Phone numbers to alert (deduplicated)
+
+        Loads the roster on first use (raising if the database can't be
+        read); afterwards a due resync runs in the background and the
+        current roster is returned immediately.
+        """
+        if self._phones is None:
+            with self._load_lock:
+                if self._phones is None:
+                    self._start_listener()
+                    self._load()
+        elif time.monotonic() - self._loaded_at >= self.resync_interval and not self._resyncing:
+            self._resyncing = True
+            threading.Thread(target=self._resync, name="recipient-roster-resync", daemon=True).start()
+
+        with self._lock:
+            return list(dict.fromkeys(self._phones.values()))
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "loaded": self._phones is not None,
+            "recipients": len(self._phones) if self._phones is not None else 0,
+            "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+            "listening": self._listening.is_set(),
+            **self._stats,
+        }
+
+
+# Singleton instance
+_recipient_roster: Optional[RecipientRoster] = None
+
+
+def get_recipient_roster() -> RecipientRoster:
+    """Get or create the process-wide recipient roster"""
+    global _recipient_roster
+    if _recipient_roster is None:
+        _recipient_roster = RecipientRoster(resync_interval=Config.ROSTER_RESYNC_INTERVAL)
+    return _recipient_roster
@@ -0,0 +1,86 @@
+"""
+Named SQL statements for the login / OTP hot path
+Executed as server-side prepared statements so Postgres parses and plans
+them once per pooled connection instead of on every request
+"""
+
+from backend.config import Config
+
+USER_COLUMNS = """
+    id, first_name, middle_name, last_name, suffix,
+    house_address, barangay, phone_number, role,
+    is_verified, created_at, updated_at
+"""
+
+STATEMENTS = {
+    # Users
+    "user_by_phone": f"""
+        SELECT {USER_COLUMNS}
+        FROM users
+        WHERE phone_number = %s
+        LIMIT 1
+    """,
+    # Matches 09XXXXXXXXX, 9XXXXXXXXX and legacy stored formats
+    "user_by_phone_variants": f"""
+        SELECT {USER_COLUMNS}
+        FROM users
+        WHERE phone_number IN (%s, %s, %s)
+        LIMIT 1
+    """,
+
+    # OTP
+    "otp_insert": """
+        INSERT INTO otp_requests (
+            phone_number,
+            otp_hash,
+            expires_at,
+            attempts_left,
+            is_verified,
+            is_invalidated
+        )
+        VALUES (%s, %s, %s, %s, %s, %s)
+        RETURNING id
+    """,
+    "otp_latest": """
+        SELECT id, otp_hash, expires_at, is_verified, is_invalidated, attempts_left
+        FROM otp_requests
+        WHERE phone_number = %s AND is_invalidated = FALSE
+        ORDER BY created_at DESC
+        LIMIT 1
+    """,
+    "otp_update_attempts": """
+        UPDATE otp_requests
+        SET attempts_left = %s
+        WHERE id = %s
+    """,
+    "otp_mark_verified": """
+        UPDATE otp_requests
+        SET is_verified = TRUE, verified_at = %s
+        WHERE id = %s
+    """,
+}
+
+
+def phone_variants(phone_number: str):
+    """Parameters for the user_by_phone_variants statement"""
+    return (
+        phone_number,
+        phone_number.lstrip('63'),
+        '0' + phone_number.lstrip('63')
+    )
+
+
+async def execute_statement(cur, name: str, params=None):
+    """
+    Execute a registered statement by name
+
+    psycopg keeps a per-connection cache of prepared statements keyed by the
+    SQL text: the first execution on a connection prepares it, later ones
+    just bind parameters and run the stored plan.
+
+    Usage:
+        async with get_async_cursor() as cur:
+            await execute_statement(cur, "otp_latest", (phone_number,))
+            otp_record = await cur.fetchone()
+    """
+    return await cur.execute(STATEMENTS[name], params, prepare=Config.DB_PREPARE_STATEMENTS)
@@ -0,0 +1,67 @@
+"""
+Conditional GET helpers for list endpoints
+
+Responses carry a strong ETag (a hash of the body, or of the collection's
+cache_versions counter when the body hasn't been built yet) and a Cache-Control hint. A request
+whose If-None-Match matches gets an empty 304 instead of the list.
+"""
+
+import hashlib
+from typing import Any, Optional
+
+from fastapi.responses import Response
+
+from backend.config import Config
+
+# Hotlines, safety categories and tips: clients may reuse a copy for a while
+REFERENCE_CACHE_CONTROL = f"public, max-age={Config.HTTP_CACHE_MAX_AGE}"
+
+# Notifications: always revalidate (a 304 is still cheap)
+LIVE_CACHE_CONTROL = "no-cache"
+
+
+def make_etag(data: bytes) -> str:
+    """Strong ETag for a byte string"""
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+
+def version_etag(version: Optional[int], *parts: Any) -> str:
+    """
+    ETag for a list from its collection version alone, before any rows are read
+
+    `parts` should hold everything else that shapes the body for the same
+    version (filter, page size and cursor, field projection, media type).
+    """
+    return make_etag(repr((version, parts)).encode("utf-8"))
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison (weak, as RFC 9110 specifies for this header)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def set_validators(response: Response, cache_control: str, etag: Optional[str] = None) -> str:
+    """Add ETag (hash of the body unless given) and Cache-Control to a response"""
+    etag = etag or make_etag(response.body)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return etag
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """
+    Empty 304 carrying the validators the client should keep
+
+    Vary: Accept is repeated from the 200 (every cached body is content
+    negotiated), as RFC 9110 requires, so caches keep variants apart.
+    """
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept"},
+    )
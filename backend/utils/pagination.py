@@ -0,0 +1,127 @@
+"""
+Keyset pagination and field projection helpers for list endpoints
+
+Pages are addressed by an opaque cursor holding the sort key of the last
+row returned, so each page is an index range scan of `limit` rows no matter
+how deep the client has scrolled. Paging is opt-in: a request with neither
+`limit` nor `after` gets the whole list, as the Flutter app expects.
+"""
+
+import json
+import base64
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+
+from backend.utils.responses import MEDIA_JSON, rows_response
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+# Response header carrying the cursor for the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque URL-safe cursor for a sort key"""
+    payload = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], types: Sequence[type]) -> Optional[List[Any]]:
+    """
+    Decode a cursor back into typed sort-key values
+
+    Raises:
+        HTTPException 400: cursor is malformed or for a different endpoint
+    """
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("wrong cursor length")
+        return [
+            datetime.fromisoformat(v) if t is datetime else t(v)
+            for v, t in zip(values, types)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def page_limit(limit: Optional[int], after: Optional[str]) -> Optional[int]:
+    """Page size for a request: None (whole list) unless `limit` or `after` was passed"""
+    if limit is None and not after:
+        return None
+    return limit or DEFAULT_LIMIT
+
+
+def fetch_limit(limit: Optional[int]) -> Optional[int]:
+    """SQL LIMIT for a page: one extra row to detect the next page (NULL = no limit)"""
+    return None if limit is None else limit + 1
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[List[str]]:
+    """
+    Parse a `fields=a,b,c` projection
+
+    Returns:
+        Requested columns in `allowed` order, or None for all fields
+
+    Raises:
+        HTTPException 400: unknown field names
+    """
+    if not fields:
+        return None
+
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return [f for f in allowed if f in requested]
+
+
+def select_list(fields: Optional[List[str]], allowed: Sequence[str], key_columns: Sequence[str]) -> str:
+    """SQL column list for a projection, always including the sort-key columns"""
+    columns = list(fields or allowed)
+    columns += [c for c in key_columns if c not in columns]
+    return ", ".join(columns)
+
+
+def paginate(
+    rows: List[Dict[str, Any]],
+    limit: Optional[int],
+    sort_key: Callable[[Dict[str, Any]], Sequence[Any]],
+    model,
+    fields: Optional[List[str]] = None,
+    media_type: str = MEDIA_JSON,
+):
+    """
+    Build a list response from `limit + 1` fetched rows (all rows if limit is None)
+
+    The extra row only signals that another page exists; the cursor is
+    taken from the last row actually returned. Without a projection rows
+    are rendered as fetched (through `model` only with VALIDATE_DB_ROWS);
+    with one, just the selected keys are returned. `media_type` comes
+    from responses.negotiate().
+    """
+    page = rows if limit is None else rows[:limit]
+    headers = {}
+    if limit is not None and len(rows) > limit and page:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(sort_key(page[-1]))
+
+    if fields:
+        return rows_response([{f: row[f] for f in fields} for row in page], headers=headers, media_type=media_type)
+    return rows_response(page, model, headers=headers, media_type=media_type)
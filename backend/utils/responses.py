@@ -0,0 +1,188 @@
+"""
+Fast, content-negotiated responses
+
+Rows from the database and prediction payloads are rendered straight to
+bytes with orjson (datetimes, numpy scalars and pandas Timestamps
+included) instead of going through a Pydantic model per row, FastAPI's
+response_model validation, jsonable_encoder and the stdlib encoder.
+
+Clients sending `Accept: application/msgpack` or `application/cbor` get
+the same content in that binary encoding.
+"""
+
+import json
+from datetime import timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+from backend.config import Config
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional: application/msgpack not offered
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # optional: application/cbor not offered
+    cbor2 = None
+
+MEDIA_JSON = "application/json"
+MEDIA_MSGPACK = "application/msgpack"
+MEDIA_CBOR = "application/cbor"
+
+# Accept values -> media type served (x-msgpack is what older clients send)
+_ACCEPTED = {
+    MEDIA_JSON: MEDIA_JSON,
+    MEDIA_MSGPACK: MEDIA_MSGPACK,
+    "application/x-msgpack": MEDIA_MSGPACK,
+    MEDIA_CBOR: MEDIA_CBOR,
+}
+
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
+
+def _default(obj):
+    """Types orjson doesn't handle natively (checked by duck type so pandas/numpy aren't imported here)"""
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    if hasattr(obj, "item"):
+        return obj.item()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Render JSON bytes (orjson when installed; NaN becomes null)"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _binary_available(media_type: str) -> bool:
+    return (media_type == MEDIA_MSGPACK and msgpack is not None) or (media_type == MEDIA_CBOR and cbor2 is not None)
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Media type to respond with for an Accept header
+
+    Highest-q supported type wins (ties go to the order listed); JSON when
+    nothing supported is asked for.
+    """
+    if not accept:
+        return MEDIA_JSON
+
+    best, best_q = MEDIA_JSON, 0.0
+    for item in accept.split(","):
+        media, _, params = item.strip().partition(";")
+        media_type = _ACCEPTED.get(media.strip().lower())
+        if media_type is None or (media_type != MEDIA_JSON and not _binary_available(media_type)):
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > best_q:
+            best, best_q = media_type, q
+    return best
+
+
+def _cbor_default(encoder, obj):
+    encoder.encode(_default(obj))
+
+
+def encode(content: Any, media_type: str = MEDIA_JSON) -> bytes:
+    """Render content in a negotiated media type"""
+    if media_type == MEDIA_MSGPACK:
+        # Datetimes go through _default, as ISO strings like the JSON body
+        return msgpack.packb(content, default=_default, datetime=False)
+    if media_type == MEDIA_CBOR:
+        # Naive datetimes are stored as UTC (datetime.utcnow() / NOW() on a UTC server)
+        return cbor2.dumps(content, default=_cbor_default, timezone=timezone.utc)
+    return dumps(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with dumps()
+
+    Returning it from a route also skips response_model validation; keep
+    response_model on the route for the OpenAPI schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def negotiated_response(
+    content: Any,
+    media_type: str = MEDIA_JSON,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Response in the media type picked by negotiate(), marked Vary: Accept"""
+    headers = {**(headers or {}), "Vary": "Accept"}
+    if media_type == MEDIA_JSON:
+        return FastJSONResponse(content=content, headers=headers)
+    return Response(content=encode(content, media_type), media_type=media_type, headers=headers)
+
+
+def rows_response(
+    rows: List[Dict[str, Any]],
+    model=None,
+    headers: Optional[Dict[str, str]] = None,
+    media_type: str = MEDIA_JSON,
+) -> Response:
+    """
+    List response straight from database rows
+
+    Rows selected with the model's columns are trusted as-is; `model` is
+    only applied when VALIDATE_DB_ROWS is on (e.g. while changing a schema).
+    """
+    if model is not None and Config.VALIDATE_DB_ROWS:
+        rows = [model(**row).model_dump(mode="json") for row in rows]
+    return negotiated_response(rows, media_type, headers)
+
+
+def columnar(records: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """
+    One array per field instead of an array of objects
+
+    Nested dicts are flattened with dotted names ("prediction.probability",
+    "features.temperature"); lists stay values. Fields missing from a
+    record are None, so every array has len(records) entries.
+    """
+    def flatten(record, prefix, out):
+        for key, value in record.items():
+            name = f"{prefix}{key}"
+            if isinstance(value, dict):
+                flatten(value, f"{name}.", out)
+            else:
+                out[name] = value
+        return out
+
+    flat = [flatten(record, "", {}) for record in records]
+    names = list(dict.fromkeys(name for record in flat for name in record))
+    return {name: [record.get(name) for record in flat] for name in names}
@@ -7,8 +7,9 @@ Date: 2025-11-01
 Version: 2.0.0
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import sys
 import os
 from datetime import datetime
@@ -17,7 +18,8 @@ from datetime import datetime
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from backend.config import Config
-from backend.database import init_connection_pool, close_connection_pool, test_connection
+from backend.database import init_connection_pool, close_connection_pool, test_connection, PoolSaturatedError
+from backend.async_database import init_async_pool, close_async_pool
 from backend.api import (
     users_router,
     admin_router,
@@ -29,7 +31,12 @@ from backend.api import (
     predictions_router,
     weather_router,
     auto_predictor_router,
+    metrics_router,
+    observations_router,
+    bootstrap_router,
 )
+from backend.services.api_quota import QuotaExceededError
+from backend.services.bootstrap import get_bootstrap_snapshot
 
 # Validate configuration
 Config.validate()
@@ -61,6 +68,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Include all routers
@@ -74,6 +82,30 @@ app.include_router(hotlines_router)           # /api/hotlines/*
 app.include_router(safety_categories_router)  # /api/safety/categories/*
 app.include_router(safety_tips_router)        # /api/safety/tips/*
 app.include_router(auto_predictor_router)
+app.include_router(metrics_router)            # /api/metrics/*
+app.include_router(observations_router)       # /api/observations/*
+app.include_router(bootstrap_router)          # /api/bootstrap
+
+
+@app.exception_handler(QuotaExceededError)
+async def quota_exceeded_handler(request: Request, exc: QuotaExceededError):
+    """Upstream API budget exhausted - ask the client to back off"""
+    retry_after = max(1, int(exc.retry_after + 0.999))
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(retry_after)}
+    )
+
+
+@app.exception_handler(PoolSaturatedError)
+async def pool_saturated_handler(request: Request, exc: PoolSaturatedError):
+    """Every database connection busy past the wait timeout - shed load"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, please retry shortly"},
+        headers={"Retry-After": str(int(exc.retry_after + 0.999))}
+    )
 
 
 @app.get("/")
@@ -143,6 +175,10 @@ async def root():
                 "categories": "GET /api/safety/categories",
                 "tips": "GET /api/safety/tips",
                 "tips_by_category": "GET /api/safety/tips/category/{category_id}"
+            },
+            "metrics": {
+                "quota": "GET /api/metrics/quota",
+                "pool": "GET /api/metrics/pool"
             }
         },
         "features": [
@@ -183,6 +219,9 @@ async def health():
 @app.on_event("startup")
 async def startup_event():
     """Run on application startup"""
+    await init_async_pool()
+    get_bootstrap_snapshot().start()
+    
     print("\n" + "="*80)
     print("🌊 HYDROMET WEATHER & ALERT SYSTEM API")
     print("="*80)
@@ -203,7 +242,12 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Close database connections on shutdown"""
+    """Close database connections and HTTP clients on shutdown"""
+    from backend.ml.weather_client import close_http_clients
+    
+    await close_http_clients()
+    await get_bootstrap_snapshot().stop()
+    await close_async_pool()
     close_connection_pool()
     print("\n✅ Application shutdown complete")
     print("="*80)
@@ -238,7 +282,7 @@ if __name__ == "__main__":
     print(f"   • OTP Hashing: bcrypt")
     print(f"   • Rate Limiting: 3 requests/hour")
     print(f"   • Attempt Limiting: 3 attempts/OTP")
-    print(f"   • Connection Pooling: 1-20 connections")
+    print(f"   • Connection Pooling: {Config.DB_POOL_MIN}-{Config.DB_POOL_MAX} connections")
     
     print("\n🤖 ML Prediction Features:")
     print(f"   • Hazard Types: 7 (Cyclone, Storm, Flood, etc.)")
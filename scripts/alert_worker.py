@@ -0,0 +1,89 @@
+"""
+Alert outbox worker.
+Delivers alerts queued by NotificationService (in-app via Firestore, SMS via
+iProg), retrying failures with backoff. Run as many copies as needed, on one
+host or several: rows are claimed with FOR UPDATE SKIP LOCKED.
+
+Usage:
+    python alert_worker.py                   # one worker thread
+    python alert_worker.py --threads 4       # four claim loops in this process
+    python alert_worker.py --once            # drain due rows once and exit
+    python alert_worker.py --status          # queue counts per channel/status
+"""
+import os
+import sys
+import signal
+import argparse
+import threading
+
+from logger_util import get_logger
+
+# Add project root to path so backend modules can be imported
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.config import Config
+from backend.services.alert_outbox import (
+    CHANNEL_IN_APP, CHANNEL_SMS, AlertOutboxWorker, outbox_status
+)
+
+logger = get_logger(__name__)
+
+
+def build_workers(count, batch_size):
+    """Worker loops sharing one NotificationService (Firestore client, SMS settings)"""
+    from notification_util import NotificationService
+
+    service = NotificationService()
+    handlers = {
+        CHANNEL_IN_APP: service.deliver_in_app,
+        CHANNEL_SMS: service.deliver_sms,
+    }
+    base_id = AlertOutboxWorker(handlers).worker_id
+    return [
+        AlertOutboxWorker(handlers, worker_id=f"{base_id}:{i}", batch_size=batch_size)
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deliver queued alerts from alert_outbox")
+    parser.add_argument("--threads", type=int, default=1, help="Claim loops in this process")
+    parser.add_argument("--batch-size", type=int, default=Config.ALERT_BATCH_SIZE, help="Rows claimed per round trip")
+    parser.add_argument("--once", action="store_true", help="Deliver what is due now, then exit")
+    parser.add_argument("--status", action="store_true", help="Print queue counts and exit")
+    args = parser.parse_args()
+
+    if args.status:
+        status = outbox_status()
+        for channel, counts in sorted(status["counts"].items()):
+            print(f"  {channel:<8} " + "  ".join(f"{k}={v}" for k, v in sorted(counts.items())))
+        print(f"  oldest due: {status['oldest_due_seconds']}s")
+        return 0
+
+    workers = build_workers(max(1, args.threads), args.batch_size)
+
+    if args.once:
+        worker = workers[0]
+        while worker.run_once() >= worker.batch_size:
+            pass
+        logger.info(f"✅ Outbox drained: {worker.stats}")
+        return 0
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    threads = [
+        threading.Thread(target=worker.run, args=(stop,), name=worker.worker_id, daemon=True)
+        for worker in workers
+    ]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        for thread in threads:
+            thread.join(timeout=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
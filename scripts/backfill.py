@@ -0,0 +1,152 @@
+"""
+Resumable WeatherLink historic backfill.
+Splits a date range into 24h API windows, fetches them concurrently
+under a rate limit and checkpoints every stored chunk.
+"""
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+from logger_util import get_logger
+
+logger = get_logger(__name__)
+
+
+class RateLimiter:
+    """Thread-safe limiter: at most `rate` acquisitions per second."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def acquire(self):
+        """Block until the next request slot is available."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class HistoricBackfill:
+    """
+    Backfill weather_observations from the WeatherLink historic API.
+
+    Chunks are aligned to UTC day boundaries so repeated or overlapping runs
+    share checkpoints. Fetches run in a thread pool; inserts and checkpoints
+    happen on the calling thread, so a chunk is only marked done once its
+    rows are committed. A crash between insert and checkpoint just re-fetches
+    that chunk (duplicate rows are skipped by ON CONFLICT).
+    """
+
+    # WeatherLink v2 /historic accepts at most 24 hours per request
+    MAX_WINDOW_SECONDS = 24 * 3600
+
+    def __init__(self, client, db, workers=4, requests_per_second=2.0):
+        self.client = client
+        self.db = db
+        self.workers = max(1, workers)
+        self.rate_limiter = RateLimiter(requests_per_second)
+
+    def plan_chunks(self, start_ts, end_ts):
+        """Split [start_ts, end_ts) into day-aligned windows."""
+        chunks = []
+        window = self.MAX_WINDOW_SECONDS
+        chunk_start = start_ts
+
+        while chunk_start < end_ts:
+            chunk_end = min((chunk_start // window + 1) * window, end_ts)
+            chunks.append((chunk_start, chunk_end))
+            chunk_start = chunk_end
+
+        return chunks
+
+    def pending_chunks(self, chunks):
+        """Drop chunks that a previous run already stored."""
+        if not chunks:
+            return []
+
+        done = self.db.get_completed_chunks(
+            self.client.station_id, self.client.lsid, chunks[0][0], chunks[-1][1]
+        )
+        return [(s, e) for s, e in chunks if done.get(s, -1) < e]
+
+    def _fetch(self, chunk):
+        self.rate_limiter.acquire()
+        return self.client.fetch_range(*chunk)
+
+    def run(self, start_ts, end_ts):
+        """Backfill a time range, skipping chunks already checkpointed."""
+        return self.run_windows(self.plan_chunks(start_ts, end_ts))
+
+    def run_windows(self, windows):
+        """
+        Fetch and store an explicit list of (start_ts, end_ts) windows.
+
+        Windows longer than the API limit are split further.
+
+        Returns:
+            Summary dict with chunk and row counts
+        """
+        chunks = []
+        for start_ts, end_ts in windows:
+            chunks.extend(self.plan_chunks(start_ts, end_ts))
+
+        pending = self.pending_chunks(chunks)
+        summary = {
+            "chunks_total": len(chunks),
+            "chunks_skipped": len(chunks) - len(pending),
+            "chunks_done": 0,
+            "chunks_failed": 0,
+            "records_fetched": 0,
+            "rows_inserted": 0,
+        }
+
+        logger.info("=" * 70)
+        logger.info(f"Backfill: {len(pending)} chunks to fetch "
+                    f"({summary['chunks_skipped']} already done, {self.workers} workers)")
+        logger.info("=" * 70)
+
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self._fetch, chunk): chunk for chunk in pending}
+
+            for future in as_completed(futures):
+                chunk_start, chunk_end = futures[future]
+                day = datetime.fromtimestamp(chunk_start, tz=timezone.utc).strftime('%Y-%m-%d %H:%M')
+
+                try:
+                    records = self.client.tag_records(future.result())
+                    inserted = self.db.insert_observations(records)
+                    self.db.mark_chunk_done(
+                        self.client.station_id, self.client.lsid,
+                        chunk_start, chunk_end, len(records), inserted
+                    )
+                except Exception as e:
+                    summary["chunks_failed"] += 1
+                    logger.error(f"❌ Chunk {day} failed: {e}")
+                    continue
+
+                summary["chunks_done"] += 1
+                summary["records_fetched"] += len(records)
+                summary["rows_inserted"] += inserted
+                logger.info(f"✅ Chunk {day}: {inserted}/{len(records)} new rows "
+                            f"[{summary['chunks_done']}/{len(pending)}]")
+
+        duration = time.monotonic() - started
+        summary["duration_seconds"] = round(duration, 1)
+
+        logger.info("-" * 70)
+        logger.info(f"Backfill finished in {duration:.1f}s: {summary['chunks_done']} chunks, "
+                    f"{summary['rows_inserted']} rows inserted, {summary['chunks_failed']} failed")
+        if summary["chunks_failed"]:
+            logger.warning("⚠️ Re-run the same command to retry failed chunks")
+        logger.info("-" * 70)
+
+        return summary
@@ -0,0 +1,638 @@
+"""
+Backend performance benchmarks.
+Self-contained: runs against the local API stubs (stub_servers.py)
+instead of calling paid APIs.
+
+Usage:
+    python benchmark.py forecast-concurrency --requests 20 --latency 0.5
+    python benchmark.py http-load --concurrency 200 --duration 10
+    python benchmark.py http-load --url http://localhost:8000/api/hotlines
+    python benchmark.py otp-flow --flows 200 --concurrency 20
+    python benchmark.py ingest --rows 10000 100000 1000000
+    python benchmark.py serialize --notifications 10000 --forecast-points 96
+    python benchmark.py encodings --forecast-points 96
+    python benchmark.py sms --recipients 5000 --chunk-size 100 --concurrency 1 4 8 16
+"""
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import threading
+
+# Add project root to path so backend modules can be imported
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from stub_servers import start_stub_server
+
+# Per-request client logging would dominate the timings
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+# ===== Helpers =====
+
+def print_result(label, elapsed, count):
+    print(f"  {label:<28} {elapsed:8.3f}s  ({count / elapsed:8.1f} req/s)")
+
+
+def print_latencies(label, latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    if not latencies:
+        print(f"  {label:<28} no successful requests ({errors} errors)")
+        return
+    p50 = latencies[len(latencies) // 2] * 1000
+    p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+    print(f"  {label:<28} {len(latencies) / elapsed:8.1f} req/s  "
+          f"p50 {p50:7.1f}ms  p95 {p95:7.1f}ms  errors {errors}")
+
+
+async def drive_load(url, concurrency, duration):
+    """Keep `concurrency` clients busy against url for `duration` seconds."""
+    import httpx
+
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    if response.status_code == 200:
+                        latencies.append(time.perf_counter() - start)
+                    else:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return latencies, errors, elapsed
+
+
+def make_forecast_payload(points, seed=42):
+    """Forecast response shaped like predict_batch() output (pandas Timestamps, numpy floats in features)"""
+    import random
+    import numpy as np
+    import pandas as pd
+
+    rng = random.Random(seed)
+    start = pd.Timestamp("2026-01-01")
+
+    def point(i):
+        timestamp = start + pd.Timedelta(hours=i)
+        probability = np.float64(rng.random())
+        event = int(probability > 0.7)
+        return {
+            "timestamp": timestamp.isoformat(),
+            "prediction": {
+                "event": event,
+                "probability": probability,
+                "probabilities": {"no_event": 1 - probability, "event": probability},
+                "hazard_type": "Flood Risk" if event else "None",
+                "hazards": ["heavy_rain", "high_humidity"] if event else [],
+                "timestamp": timestamp.isoformat(),
+                "source": "ml_model",
+                "risk_level": "high" if event else "low",
+            },
+            "features": {
+                "temperature": np.float64(rng.uniform(24, 34)),
+                "temp_min": np.float64(rng.uniform(22, 28)),
+                "temp_max": np.float64(rng.uniform(28, 36)),
+                "pressure": rng.randint(998, 1014),
+                "humidity": rng.randint(55, 100),
+                "wind_speed": np.float64(rng.uniform(0, 18)),
+                "wind_gust": np.float64(rng.uniform(0, 30)),
+                "wind_direction": rng.randint(0, 359),
+                "precipitation": np.float64(rng.choice([0, 0, 0.4, 3.2, 12.5])),
+                "timestamp": timestamp,
+            },
+            "notification": {
+                "title": "Flood Risk" if event else "No hazard",
+                "in_app": "Possible flooding in low-lying areas.",
+                "sms": "HYDROMET: Possible flooding, stay alert.",
+            },
+        }
+
+    predictions = [point(i) for i in range(points)]
+    return {
+        "success": True,
+        "total_predictions": len(predictions),
+        "hazard_events": sum(p["prediction"]["event"] for p in predictions),
+        "predictions": predictions,
+        "summary": {"total_records": len(predictions), "timeline": []},
+    }
+
+
+def start_api_server(app, port):
+    """Run a FastAPI app with uvicorn in a background thread."""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+# ===== Benchmarks =====
+
+def bench_forecast_concurrency(args):
+    """
+    N simultaneous forecast requests inside one event loop.
+
+    The sync client blocks the loop, so requests serialize (~N x latency).
+    The async client overlaps them (~1 x latency).
+    """
+    os.environ.setdefault("OPENWEATHER_API_KEY", "benchmark")
+    # The stub has no budget to protect
+    os.environ.setdefault("API_QUOTA_BACKEND", "off")
+    from backend.ml.weather_client import (
+        OpenWeatherClient,
+        AsyncOpenWeatherClient,
+        close_http_clients,
+    )
+
+    server = start_stub_server(latency=args.latency)
+    OpenWeatherClient.BASE_URL = AsyncOpenWeatherClient.BASE_URL = server.base_urls["OPENWEATHER_BASE_URL"]
+
+    async def sync_route():
+        return OpenWeatherClient().get_forecast(cnt=40)
+
+    async def async_route():
+        return await AsyncOpenWeatherClient().get_forecast(cnt=40)
+
+    async def run(route):
+        start = time.perf_counter()
+        results = await asyncio.gather(*(route() for _ in range(args.requests)))
+        elapsed = time.perf_counter() - start
+        assert all(len(r) == 40 for r in results)
+        return elapsed
+
+    async def main():
+        sync_elapsed = await run(sync_route)
+        async_elapsed = await run(async_route)
+        await close_http_clients()
+        return sync_elapsed, async_elapsed
+
+    print(f"Forecast concurrency: {args.requests} simultaneous requests, {args.latency}s upstream latency")
+    sync_elapsed, async_elapsed = asyncio.run(main())
+    print_result("sync client (blocking)", sync_elapsed, args.requests)
+    print_result("async client", async_elapsed, args.requests)
+    print(f"  speedup: {sync_elapsed / async_elapsed:.1f}x")
+
+    server.shutdown()
+
+    # Async requests must overlap: total time well under the serialized time
+    if async_elapsed > args.latency * max(2, args.requests / 4):
+        print("❌ Async forecast requests are still serializing")
+        return 1
+    return 0
+
+
+def bench_http_load(args):
+    """
+    Requests/second at high client concurrency.
+
+    With --url, load-tests a running API (compare two deployments).
+    Otherwise serves the same query through a sync-psycopg2 route (old
+    pattern: blocks the event loop) and an async-psycopg route, and
+    compares them. Needs the database settings from .env.
+    """
+    if args.url:
+        print(f"HTTP load: {args.concurrency} clients for {args.duration}s -> {args.url}")
+        latencies, errors, elapsed = asyncio.run(drive_load(args.url, args.concurrency, args.duration))
+        print_latencies("target", latencies, errors, elapsed)
+        return 0
+
+    from fastapi import FastAPI
+    from backend.database import get_db_cursor
+    from backend.async_database import get_async_cursor, init_async_pool, close_async_pool
+
+    app = FastAPI()
+
+    @app.on_event("startup")
+    async def startup():
+        await init_async_pool()
+
+    @app.on_event("shutdown")
+    async def shutdown():
+        await close_async_pool()
+
+    @app.get("/sync")
+    async def sync_route():
+        with get_db_cursor() as cur:
+            cur.execute(args.sql)
+            return cur.fetchall()
+
+    @app.get("/async")
+    async def async_route():
+        async with get_async_cursor() as cur:
+            await cur.execute(args.sql)
+            return await cur.fetchall()
+
+    server = start_api_server(app, args.port)
+    root = f"http://127.0.0.1:{args.port}"
+
+    print(f"HTTP load: {args.concurrency} clients for {args.duration}s per route")
+    print(f"  query: {args.sql}")
+    results = {}
+    for route in ("sync", "async"):
+        latencies, errors, elapsed = asyncio.run(
+            drive_load(f"{root}/{route}", args.concurrency, args.duration)
+        )
+        label = "sync psycopg2 (before)" if route == "sync" else "async psycopg (after)"
+        print_latencies(label, latencies, errors, elapsed)
+        results[route] = len(latencies) / elapsed
+
+    server.should_exit = True
+    if results["sync"]:
+        print(f"  speedup: {results['async'] / results['sync']:.1f}x")
+    return 0
+
+
+def bench_otp_flow(args):
+    """
+    /api/otp/send -> /api/otp/verify round trips, without and with
+    server-side prepared statements for the hot-path queries.
+
+    Runs the real OTP router in-process (ASGI transport) against the
+    database from .env, with SMS going to the iProg stub. bcrypt cost is
+    lowered and the OTP digits fixed so the database round trips dominate
+    and the benchmark knows the code to verify.
+    """
+    import uuid
+    import types
+    import httpx
+    import bcrypt
+    from fastapi import FastAPI
+    from backend.config import Config
+    from backend.database import get_db_cursor
+    from backend.async_database import init_async_pool, close_async_pool
+    from backend.api import otp_router
+    import backend.api.otp as otp_module
+
+    server = start_stub_server()
+    Config.IPROG_BASE_URL = server.base_urls["IPROG_BASE_URL"]
+
+    # Benchmark-only shortcuts (see docstring)
+    otp_module.random = types.SimpleNamespace(randint=lambda a, b: 7)
+    fast_gensalt = bcrypt.gensalt
+    bcrypt.gensalt = lambda rounds=4, prefix=b"2b": fast_gensalt(4, prefix)
+
+    phones = [f"0917{i:07d}" for i in range(args.concurrency)]
+    with get_db_cursor() as cur:
+        for phone in phones:
+            cur.execute("""
+                INSERT INTO users (id, first_name, last_name, house_address, barangay,
+                                   phone_number, role, is_verified, created_at, updated_at)
+                SELECT %s, 'Bench', 'User', '-', '-', %s, 'resident', TRUE, NOW(), NOW()
+                WHERE NOT EXISTS (SELECT 1 FROM users WHERE phone_number = %s)
+            """, (str(uuid.uuid4()), phone, phone))
+
+    app = FastAPI()
+    app.include_router(otp_router)
+
+    async def run(prepare):
+        Config.DB_PREPARE_STATEMENTS = prepare
+        await init_async_pool()
+        transport = httpx.ASGITransport(app=app)
+        flows_per_client = max(1, args.flows // len(phones))
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def flow(phone):
+                for _ in range(flows_per_client):
+                    sent = await client.post("/api/otp/send", json={"phone_number": phone})
+                    verified = await client.post("/api/otp/verify", json={"phone_number": phone, "otp_code": "777777"})
+                    assert sent.status_code == 200 and verified.status_code == 200, (sent.text, verified.text)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(flow(phone) for phone in phones))
+            elapsed = time.perf_counter() - start
+
+        await close_async_pool()
+        return elapsed, flows_per_client * len(phones)
+
+    async def main():
+        return await run(prepare=False), await run(prepare=True)
+
+    print(f"OTP flow: {args.flows} send+verify round trips, {args.concurrency} concurrent phones")
+    # Route prints would dominate the timings
+    sys.stdout = open(os.devnull, "w")
+    try:
+        (plain, count), (prepared, _) = asyncio.run(main())
+    finally:
+        sys.stdout = sys.__stdout__
+
+    print_result("unprepared statements", plain, count)
+    print_result("prepared statements", prepared, count)
+    print(f"  speedup: {plain / prepared:.2f}x")
+
+    with get_db_cursor() as cur:
+        cur.execute("DELETE FROM otp_requests WHERE phone_number = ANY(%s)", (phones,))
+        cur.execute("DELETE FROM users WHERE phone_number = ANY(%s) AND first_name = 'Bench'", (phones,))
+
+    server.shutdown()
+    return 0
+
+
+def bench_ingest(args):
+    """
+    insert_observations with INSERT ... VALUES vs COPY + staging merge.
+
+    Runs against the database from .env inside a scratch schema
+    (PGOPTIONS search_path), which is dropped afterwards. Records are
+    synthetic 5-minute archive rows shaped like WeatherLink's, including
+    the diagnostics fields.
+    """
+    import random
+    from database import DatabaseManager
+
+    schema = "bench_ingest"
+    os.environ["PGOPTIONS"] = f"-c search_path={schema}"
+    db = DatabaseManager(min_conn=1, max_conn=2)
+
+    def run_sql(sql):
+        conn = db.get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(sql)
+            conn.commit()
+        finally:
+            db.return_connection(conn)
+
+    def make_records(count):
+        start_ts = 1577836800  # 2020-01-01
+        rng = random.Random(42)
+        return [
+            {
+                "ts": start_ts + i * 300, "station_id": 1, "lsid": 1, "arch_int": 300,
+                "temp_last": rng.uniform(22, 35), "temp_hi": rng.uniform(22, 35), "temp_lo": rng.uniform(22, 35),
+                "hum_last": rng.uniform(50, 100), "dew_point_last": rng.uniform(18, 26),
+                "wind_speed_avg": rng.uniform(0, 20), "wind_speed_hi": rng.uniform(0, 40),
+                "wind_dir_of_prevail": rng.randint(0, 359), "rainfall_mm": rng.choice([0, 0, 0, 0.2, 1.4]),
+                "rain_rate_hi_mm": rng.uniform(0, 30), "pressure": rng.uniform(1000, 1015),
+                "solar_rad_avg": rng.uniform(0, 900), "uv_index_avg": rng.uniform(0, 11),
+                "rssi": -rng.randint(40, 90), "reception": rng.uniform(90, 100),
+                "packets_received": rng.randint(100, 120), "crc_errors": rng.randint(0, 3),
+                "trans_battery_volt": rng.uniform(2.9, 3.3), "supercap_volt_last": rng.uniform(3, 4),
+            }
+            for i in range(count)
+        ]
+
+    run_sql(f"DROP SCHEMA IF EXISTS {schema} CASCADE; CREATE SCHEMA {schema};")
+    try:
+        db.create_tables()
+        print("Observation ingest: INSERT ... VALUES vs COPY + merge")
+
+        for count in args.rows:
+            records = make_records(count)
+            print(f"\n{count} rows")
+            results = {}
+
+            for method in ("values", "copy"):
+                run_sql("TRUNCATE weather_observations, weather_diagnostics;")
+                start = time.perf_counter()
+                inserted = db.insert_observations(records, method=method)
+                results[method] = time.perf_counter() - start
+                assert inserted == count, (method, inserted)
+                print_result(f"{method}", results[method], count)
+
+            # Re-ingesting the same batch must insert nothing
+            assert db.insert_observations(records, method="copy") == 0
+
+            print(f"  speedup: {results['values'] / results['copy']:.2f}x")
+    finally:
+        run_sql(f"DROP SCHEMA IF EXISTS {schema} CASCADE;")
+        db.close_all()
+
+    return 0
+
+
+def bench_serialize(args):
+    """
+    Response rendering: per-row Pydantic models + response_model validation +
+    jsonable_encoder + stdlib json, vs rendering the rows directly with orjson.
+
+    Uses synthetic notification rows and a forecast payload shaped like
+    predict_batch() output (pandas Timestamps and numpy floats in features).
+    """
+    import json
+    import random
+    from datetime import datetime, timedelta
+    from typing import List
+
+    from pydantic import TypeAdapter
+    from fastapi.encoders import jsonable_encoder
+
+    from backend.models.notification import Notification
+    from backend.models.prediction import ForecastPredictionResponse
+    from backend.utils.responses import dumps, orjson
+
+    rng = random.Random(42)
+    now = datetime(2026, 1, 1)
+
+    def stdlib_json(content):
+        return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False).encode("utf-8")
+
+    def best_of(fn):
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            body = fn()
+            timings.append(time.perf_counter() - start)
+        return min(timings), len(body)
+
+    def report(label, fn, baseline=None):
+        elapsed, size = best_of(fn)
+        speedup = f"  {baseline / elapsed:6.1f}x" if baseline else ""
+        print(f"  {label:<36} {elapsed * 1000:9.2f} ms  {size / 1024:9.1f} KiB{speedup}")
+        return elapsed
+
+    print(f"Response rendering (best of {args.repeat}, encoder: {'orjson' if orjson else 'stdlib json fallback'})")
+
+    # Notification list
+    rows = [
+        {
+            "id": f"notif-{i:06d}",
+            "title": rng.choice(["Heavy Rainfall Warning", "Flood Advisory", "Heat Index Alert"]),
+            "message": "Residents of low-lying barangays are advised to stay alert and monitor updates. " * 2,
+            "type": rng.choice(["weather_alert", "warning", "info"]),
+            "sent_to": "all",
+            "status": rng.choice(["sent", "pending", "failed"]),
+            "date_time": now - timedelta(minutes=i),
+        }
+        for i in range(args.notifications)
+    ]
+    notifications_adapter = TypeAdapter(List[Notification])
+
+    print(f"\n{args.notifications} notifications")
+    baseline = report(
+        "models + response_model + json",
+        lambda: stdlib_json(notifications_adapter.validate_python([Notification(**r) for r in rows]))
+    )
+    report("models + json", lambda: stdlib_json([Notification(**r) for r in rows]), baseline)
+    report("rows + dumps()", lambda: dumps(rows), baseline)
+
+    # Forecast predictions
+    payload = make_forecast_payload(args.forecast_points)
+    forecast_adapter = TypeAdapter(ForecastPredictionResponse)
+
+    print(f"\n{args.forecast_points}-point forecast")
+    baseline = report(
+        "model + response_model + json",
+        lambda: stdlib_json(forecast_adapter.validate_python(ForecastPredictionResponse(**payload)))
+    )
+    report("dict + dumps()", lambda: dumps(payload), baseline)
+
+    return 0
+
+
+def bench_encodings(args):
+    """
+    Payload size and encode time per response encoding: JSON, msgpack and
+    CBOR, each with the default row layout and the columnar forecast layout
+    (gzip sizes shown too, as most mobile clients negotiate it).
+    """
+    import gzip
+    from datetime import datetime, timedelta
+    from backend.utils.responses import MEDIA_CBOR, MEDIA_JSON, MEDIA_MSGPACK, cbor2, columnar, encode, msgpack
+
+    media_types = [MEDIA_JSON] + [m for m, lib in ((MEDIA_MSGPACK, msgpack), (MEDIA_CBOR, cbor2)) if lib]
+
+    def report(label, content):
+        for media_type in media_types:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                body = encode(content, media_type)
+                timings.append(time.perf_counter() - start)
+            print(
+                f"  {label + ' ' + media_type.split('/')[1]:<28} {min(timings) * 1000:8.2f} ms"
+                f"  {len(body) / 1024:8.1f} KiB  gzip {len(gzip.compress(body)) / 1024:7.1f} KiB"
+            )
+
+    print(f"Response encodings (best of {args.repeat})")
+
+    payload = make_forecast_payload(args.forecast_points)
+    print(f"\n{args.forecast_points}-point forecast")
+    report("rows", payload)
+    report("columns", {**payload, "layout": "columns", "predictions": columnar(payload["predictions"])})
+
+    now = datetime(2026, 1, 1)
+    rows = [
+        {
+            "id": f"notif-{i:06d}", "title": "Heavy Rainfall Warning",
+            "message": "Residents of low-lying barangays are advised to stay alert.",
+            "type": "weather_alert", "sent_to": "all", "status": "sent",
+            "date_time": now - timedelta(minutes=i),
+        }
+        for i in range(args.notifications)
+    ]
+    print(f"\n{args.notifications} notifications")
+    report("rows", rows)
+
+    return 0
+
+
+def bench_sms(args):
+    """
+    Bulk SMS dispatch against the iProg stub: every number in one send_bulk
+    request (the old behaviour) vs provider-sized chunks sent concurrently,
+    with failed chunks retried. The stub adds --item-latency per number, so a
+    single huge request is as slow as the provider makes it.
+    """
+    from sms_dispatch import BulkSMSSender
+
+    server = start_stub_server(latency=args.latency, item_latency=args.item_latency, error_rate=args.error_rate)
+    url = f"{server.base_urls['IPROG_BASE_URL']}/sms_messages/send_bulk"
+    recipients = [f"09{i:09d}" for i in range(args.recipients)]
+
+    variants = [("single request, no retry", len(recipients), 1, 0)] + [
+        (f"chunks of {args.chunk_size}, x{concurrency}", args.chunk_size, concurrency, args.retries)
+        for concurrency in args.concurrency
+    ]
+
+    print(f"Bulk SMS: {args.recipients} recipients, {args.latency}s + {args.item_latency * 1000:.2f}ms/number "
+          f"latency, {args.error_rate:.0%} injected errors")
+    for label, chunk_size, concurrency, retries in variants:
+        sender = BulkSMSSender(url, "benchmark", chunk_size=chunk_size, concurrency=concurrency,
+                               retries=retries, retry_backoff=args.retry_backoff)
+        result = sender.send(recipients, "HYDROMET: benchmark alert")
+        sender.close()
+
+        chunks = result["chunks"]
+        retried = sum(1 for chunk in chunks if chunk["attempts"] > 1)
+        failed = sum(1 for chunk in chunks if chunk["error"])
+        print(
+            f"  {label:<28} {result['elapsed']:8.3f}s  {result['sent'] / result['elapsed']:8.0f} recipients/s"
+            f"  sent {result['sent']}/{result['recipients']}  chunks {len(chunks)} (retried {retried}, failed {failed})"
+        )
+
+    server.shutdown()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hydromet backend benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p = subparsers.add_parser("forecast-concurrency", help="Sync vs async forecast client under concurrency")
+    p.add_argument("--requests", type=int, default=20, help="Number of simultaneous requests")
+    p.add_argument("--latency", type=float, default=0.5, help="Simulated upstream latency (seconds)")
+    p.set_defaults(func=bench_forecast_concurrency)
+
+    p = subparsers.add_parser("http-load", help="Requests/second at high concurrency (sync vs async DB routes)")
+    p.add_argument("--concurrency", type=int, default=200, help="Concurrent clients")
+    p.add_argument("--duration", type=float, default=10, help="Seconds per run")
+    p.add_argument("--url", help="Load-test a running API instead of the built-in comparison")
+    p.add_argument("--port", type=int, default=8099, help="Port for the built-in comparison server")
+    p.add_argument("--sql", default="SELECT pg_sleep(0.005), 1 AS ok",
+                   help="Query each request runs in the built-in comparison")
+    p.set_defaults(func=bench_http_load)
+
+    p = subparsers.add_parser("otp-flow", help="OTP send/verify with and without prepared statements")
+    p.add_argument("--flows", type=int, default=200, help="Total send+verify round trips per run")
+    p.add_argument("--concurrency", type=int, default=20, help="Concurrent phones")
+    p.set_defaults(func=bench_otp_flow)
+
+    p = subparsers.add_parser("ingest", help="Observation bulk insert: execute_values vs COPY")
+    p.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000], help="Batch sizes")
+    p.set_defaults(func=bench_ingest)
+
+    p = subparsers.add_parser("serialize", help="Response rendering: Pydantic + stdlib json vs orjson on raw rows")
+    p.add_argument("--notifications", type=int, default=10000, help="Rows in the notification list")
+    p.add_argument("--forecast-points", type=int, default=96, help="Points in the forecast response")
+    p.add_argument("--repeat", type=int, default=20, help="Runs per variant (best is reported)")
+    p.set_defaults(func=bench_serialize)
+
+    p = subparsers.add_parser("encodings", help="Payload size/encode time: JSON vs msgpack vs CBOR, row vs columnar")
+    p.add_argument("--forecast-points", type=int, default=96, help="Points in the forecast response")
+    p.add_argument("--notifications", type=int, default=1000, help="Rows in the notification list")
+    p.add_argument("--repeat", type=int, default=20, help="Runs per variant (best is reported)")
+    p.set_defaults(func=bench_encodings)
+
+    p = subparsers.add_parser("sms", help="Bulk SMS throughput: one request vs concurrent chunks with retries")
+    p.add_argument("--recipients", type=int, default=5000, help="Numbers to send to")
+    p.add_argument("--chunk-size", type=int, default=100, help="Recipients per send_bulk request")
+    p.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16], help="Chunks in flight (one run each)")
+    p.add_argument("--retries", type=int, default=2, help="Retry rounds for failed chunks")
+    p.add_argument("--retry-backoff", type=float, default=0.1, help="Seconds before the first retry round")
+    p.add_argument("--latency", type=float, default=0.1, help="Stub latency per request (seconds)")
+    p.add_argument("--item-latency", type=float, default=0.0005, help="Stub latency per recipient (seconds)")
+    p.add_argument("--error-rate", type=float, default=0.05, help="Fraction of stub requests answered with HTTP 500")
+    p.set_defaults(func=bench_sms)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -37,6 +37,9 @@ OPENWEATHER_LAT = float(os.getenv("OPENWEATHER_LAT", "14.3644"))
 OPENWEATHER_LON = float(os.getenv("OPENWEATHER_LON", "121.0619"))
 OPENWEATHER_BASE_URL = os.getenv("OPENWEATHER_BASE_URL", "https://pro.openweathermap.org/data/2.5")
 
+# WeatherLink API defaults
+WEATHERLINK_BASE_URL = os.getenv("WEATHERLINK_BASE_URL", "https://api.weatherlink.com/v2")
+
 if __name__ == "__main__":
     print(f"📁 Configuration Paths:")
     print(f"   BASE_DIR: {BASE_DIR}")
@@ -45,3 +48,4 @@ if __name__ == "__main__":
     print(f"   Model exists: {Path(MODEL_PATH).exists()}")
     print(f"   Metadata exists: {Path(METADATA_PATH).exists()}")
     print(f"   OpenWeather Base URL: {OPENWEATHER_BASE_URL}")
+    print(f"   WeatherLink Base URL: {WEATHERLINK_BASE_URL}")
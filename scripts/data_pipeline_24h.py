@@ -3,19 +3,28 @@ WeatherLink 24h incremental data collection.
 Run daily via cron to accumulate historical data.
 """
 import os
+import sys
 from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 import requests
-from database import DatabaseManager
+# Add project root to path so backend modules can be imported
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.services.api_quota import get_quota_manager, PRIORITY_INGEST
+from database import DatabaseManager, OBSERVATION_RETENTION_MONTHS
+from backfill import HistoricBackfill
 from logger_util import get_logger
 
 load_dotenv()
 logger = get_logger(__name__)
 
+# Days back the daily collection checks for gaps (--gaps alone scans everything unless --gap-days)
+GAP_CHECK_DAYS = int(os.getenv("GAP_CHECK_DAYS", 7))
+
 class WeatherLink24hClient:
     """Client for WeatherLink 24h Historic API."""
     
-    BASE_URL = "https://api.weatherlink.com/v2/historic"
+    BASE_URL = f"{os.getenv('WEATHERLINK_BASE_URL', 'https://api.weatherlink.com/v2').rstrip('/')}/historic"
     
     def __init__(self):
         self.api_key = os.getenv("WEATHERLINK_API_KEY")
@@ -31,6 +40,10 @@ class WeatherLink24hClient:
         end_ts = int(datetime.now(timezone.utc).timestamp())
         start_ts = end_ts - (24 * 3600)
         
+        return self.fetch_range(start_ts, end_ts)
+    
+    def fetch_range(self, start_ts, end_ts):
+        """Fetch archive records between two Unix timestamps (max 24h per call)."""
         url = f"{self.BASE_URL}/{self.station_id}"
         params = {
             "api-key": self.api_key,
@@ -39,9 +52,11 @@ class WeatherLink24hClient:
         }
         headers = {"x-api-secret": self.api_secret}
         
-        logger.info(f"Fetching 24h data: {datetime.fromtimestamp(start_ts).strftime('%Y-%m-%d %H:%M')} "
+        logger.info(f"Fetching data: {datetime.fromtimestamp(start_ts).strftime('%Y-%m-%d %H:%M')} "
                    f"to {datetime.fromtimestamp(end_ts).strftime('%Y-%m-%d %H:%M')}")
         
+        get_quota_manager().acquire("weatherlink", PRIORITY_INGEST, wait=60)
+        
         try:
             response = requests.get(url, params=params, headers=headers, timeout=30)
             response.raise_for_status()
@@ -57,13 +72,20 @@ class WeatherLink24hClient:
         )
         
         if not sensor:
-            logger.error(f"Sensor LSID {self.lsid} not found")
-            return []
+            # Not "no data": raising keeps backfill from checkpointing the window as done
+            raise RuntimeError(f"Sensor LSID {self.lsid} not found in station {self.station_id} response")
         
         records = sensor.get("data", [])
         logger.info(f"Retrieved {len(records)} observations")
         
         return records
+    
+    def tag_records(self, records):
+        """Add station/lsid info to each record."""
+        for record in records:
+            record['station_id'] = self.station_id
+            record['lsid'] = self.lsid
+        return records
 
 class DataPipeline24h:
     """Pipeline for incremental 24h data collection."""
@@ -78,13 +100,19 @@ class DataPipeline24h:
         self.db.create_tables()
         logger.info("✅ Database ready")
     
-    def collect_daily(self):
-        """Fetch and store last 24h of data."""
+    def collect_daily(self, repair_gaps=False):
+        """Fetch and store last 24h of data, then check for gaps."""
         logger.info("=" * 70)
         logger.info(f"Daily data collection: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}")
         logger.info("=" * 70)
         
+        # Outside the try: a pre-partitioning table must stop the cron run, not log and exit 0
+        self.db.require_partitioned()
+        
         try:
+            # Keep next months' partitions ready ahead of time
+            self.db.ensure_partitions()
+            
             # Fetch from API
             records = self.client.fetch_last_24h()
             
@@ -93,9 +121,7 @@ class DataPipeline24h:
                 return 0
             
             # Add station/lsid info to each record
-            for record in records:
-                record['station_id'] = self.client.station_id
-                record['lsid'] = self.client.lsid
+            self.client.tag_records(records)
             
             logger.info(f"Processing {len(records)} records")
             
@@ -105,6 +131,10 @@ class DataPipeline24h:
             
             # Show stats
             self.get_statistics()
+            self.check_gaps(repair=repair_gaps, days=GAP_CHECK_DAYS)
+            
+            if OBSERVATION_RETENTION_MONTHS:
+                self.apply_retention(OBSERVATION_RETENTION_MONTHS)
             
             return inserted
             
@@ -112,6 +142,82 @@ class DataPipeline24h:
             logger.error(f"❌ Collection failed: {e}", exc_info=True)
             return 0
     
+    def backfill(self, start_date, end_date, workers=4, requests_per_second=2.0):
+        """Fetch and store a historic date range, both days inclusive (resumable)."""
+        self.db.require_partitioned()
+        
+        start_ts = int(datetime.strptime(start_date, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp())
+        # Up to midnight after end_date, so the whole end day is fetched
+        end_ts = int(datetime.strptime(end_date, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()) + 86400
+        
+        engine = HistoricBackfill(self.client, self.db, workers=workers, requests_per_second=requests_per_second)
+        summary = engine.run(start_ts, end_ts)
+        
+        self.get_statistics()
+        return summary
+    
+    def check_gaps(self, repair=False, workers=4, requests_per_second=2.0, days=None):
+        """
+        Report missing archive intervals and optionally re-fetch them.
+        
+        Only the last `days` days are scanned when given (the whole table
+        otherwise). Repairs go through the backfill engine, so each gap
+        window is checkpointed and data WeatherLink never recorded isn't
+        re-requested on every run.
+        """
+        start_ts = int(datetime.now(timezone.utc).timestamp()) - days * 86400 if days else None
+        gaps = self.db.find_gaps(start_timestamp=start_ts)
+        missing = sum(g["missing_intervals"] for g in gaps)
+        
+        logger.info("-" * 70)
+        logger.info(f"Gap Analysis{f' (last {days} days)' if days else ''}: "
+                    f"{len(gaps)} gaps, {missing} missing intervals")
+        
+        for gap in sorted(gaps, key=lambda g: g["missing_intervals"], reverse=True)[:10]:
+            start = datetime.fromtimestamp(gap["start_ts"], tz=timezone.utc).strftime('%Y-%m-%d %H:%M')
+            end = datetime.fromtimestamp(gap["end_ts"], tz=timezone.utc).strftime('%Y-%m-%d %H:%M')
+            logger.info(f"  {start} → {end} UTC: {gap['missing_intervals']} missing")
+        
+        if len(gaps) > 10:
+            logger.info(f"  ... and {len(gaps) - 10} more")
+        logger.info("-" * 70)
+        
+        if repair and gaps:
+            engine = HistoricBackfill(self.client, self.db, workers=workers, requests_per_second=requests_per_second)
+            engine.run_windows([(g["start_ts"], g["end_ts"]) for g in gaps])
+        
+        return gaps
+    
+    def refresh_rollups(self, start_date=None, end_date=None):
+        """Rebuild hourly/daily rollups for a date range (default: all data)."""
+        start_ts = end_ts = None
+        if start_date and end_date:
+            start_ts = int(datetime.strptime(start_date, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp())
+            end_ts = int(datetime.strptime(end_date, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()) + 86399
+        self.db.refresh_rollups(start_ts, end_ts)
+    
+    def show_partitions(self):
+        """Show monthly partitions of weather_observations."""
+        partitions = self.db.list_partitions()
+        
+        logger.info("-" * 70)
+        logger.info(f"Partitions: {len(partitions)}")
+        for p in partitions:
+            start = datetime.fromtimestamp(p["start_ts"], tz=timezone.utc).strftime('%Y-%m')
+            logger.info(f"  {p['name']} ({start}): ~{p['rows']} rows, {p['size_bytes'] / 1024 / 1024:.1f} MB")
+        logger.info("-" * 70)
+        
+        return partitions
+    
+    def apply_retention(self, months, archive_dir=None):
+        """Detach (or archive and drop) partitions older than `months`."""
+        removed = self.db.apply_retention(months, archive_dir)
+        if removed:
+            logger.info(f"✅ Retention removed {len(removed)} partitions older than {months} months")
+        else:
+            logger.info(f"No partitions older than {months} months")
+        return removed
+    
     def get_statistics(self):
         """Show database statistics."""
         count = self.db.get_observation_count()
@@ -135,16 +241,18 @@ class DataPipeline24h:
         
         logger.info("-" * 70)
     
-    def export_training_data(self, output_path="training_data.csv", days=None):
-        """Export all data to CSV for model training."""
+    def export_training_data(self, output_path="training_data.csv", days=None, include_diagnostics=False, columns=None):
+        """Export all data to CSV (or Parquet for *.parquet paths) for model training."""
+        export = self.db.export_to_parquet if output_path.endswith(".parquet") else self.db.export_to_csv
+        
         if days:
             end_ts = int(datetime.now(timezone.utc).timestamp())
             start_ts = int((datetime.now(timezone.utc) - timedelta(days=days)).timestamp())
             logger.info(f"Exporting last {days} days to {output_path}")
-            self.db.export_to_csv(output_path, start_ts, end_ts)
+            export(output_path, start_ts, end_ts, include_diagnostics, columns)
         else:
             logger.info(f"Exporting all data to {output_path}")
-            self.db.export_to_csv(output_path)
+            export(output_path, include_diagnostics=include_diagnostics, columns=columns)
         
         logger.info(f"✅ Export complete")
     
@@ -159,25 +267,63 @@ def main():
     parser.add_argument("--setup", action="store_true", help="Initialize database schema")
     parser.add_argument("--collect", action="store_true", help="Fetch and store last 24h")
     parser.add_argument("--stats", action="store_true", help="Show database statistics")
-    parser.add_argument("--export", type=str, help="Export to CSV file")
+    parser.add_argument("--export", type=str, help="Export to CSV file (Parquet if the name ends in .parquet)")
     parser.add_argument("--export-days", type=int, help="Export last N days only")
+    parser.add_argument("--export-diagnostics", action="store_true", help="Include weather_diagnostics columns (radio/battery/GNSS, extremes, derived indices) in --export")
+    parser.add_argument("--export-columns", type=str, help="Comma-separated columns for --export (default all)")
+    parser.add_argument("--backfill", nargs=2, metavar=("START", "END"),
+                        help="Fetch and store a date range (YYYY-MM-DD YYYY-MM-DD, UTC, END inclusive), resumable")
+    parser.add_argument("--gaps", action="store_true", help="Report missing archive intervals")
+    parser.add_argument("--repair-gaps", action="store_true", help="Re-fetch missing intervals (also applies to --collect)")
+    parser.add_argument("--gap-days", type=int, help="Limit --gaps/--repair-gaps to the last N days (--collect uses GAP_CHECK_DAYS)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent fetches for --backfill/--repair-gaps")
+    parser.add_argument("--rate", type=float, default=2.0, help="Max API requests per second for --backfill/--repair-gaps")
+    parser.add_argument("--partitions", action="store_true", help="List monthly observation partitions")
+    parser.add_argument("--retention", type=int, metavar="MONTHS", help="Detach partitions older than MONTHS")
+    parser.add_argument("--archive-dir", type=str, help="With --retention, write expired partitions to gzip CSV here and drop them")
+    parser.add_argument("--migrate-partitions", action="store_true", help="Convert an unpartitioned observations table to monthly partitions")
+    parser.add_argument("--split-diagnostics", action="store_true", help="Move diagnostic/detail columns out of weather_observations (also upgrades an earlier split)")
+    parser.add_argument("--refresh-rollups", nargs="*", metavar="DATE",
+                        help="Rebuild hourly/daily rollups (all data, or START END as YYYY-MM-DD)")
     
     args = parser.parse_args()
     
     pipeline = DataPipeline24h()
     
     try:
+        if args.migrate_partitions:
+            pipeline.db.migrate_to_partitioned()
+        
+        if args.split_diagnostics:
+            pipeline.db.split_diagnostics()
+        
         if args.setup:
             pipeline.setup()
         
         if args.collect:
-            pipeline.collect_daily()
+            pipeline.collect_daily(repair_gaps=args.repair_gaps)
+        elif args.gaps or args.repair_gaps:
+            pipeline.check_gaps(repair=args.repair_gaps, workers=args.workers, requests_per_second=args.rate,
+                                days=args.gap_days)
+        
+        if args.backfill:
+            pipeline.backfill(args.backfill[0], args.backfill[1], args.workers, args.rate)
+        
+        if args.refresh_rollups is not None:
+            pipeline.refresh_rollups(*args.refresh_rollups)
+        
+        if args.retention:
+            pipeline.apply_retention(args.retention, args.archive_dir)
+        
+        if args.partitions:
+            pipeline.show_partitions()
         
         if args.stats:
             pipeline.get_statistics()
         
         if args.export:
-            pipeline.export_training_data(args.export, args.export_days)
+            columns = [c.strip() for c in args.export_columns.split(",")] if args.export_columns else None
+            pipeline.export_training_data(args.export, args.export_days, args.export_diagnostics, columns)
     
     finally:
         pipeline.close()
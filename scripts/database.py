@@ -1,11 +1,245 @@
 import psycopg2
 from psycopg2.pool import SimpleConnectionPool
 from psycopg2.extras import execute_values
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 import os
+import re
+import sys
 from logger_util import get_logger
 
+# Add project root to path so backend modules can be imported
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend import query_metrics
+from backend.database import REPLICA_LAG_SQL
+
 logger = get_logger(__name__)
 
+# Partitions created ahead of the current month (so inserts never miss one)
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", 2))
+
+# Detach/archive partitions older than this many months (0 = keep forever)
+OBSERVATION_RETENTION_MONTHS = int(os.getenv("OBSERVATION_RETENTION_MONTHS", 0))
+
+# Batches at least this large are loaded with COPY instead of INSERT ... VALUES
+COPY_MIN_ROWS = int(os.getenv("COPY_MIN_ROWS", 1000))
+
+# Rows serialized per COPY buffer
+COPY_CHUNK_ROWS = 50000
+
+# Rows per Parquet row group (and per server-side cursor fetch) on export
+PARQUET_ROW_GROUP_ROWS = int(os.getenv("PARQUET_ROW_GROUP_ROWS", 100000))
+
+# Exports read from a replica only while its replay lag is within this many seconds
+REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", 10))
+
+UNPARTITIONED_MESSAGE = ("weather_observations is a plain (unpartitioned) table; "
+                         "run data_pipeline_24h.py --migrate-partitions first")
+
+PARTITION_BOUNDS = re.compile(r"FROM \('?(-?\d+)'?\) TO \('?(-?\d+)'?\)")
+
+# weather_observations columns after (id, ts): the measurements every
+# reader scans (rollup aggregates, model features). Kept narrow so hot
+# scans read few pages; everything else lives in weather_diagnostics
+OBSERVATION_COLUMNS_SQL = """
+    -- Station & Sensor Info
+    station_id INTEGER,
+    lsid INTEGER,
+
+    -- Temperature & Humidity
+    temp_last FLOAT,
+    temp_hi FLOAT,
+    temp_lo FLOAT,
+    temp_avg FLOAT,
+    hum_last FLOAT,
+    hum_hi FLOAT,
+    hum_lo FLOAT,
+    dew_point_last FLOAT,
+    heat_index_hi FLOAT,
+
+    -- Wind
+    wind_speed_hi FLOAT,
+    wind_speed_avg FLOAT,
+    wind_dir_of_prevail INTEGER,
+
+    -- Rainfall
+    rainfall_mm FLOAT,
+    rain_rate_hi_mm FLOAT,
+
+    -- Pressure
+    pressure FLOAT,
+
+    -- Solar & UV
+    solar_rad_hi FLOAT,
+    solar_rad_avg FLOAT,
+    solar_energy FLOAT,
+    uv_index_hi FLOAT,
+    uv_index_avg FLOAT,
+
+    -- Evapotranspiration
+    et FLOAT,
+
+    -- Archive Settings
+    arch_int INTEGER,
+
+    -- Metadata
+    synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    data_source VARCHAR(50) DEFAULT 'weatherlink'
+"""
+
+# weather_diagnostics columns after (station_id, ts): radio, power and
+# GNSS telemetry, plus the measurement detail no hot reader scans
+# (times of extremes, derived comfort indices, imperial duplicates)
+DIAGNOSTIC_COLUMNS_SQL = """
+    -- Transmitter
+    tx_id INTEGER,
+
+    -- Temperature & Humidity Detail
+    temp_hi_at BIGINT,
+    temp_lo_at BIGINT,
+    hum_hi_at BIGINT,
+    hum_lo_at BIGINT,
+    dew_point_hi FLOAT,
+    dew_point_lo FLOAT,
+    dew_point_hi_at BIGINT,
+    dew_point_lo_at BIGINT,
+
+    -- Heat Index, Wind Chill, Wet Bulb
+    heat_index_last FLOAT,
+    heat_index_hi_at BIGINT,
+    wind_chill_last FLOAT,
+    wind_chill_lo FLOAT,
+    wind_chill_lo_at BIGINT,
+    wet_bulb_last FLOAT,
+    wet_bulb_hi FLOAT,
+    wet_bulb_lo FLOAT,
+    wet_bulb_hi_at BIGINT,
+    wet_bulb_lo_at BIGINT,
+
+    -- Wind Detail
+    wind_speed_last FLOAT,
+    wind_speed_hi_at BIGINT,
+    wind_dir_last INTEGER,
+    wind_dir_of_avg INTEGER,
+    wind_speed_hi_dir INTEGER,
+    wind_run FLOAT,
+
+    -- Rainfall Detail
+    rainfall_in FLOAT,
+    rain_rate_hi_in FLOAT,
+    rain_rate_hi_at BIGINT,
+
+    -- Raw Rain Bucket
+    rain_size INTEGER,
+    rainfall_clicks INTEGER,
+    rain_rate_hi_clicks INTEGER,
+
+    -- Solar & UV Detail
+    solar_rad_hi_at BIGINT,
+    uv_dose FLOAT,
+    uv_index_hi_at BIGINT,
+
+    -- THW/THSW Index
+    thw_index_last FLOAT,
+    thw_index_hi FLOAT,
+    thw_index_lo FLOAT,
+    thw_index_hi_at BIGINT,
+    thw_index_lo_at BIGINT,
+    thsw_index_last FLOAT,
+    thsw_index_hi FLOAT,
+    thsw_index_lo FLOAT,
+    thsw_index_hi_at BIGINT,
+    thsw_index_lo_at BIGINT,
+
+    -- WBGT (Wet Bulb Globe Temperature)
+    wbgt_last FLOAT,
+    wbgt_hi FLOAT,
+    wbgt_hi_at BIGINT,
+
+    -- Degree Days
+    hdd FLOAT,
+    cdd FLOAT,
+
+    -- Reception & Quality
+    rssi INTEGER,
+    reception FLOAT,
+    packets_received INTEGER,
+    packets_missed INTEGER,
+    packets_received_streak INTEGER,
+    packets_missed_streak INTEGER,
+    crc_errors INTEGER,
+    resyncs INTEGER,
+    freq_error_avg INTEGER,
+    freq_error_total INTEGER,
+
+    -- Battery & Power
+    trans_battery_volt FLOAT,
+    trans_battery_flag INTEGER,
+    supercap_volt_last FLOAT,
+    solar_volt_last FLOAT,
+    solar_rad_volt_last FLOAT,
+    uv_volt_last INTEGER,
+    spars_volt_last FLOAT,
+    spars_rpm_last FLOAT,
+
+    -- Archive Settings
+    tz_offset INTEGER,
+
+    -- GNSS/GPS
+    gnss_fix BOOLEAN,
+    gnss_clock BOOLEAN,
+    latitude FLOAT,
+    longitude FLOAT,
+    elevation FLOAT
+"""
+
+# (name, type) of each diagnostic column
+DIAGNOSTIC_COLUMN_TYPES = tuple(
+    tuple(line.strip().rstrip(",").split(None, 1)) for line in DIAGNOSTIC_COLUMNS_SQL.splitlines()
+    if line.strip() and not line.strip().startswith("--")
+)
+
+DIAGNOSTIC_COLUMNS = tuple(name for name, _ in DIAGNOSTIC_COLUMN_TYPES)
+
+# Rollup columns: (name, type, aggregate over weather_observations)
+ROLLUP_COLUMNS = [
+    ("samples", "INTEGER", "COUNT(*)"),
+    ("temp_avg", "FLOAT", "AVG(temp_avg)"),
+    ("temp_min", "FLOAT", "MIN(temp_lo)"),
+    ("temp_max", "FLOAT", "MAX(temp_hi)"),
+    ("hum_avg", "FLOAT", "AVG(hum_last)"),
+    ("hum_min", "FLOAT", "MIN(hum_lo)"),
+    ("hum_max", "FLOAT", "MAX(hum_hi)"),
+    ("dew_point_avg", "FLOAT", "AVG(dew_point_last)"),
+    ("heat_index_max", "FLOAT", "MAX(heat_index_hi)"),
+    ("wind_speed_avg", "FLOAT", "AVG(wind_speed_avg)"),
+    ("wind_speed_max", "FLOAT", "MAX(wind_speed_hi)"),
+    ("rainfall_mm_sum", "FLOAT", "SUM(rainfall_mm)"),
+    ("rain_rate_max_mm", "FLOAT", "MAX(rain_rate_hi_mm)"),
+    ("pressure_avg", "FLOAT", "AVG(pressure)"),
+    ("pressure_min", "FLOAT", "MIN(pressure)"),
+    ("pressure_max", "FLOAT", "MAX(pressure)"),
+    ("solar_rad_avg", "FLOAT", "AVG(solar_rad_avg)"),
+    ("solar_rad_max", "FLOAT", "MAX(solar_rad_hi)"),
+    ("solar_energy_sum", "FLOAT", "SUM(solar_energy)"),
+    ("uv_index_avg", "FLOAT", "AVG(uv_index_avg)"),
+    ("uv_index_max", "FLOAT", "MAX(uv_index_hi)"),
+    ("et_sum", "FLOAT", "SUM(et)"),
+]
+
+# Rollup table -> bucket width
+ROLLUP_TABLES = {
+    "weather_hourly": "hour",
+    "weather_daily": "day",
+}
+
+# Day boundaries for daily rollups (rain totals follow the local day)
+ROLLUP_TIMEZONE = ZoneInfo(os.getenv("ROLLUP_TIMEZONE", "Asia/Manila"))
+
+# Tables range-partitioned by month on ts
+PARTITIONED_TABLES = ("weather_observations", "weather_diagnostics")
+
 class DatabaseManager:
     """Manage PostgreSQL connections and operations."""
     
@@ -17,9 +251,18 @@ class DatabaseManager:
             port=int(os.getenv("DB_PORT", 5432)),
             database=os.getenv("DB_NAME", "hydromet_db"),
             user=os.getenv("DB_USER", "weather_app"),
-            password=os.getenv("DB_PASSWORD")
+            password=os.getenv("DB_PASSWORD"),
+            cursor_factory=query_metrics.InstrumentedCursor if query_metrics.enabled() else None
         )
         logger.info(f"Database pool created: {min_conn}-{max_conn} connections")
+        
+        # Monthly partitions already created by this process
+        self._known_partitions = set()
+        
+        # Optional read replica for long exports (opened on first use)
+        self.replica_hosts = [h.strip() for h in os.getenv("DB_REPLICA_HOSTS", "").split(",") if h.strip()]
+        self.replica_pool = None
+        self._replica_conns = set()
     
     def get_connection(self):
         """Get a connection from the pool."""
@@ -29,177 +272,167 @@ class DatabaseManager:
         """Return connection to the pool."""
         self.connection_pool.putconn(conn)
     
+    def get_read_connection(self):
+        """
+        Get a connection for long read-only scans (exports).
+        
+        Uses the first reachable host in DB_REPLICA_HOSTS so multi-year
+        exports don't compete with ingest on the primary; falls back to
+        the primary pool while the replica is more than REPLICA_MAX_LAG
+        seconds behind or its WAL receiver isn't streaming.
+        """
+        if self.replica_pool is None and self.replica_hosts:
+            for name in self.replica_hosts:
+                host, _, port = name.partition(":")
+                try:
+                    self.replica_pool = SimpleConnectionPool(
+                        1,
+                        2,
+                        host=host,
+                        port=int(port or os.getenv("DB_PORT", 5432)),
+                        database=os.getenv("DB_NAME", "hydromet_db"),
+                        user=os.getenv("DB_USER", "weather_app"),
+                        password=os.getenv("DB_PASSWORD"),
+                        connect_timeout=3,
+                        cursor_factory=query_metrics.InstrumentedCursor if query_metrics.enabled() else None
+                    )
+                    logger.info(f"Read replica pool created: {name}")
+                    break
+                except psycopg2.OperationalError as e:
+                    logger.warning(f"⚠️ Read replica {name} unavailable: {e}")
+            else:
+                self.replica_hosts = []
+        
+        if self.replica_pool is not None:
+            conn = self.replica_pool.getconn()
+            try:
+                cursor = conn.cursor()
+                cursor.execute(REPLICA_LAG_SQL)
+                lag = cursor.fetchone()[0]
+                cursor.close()
+                conn.rollback()
+            except psycopg2.Error as e:
+                logger.warning(f"⚠️ Read replica lag check failed: {e}")
+                self.replica_pool.putconn(conn, close=True)
+            else:
+                if lag is not None and lag <= REPLICA_MAX_LAG:
+                    self._replica_conns.add(id(conn))
+                    return conn
+                self.replica_pool.putconn(conn)
+                logger.warning(f"⚠️ Read replica is stale (lag {lag}s, max {REPLICA_MAX_LAG}s); "
+                               f"reading from the primary")
+        return self.get_connection()
+    
+    def return_read_connection(self, conn):
+        """Return a connection from get_read_connection()."""
+        if id(conn) in self._replica_conns:
+            self._replica_conns.discard(id(conn))
+            self.replica_pool.putconn(conn)
+        else:
+            self.return_connection(conn)
+    
+    def log_query_metrics(self, limit=10):
+        """Log the statements that took the most total time (DB_QUERY_METRICS=true)."""
+        if not query_metrics.enabled():
+            return
+        
+        statements = query_metrics.get_query_metrics().statements(limit)
+        if not statements:
+            return
+        
+        logger.info("-" * 70)
+        logger.info("Query time by statement:")
+        for stat in statements:
+            logger.info(f"  {stat['total_ms']:10.1f} ms  {stat['count']:6d}x  p95 {stat['p95_ms']} ms  "
+                        f"{stat['rows_total']} rows  {stat['statement'][:80]}")
+        for slow in query_metrics.get_query_metrics().slow_queries()[:3]:
+            if slow["plan"]:
+                logger.info(f"Slow query plan ({slow['elapsed_ms']} ms): {slow['statement'][:80]}\n{slow['plan']}")
+        logger.info("-" * 70)
+    
     def close_all(self):
         """Close all connections in the pool."""
+        self.log_query_metrics()
         self.connection_pool.closeall()
+        if self.replica_pool is not None:
+            self.replica_pool.closeall()
         logger.info("Database pool closed")
     
     def create_tables(self):
-        """Create weather_observations table with all WeatherLink historic API fields."""
+        """Create weather_observations/weather_diagnostics tables for all WeatherLink historic API fields."""
         conn = self.get_connection()
         try:
             cursor = conn.cursor()
             
-            # SQL to create table - matches WeatherLink historic API
-            create_table_sql = """
-            CREATE TABLE IF NOT EXISTS weather_observations (
-                id SERIAL PRIMARY KEY,
-                ts BIGINT NOT NULL UNIQUE,
-                
-                -- Station & Sensor Info
-                station_id INTEGER,
-                lsid INTEGER,
-                tx_id INTEGER,
-                
-                -- Temperature Fields
-                temp_last FLOAT,
-                temp_hi FLOAT,
-                temp_lo FLOAT,
-                temp_avg FLOAT,
-                temp_hi_at BIGINT,
-                temp_lo_at BIGINT,
-                
-                -- Humidity Fields
-                hum_last FLOAT,
-                hum_hi FLOAT,
-                hum_lo FLOAT,
-                hum_hi_at BIGINT,
-                hum_lo_at BIGINT,
-                
-                -- Heat Index
-                heat_index_last FLOAT,
-                heat_index_hi FLOAT,
-                heat_index_hi_at BIGINT,
-                
-                -- Wind Chill
-                wind_chill_last FLOAT,
-                wind_chill_lo FLOAT,
-                wind_chill_lo_at BIGINT,
-                
-                -- Wet Bulb
-                wet_bulb_last FLOAT,
-                wet_bulb_hi FLOAT,
-                wet_bulb_lo FLOAT,
-                wet_bulb_hi_at BIGINT,
-                wet_bulb_lo_at BIGINT,
-                
-                -- Dew Point
-                dew_point_last FLOAT,
-                dew_point_hi FLOAT,
-                dew_point_lo FLOAT,
-                dew_point_hi_at BIGINT,
-                dew_point_lo_at BIGINT,
-                
-                -- Wind Speed
-                wind_speed_last FLOAT,
-                wind_speed_hi FLOAT,
-                wind_speed_avg FLOAT,
-                wind_speed_hi_at BIGINT,
-                
-                -- Wind Direction
-                wind_dir_last INTEGER,
-                wind_dir_of_prevail INTEGER,
-                wind_dir_of_avg INTEGER,
-                wind_speed_hi_dir INTEGER,
-                
-                -- Wind Run
-                wind_run FLOAT,
-                
-                -- Rainfall
-                rainfall_mm FLOAT,
-                rainfall_in FLOAT,
-                rain_rate_hi_mm FLOAT,
-                rain_rate_hi_in FLOAT,
-                rain_rate_hi_at BIGINT,
-                rain_size INTEGER,
-                rainfall_clicks INTEGER,
-                rain_rate_hi_clicks INTEGER,
-                
-                -- Solar & UV
-                solar_rad_hi FLOAT,
-                solar_rad_avg FLOAT,
-                solar_energy FLOAT,
-                solar_rad_hi_at BIGINT,
-                uv_index_hi FLOAT,
-                uv_index_avg FLOAT,
-                uv_dose FLOAT,
-                uv_index_hi_at BIGINT,
-                
-                -- THW/THSW Index
-                thw_index_last FLOAT,
-                thw_index_hi FLOAT,
-                thw_index_lo FLOAT,
-                thw_index_hi_at BIGINT,
-                thw_index_lo_at BIGINT,
-                thsw_index_last FLOAT,
-                thsw_index_hi FLOAT,
-                thsw_index_lo FLOAT,
-                thsw_index_hi_at BIGINT,
-                thsw_index_lo_at BIGINT,
+            # Observations table - matches WeatherLink historic API
+            if self._is_unpartitioned(cursor):
+                raise RuntimeError(UNPARTITIONED_MESSAGE)
+            else:
+                # Monthly range partitions on ts (Unix seconds). The unique key
+                # must contain the partition key; INCLUDE arch_int keeps gap
+                # analysis an index-only scan.
+                cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS weather_observations (
+                    id BIGSERIAL,
+                    ts BIGINT NOT NULL,
+                    {OBSERVATION_COLUMNS_SQL},
+                    CONSTRAINT weather_observations_ts_key UNIQUE (ts) INCLUDE (arch_int)
+                ) PARTITION BY RANGE (ts);
+                """)
                 
-                -- WBGT (Wet Bulb Globe Temperature)
-                wbgt_last FLOAT,
-                wbgt_hi FLOAT,
-                wbgt_hi_at BIGINT,
+                # Time-range scans on ts use the unique B-tree above. synced_at
+                # grows with insertion order, so a BRIN of a few KB covers it
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_obs_synced_at_brin ON weather_observations USING brin (synced_at);")
                 
-                -- Pressure
-                pressure FLOAT,
+                # Diagnostics side table, one row per observation, joined on (station_id, ts)
+                cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS weather_diagnostics (
+                    station_id INTEGER NOT NULL,
+                    ts BIGINT NOT NULL,
+                    {DIAGNOSTIC_COLUMNS_SQL},
+                    PRIMARY KEY (station_id, ts)
+                ) PARTITION BY RANGE (ts);
+                """)
                 
-                -- Reception & Quality
-                rssi INTEGER,
-                reception FLOAT,
-                packets_received INTEGER,
-                packets_missed INTEGER,
-                packets_received_streak INTEGER,
-                packets_missed_streak INTEGER,
-                crc_errors INTEGER,
-                resyncs INTEGER,
-                freq_error_avg INTEGER,
-                freq_error_total INTEGER,
+                # Columns moved out of weather_observations after the table was first created
+                cursor.execute("ALTER TABLE weather_diagnostics " + ", ".join(
+                    f"ADD COLUMN IF NOT EXISTS {name} {sql_type}" for name, sql_type in DIAGNOSTIC_COLUMN_TYPES
+                ) + ";")
                 
-                -- Battery & Power
-                trans_battery_volt FLOAT,
-                trans_battery_flag INTEGER,
-                supercap_volt_last FLOAT,
-                solar_volt_last FLOAT,
-                solar_rad_volt_last FLOAT,
-                uv_volt_last INTEGER,
-                spars_volt_last FLOAT,
-                spars_rpm_last FLOAT,
+                if self._has_diagnostic_columns(cursor, "weather_observations"):
+                    logger.warning("⚠️ weather_observations still holds diagnostic columns; "
+                                   "run --split-diagnostics to move them to weather_diagnostics")
                 
-                -- Degree Days
-                hdd FLOAT,
-                cdd FLOAT,
-                
-                -- Evapotranspiration
-                et FLOAT,
-                
-                -- Archive Settings
-                arch_int INTEGER,
-                tz_offset INTEGER,
-                
-                -- GNSS/GPS
-                gnss_fix BOOLEAN,
-                gnss_clock BOOLEAN,
-                latitude FLOAT,
-                longitude FLOAT,
-                elevation FLOAT,
-                
-                -- Metadata
-                synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                data_source VARCHAR(50) DEFAULT 'weatherlink'
-            );
-            """
+                created = self._ensure_partitions(cursor, *self._default_partition_range())
             
-            cursor.execute(create_table_sql)
+            # Hourly/daily rollups, refreshed for touched buckets on insert
+            for table in ROLLUP_TABLES:
+                cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    station_id INTEGER NOT NULL,
+                    bucket_start BIGINT NOT NULL,
+                    {", ".join(f"{name} {sql_type}" for name, sql_type, _ in ROLLUP_COLUMNS)},
+                    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (station_id, bucket_start)
+                );
+                """)
             
-            # Create indexes for faster queries
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_ts ON weather_observations(ts);")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_lsid ON weather_observations(lsid);")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_synced_at ON weather_observations(synced_at);")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_ts_lsid ON weather_observations(ts, lsid);")
+            # Backfill progress (one row per completed historic chunk)
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS backfill_checkpoints (
+                station_id VARCHAR(50) NOT NULL,
+                lsid INTEGER NOT NULL,
+                chunk_start BIGINT NOT NULL,
+                chunk_end BIGINT NOT NULL,
+                records_fetched INTEGER,
+                rows_inserted INTEGER,
+                completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (station_id, lsid, chunk_start)
+            );
+            """)
             
             conn.commit()
+            self._known_partitions.update(created)
             logger.info("✅ Database tables created/verified")
             
         except Exception as e:
@@ -210,12 +443,352 @@ class DatabaseManager:
             cursor.close()
             self.return_connection(conn)
     
-    def insert_observations(self, records):
+    # ===== Partitions =====
+    
+    def require_partitioned(self):
+        """Raise if weather_observations is still a plain table (inserts need the partitioned layout)."""
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cursor:
+                unpartitioned = self._is_unpartitioned(cursor)
+            conn.commit()
+        finally:
+            self.return_connection(conn)
+        if unpartitioned:
+            raise RuntimeError(UNPARTITIONED_MESSAGE)
+    
+    @staticmethod
+    def _is_unpartitioned(cursor):
+        """True if weather_observations exists as a plain (pre-partitioning) table."""
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass('weather_observations');")
+        row = cursor.fetchone()
+        return bool(row) and row[0] == 'r'
+    
+    @staticmethod
+    def _table_columns(cursor, table):
+        cursor.execute("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = %s
+            ORDER BY ordinal_position;
+        """, (table,))
+        return [row[0] for row in cursor.fetchall()]
+    
+    def _has_diagnostic_columns(self, cursor, table):
+        return any(c in DIAGNOSTIC_COLUMNS for c in self._table_columns(cursor, table))
+    
+    @staticmethod
+    def _month_start(ts):
+        dt = datetime.fromtimestamp(ts, tz=timezone.utc)
+        return datetime(dt.year, dt.month, 1, tzinfo=timezone.utc)
+    
+    @staticmethod
+    def _next_month(dt):
+        return datetime(dt.year + dt.month // 12, dt.month % 12 + 1, 1, tzinfo=timezone.utc)
+    
+    def _default_partition_range(self):
+        """Current month through PARTITION_MONTHS_AHEAD months ahead."""
+        month = self._month_start(int(datetime.now(timezone.utc).timestamp()))
+        end = month
+        for _ in range(PARTITION_MONTHS_AHEAD + 1):
+            end = self._next_month(end)
+        return int(month.timestamp()), int(end.timestamp()) - 1
+    
+    def _ensure_partitions(self, cursor, start_ts, end_ts):
+        """
+        Create any missing monthly partitions covering [start_ts, end_ts].
+        
+        Returns the names created in the caller's transaction; add them to
+        _known_partitions only once it commits (a rollback undoes them).
+        """
+        known = self._known_partitions
+        created = set()
+        month = self._month_start(start_ts)
+        
+        while int(month.timestamp()) <= end_ts:
+            upper = self._next_month(month)
+            
+            for table in PARTITIONED_TABLES:
+                name = f"{table}_y{month.year}m{month.month:02d}"
+                if name not in known:
+                    cursor.execute(f"""
+                        CREATE TABLE IF NOT EXISTS {name}
+                        PARTITION OF {table}
+                        FOR VALUES FROM ({int(month.timestamp())}) TO ({int(upper.timestamp())});
+                    """)
+                    created.add(name)
+            
+            month = upper
+        
+        return created
+    
+    def ensure_partitions(self, start_ts=None, end_ts=None):
+        """
+        Create monthly partitions for a time range.
+        
+        Defaults to the current month plus PARTITION_MONTHS_AHEAD months.
+        """
+        if start_ts is None or end_ts is None:
+            start_ts, end_ts = self._default_partition_range()
+        
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            created = self._ensure_partitions(cursor, start_ts, end_ts)
+            conn.commit()
+            self._known_partitions.update(created)
+        except Exception as e:
+            logger.error(f"Failed to create partitions: {e}")
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            self.return_connection(conn)
+    
+    def list_partitions(self, table="weather_observations"):
+        """
+        List attached partitions of weather_observations (or weather_diagnostics).
+        
+        Returns:
+            List of dicts (name, start_ts, end_ts, rows, size_bytes) ordered by start_ts
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT c.relname, pg_get_expr(c.relpartbound, c.oid),
+                       GREATEST(c.reltuples, 0)::bigint, pg_total_relation_size(c.oid)
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = %s::regclass;
+            """, (table,))
+            
+            partitions = []
+            for name, bound, rows, size in cursor.fetchall():
+                match = PARTITION_BOUNDS.search(bound or "")
+                if not match:
+                    continue
+                partitions.append({
+                    "name": name,
+                    "start_ts": int(match.group(1)),
+                    "end_ts": int(match.group(2)),
+                    "rows": rows,
+                    "size_bytes": size,
+                })
+            
+            return sorted(partitions, key=lambda p: p["start_ts"])
+        finally:
+            cursor.close()
+            self.return_connection(conn)
+    
+    def apply_retention(self, max_age_months=None, archive_dir=None):
+        """
+        Detach (or archive and drop) partitions older than max_age_months.
+        
+        Applies to weather_observations and weather_diagnostics alike.
+        Detached partitions stay in the database as standalone tables but
+        are no longer scanned through the parent. With archive_dir, each
+        one is written to <archive_dir>/<partition>.csv.gz and dropped.
+        
+        Returns:
+            List of partition names removed
+        """
+        import gzip
+        
+        max_age_months = OBSERVATION_RETENTION_MONTHS if max_age_months is None else max_age_months
+        if not max_age_months:
+            return []
+        
+        cutoff = self._month_start(int(datetime.now(timezone.utc).timestamp()))
+        for _ in range(max_age_months):
+            cutoff = datetime(cutoff.year - (cutoff.month == 1), (cutoff.month - 2) % 12 + 1, 1, tzinfo=timezone.utc)
+        cutoff_ts = int(cutoff.timestamp())
+        
+        expired = [
+            (table, p) for table in PARTITIONED_TABLES
+            for p in self.list_partitions(table) if p["end_ts"] <= cutoff_ts
+        ]
+        removed = []
+        
+        for table, partition in expired:
+            name = partition["name"]
+            conn = self.get_connection()
+            try:
+                cursor = conn.cursor()
+                cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {name};")
+                
+                if archive_dir:
+                    os.makedirs(archive_dir, exist_ok=True)
+                    path = os.path.join(archive_dir, f"{name}.csv.gz")
+                    with gzip.open(path, "wt", encoding="utf-8", newline="") as f:
+                        cursor.copy_expert(f"COPY {name} TO STDOUT WITH CSV HEADER", f)
+                    cursor.execute(f"DROP TABLE {name};")
+                    logger.info(f"📦 Archived {name} ({partition['rows']} rows) to {path}")
+                else:
+                    logger.info(f"✂️ Detached {name} ({partition['rows']} rows)")
+                
+                conn.commit()
+                removed.append(name)
+                self._known_partitions.discard(name)
+            except Exception as e:
+                logger.error(f"Retention failed for {name}: {e}")
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+                self.return_connection(conn)
+        
+        return removed
+    
+    def migrate_to_partitioned(self):
+        """
+        Convert a plain weather_observations table to monthly partitions.
+        
+        The old table is renamed to weather_observations_legacy and its rows
+        copied into the new partitions (diagnostic columns go to
+        weather_diagnostics); drop the legacy table once verified.
+        
+        Returns:
+            Number of rows copied
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            if not self._is_unpartitioned(cursor):
+                logger.info("✅ weather_observations is already partitioned")
+                return 0
+            
+            cursor.execute("ALTER TABLE weather_observations RENAME TO weather_observations_legacy;")
+            cursor.execute("ALTER INDEX IF EXISTS weather_observations_ts_key "
+                           "RENAME TO weather_observations_legacy_ts_key;")
+            for index in ("idx_ts", "idx_lsid", "idx_synced_at", "idx_ts_lsid"):
+                cursor.execute(f"DROP INDEX IF EXISTS {index};")
+            conn.commit()
+        finally:
+            cursor.close()
+            self.return_connection(conn)
+        
+        self.create_tables()
+        
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MIN(ts), MAX(ts) FROM weather_observations_legacy;")
+            min_ts, max_ts = cursor.fetchone()
+            if min_ts is None:
+                conn.commit()
+                return 0
+            
+            created = self._ensure_partitions(cursor, min_ts, max_ts)
+            
+            target = set(self._table_columns(cursor, "weather_observations"))
+            columns = ", ".join(
+                c for c in self._table_columns(cursor, "weather_observations_legacy") if c in target
+            )
+            
+            cursor.execute(f"""
+                INSERT INTO weather_observations ({columns})
+                SELECT {columns} FROM weather_observations_legacy
+                ON CONFLICT (ts) DO NOTHING;
+            """)
+            copied = cursor.rowcount
+            self._copy_diagnostics(cursor, "weather_observations_legacy")
+            cursor.execute("""
+                SELECT setval(pg_get_serial_sequence('weather_observations', 'id'),
+                              (SELECT COALESCE(MAX(id), 1) FROM weather_observations));
+            """)
+            conn.commit()
+            self._known_partitions.update(created)
+            logger.info(f"✅ Copied {copied} rows into partitions; "
+                        f"drop weather_observations_legacy once verified")
+            return copied
+        except Exception as e:
+            logger.error(f"Partition migration failed: {e}")
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            self.return_connection(conn)
+    
+    def _copy_diagnostics(self, cursor, source):
+        """
+        Copy diagnostic columns from a wide observations table into weather_diagnostics.
+        
+        Rows already there (from an earlier, narrower split) get the newly
+        moved columns filled in.
+        """
+        present = set(self._table_columns(cursor, source))
+        columns = [c for c in DIAGNOSTIC_COLUMNS if c in present]
+        if not columns:
+            return 0
+        
+        columns_str = ", ".join(columns)
+        updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in columns)
+        cursor.execute(f"""
+            INSERT INTO weather_diagnostics (station_id, ts, {columns_str})
+            SELECT station_id, ts, {columns_str} FROM {source}
+            WHERE station_id IS NOT NULL
+            ON CONFLICT (station_id, ts) DO UPDATE SET {updates};
+        """)
+        return cursor.rowcount
+    
+    def split_diagnostics(self):
+        """
+        Move diagnostic columns out of an existing weather_observations table.
+        
+        Copies them into weather_diagnostics, then drops them from the
+        measurement table. Dropped columns free their space as partitions
+        are rewritten (VACUUM FULL a partition to reclaim it immediately).
+        
+        Returns:
+            Number of diagnostic rows copied
+        """
+        self.create_tables()
+        
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            if not self._has_diagnostic_columns(cursor, "weather_observations"):
+                logger.info("✅ weather_observations is already split")
+                return 0
+            
+            cursor.execute("SELECT MIN(ts), MAX(ts) FROM weather_observations;")
+            min_ts, max_ts = cursor.fetchone()
+            created = set()
+            if min_ts is not None:
+                created = self._ensure_partitions(cursor, min_ts, max_ts)
+            
+            copied = self._copy_diagnostics(cursor, "weather_observations")
+            
+            present = set(self._table_columns(cursor, "weather_observations"))
+            drops = ", ".join(f"DROP COLUMN {c}" for c in DIAGNOSTIC_COLUMNS if c in present)
+            cursor.execute(f"ALTER TABLE weather_observations {drops};")
+            
+            conn.commit()
+            self._known_partitions.update(created)
+            logger.info(f"✅ Moved diagnostics for {copied} observations to weather_diagnostics")
+            return copied
+        except Exception as e:
+            logger.error(f"Diagnostics split failed: {e}")
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            self.return_connection(conn)
+    
+    # ===== Observations =====
+    
+    def insert_observations(self, records, method=None):
         """
         Bulk insert weather observations.
         
+        Hot measurement fields go to weather_observations; radio/power/GNSS
+        fields and measurement detail go to weather_diagnostics. Batches of COPY_MIN_ROWS or more are
+        streamed with COPY into a temp staging table and merged with one
+        INSERT ... SELECT ... ON CONFLICT; smaller ones use execute_values.
+        
         Args:
             records: List of dicts with observation data
+            method: Force "copy" or "values" (optional)
         
         Returns:
             Number of rows inserted
@@ -223,31 +796,43 @@ class DatabaseManager:
         if not records:
             return 0
         
+        if method is None:
+            method = "copy" if len(records) >= COPY_MIN_ROWS else "values"
+        
         conn = self.get_connection()
         try:
             cursor = conn.cursor()
             
-            # Build column list from first record
-            columns = list(records[0].keys())
-            columns_str = ", ".join(columns)
-            placeholders = ", ".join(["%s"] * len(columns))
+            # Build column lists from first record
+            diagnostic = set(DIAGNOSTIC_COLUMNS)
+            columns = [c for c in records[0].keys() if c not in diagnostic]
+            diag_columns = [c for c in records[0].keys() if c in diagnostic]
             
-            # Prepare INSERT OR IGNORE query
-            query = f"""
-            INSERT INTO weather_observations ({columns_str})
-            VALUES %s
-            ON CONFLICT (ts) DO NOTHING
-            RETURNING id;
-            """
+            # Make sure every month touched by this batch has a partition
+            timestamps = [r["ts"] for r in records if r.get("ts") is not None]
+            created = set()
+            if timestamps:
+                created = self._ensure_partitions(cursor, min(timestamps), max(timestamps))
+            
+            diag_rows = [r for r in records if r.get("station_id") is not None] if diag_columns else []
             
-            # Convert dicts to tuples in correct order
-            values = [tuple(r.get(col) for col in columns) for r in records]
+            if method == "copy":
+                inserted_count = self._merge_copy(cursor, "weather_observations", "ts", columns, records)
+                if diag_rows:
+                    self._merge_copy(cursor, "weather_diagnostics", "station_id, ts",
+                                     ["station_id", "ts"] + diag_columns, diag_rows)
+            else:
+                inserted_count = self._merge_values(cursor, "weather_observations", "ts", columns, records)
+                if diag_rows:
+                    self._merge_values(cursor, "weather_diagnostics", "station_id, ts",
+                                       ["station_id", "ts"] + diag_columns, diag_rows)
             
-            # Execute bulk insert
-            execute_values(cursor, query, values)
-            inserted_count = len(cursor.fetchall())
+            # Re-aggregate only the hours/days this batch touched
+            if inserted_count and timestamps:
+                self._refresh_rollups(cursor, min(timestamps), max(timestamps))
             
             conn.commit()
+            self._known_partitions.update(created)
             logger.info(f"✅ Inserted {inserted_count} observations (attempted {len(records)})")
             return inserted_count
             
@@ -259,48 +844,203 @@ class DatabaseManager:
             cursor.close()
             self.return_connection(conn)
     
-    def get_observation_count(self):
-        """Get total observations in database."""
+    @staticmethod
+    def _merge_values(cursor, table, conflict, columns, records):
+        """INSERT ... VALUES in pages; returns rows inserted."""
+        query = f"""
+        INSERT INTO {table} ({", ".join(columns)})
+        VALUES %s
+        ON CONFLICT ({conflict}) DO NOTHING
+        RETURNING 1;
+        """
+        values = [tuple(r.get(col) for col in columns) for r in records]
+        return len(execute_values(cursor, query, values, page_size=1000, fetch=True))
+    
+    @staticmethod
+    def _merge_copy(cursor, table, conflict, columns, records):
+        """
+        COPY records into a temp staging table, then merge in one statement.
+        
+        Rows are serialized to CSV in COPY_CHUNK_ROWS buffers so memory stays
+        flat for million-row backfills. Returns rows inserted.
+        """
+        import io
+        import csv
+        
+        staging = f"{table}_staging"
+        columns_str = ", ".join(columns)
+        
+        # Only the batch's columns, no defaults/constraints: ids and
+        # synced_at come from the real table on merge
+        cursor.execute(f"""
+            CREATE TEMP TABLE {staging} ON COMMIT DROP AS
+            SELECT {columns_str} FROM {table} WITH NO DATA;
+        """)
+        
+        for start in range(0, len(records), COPY_CHUNK_ROWS):
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for r in records[start:start + COPY_CHUNK_ROWS]:
+                writer.writerow([r.get(col) for col in columns])
+            buffer.seek(0)
+            cursor.copy_expert(f"COPY {staging} ({columns_str}) FROM STDIN WITH (FORMAT csv)", buffer)
+        
+        # ORDER BY ts inserts in time order: sequential B-tree appends, and synced_at
+        # stays correlated with the heap for its BRIN
+        cursor.execute(f"""
+            INSERT INTO {table} ({columns_str})
+            SELECT {columns_str} FROM {staging}
+            ORDER BY ts
+            ON CONFLICT ({conflict}) DO NOTHING;
+        """)
+        return cursor.rowcount
+    
+    # ===== Rollups =====
+    
+    @staticmethod
+    def _bucket_bounds(unit, start_ts, end_ts):
+        """[lo, hi) Unix bounds of the whole hour/day buckets covering start_ts..end_ts."""
+        if unit == "hour":
+            return start_ts - start_ts % 3600, end_ts - end_ts % 3600 + 3600
+        
+        first = datetime.fromtimestamp(start_ts, tz=ROLLUP_TIMEZONE).replace(hour=0, minute=0, second=0, microsecond=0)
+        last = datetime.fromtimestamp(end_ts, tz=ROLLUP_TIMEZONE).replace(hour=0, minute=0, second=0, microsecond=0)
+        return int(first.timestamp()), int((last + timedelta(days=1)).timestamp())
+    
+    def _refresh_rollups(self, cursor, start_ts, end_ts):
+        """Recompute hourly and daily rollup rows for buckets overlapping start_ts..end_ts."""
+        names = ", ".join(name for name, _, _ in ROLLUP_COLUMNS)
+        aggregates = ", ".join(expr for _, _, expr in ROLLUP_COLUMNS)
+        updates = ", ".join(f"{name} = EXCLUDED.{name}" for name, _, _ in ROLLUP_COLUMNS)
+        
+        for table, unit in ROLLUP_TABLES.items():
+            lo, hi = self._bucket_bounds(unit, start_ts, end_ts)
+            
+            # Literal bounds so the planner prunes weather_observations partitions
+            cursor.execute(f"""
+                INSERT INTO {table} (station_id, bucket_start, {names})
+                SELECT station_id,
+                       EXTRACT(EPOCH FROM date_trunc(%s, to_timestamp(ts), %s))::bigint AS bucket_start,
+                       {aggregates}
+                FROM weather_observations
+                WHERE ts >= {lo} AND ts < {hi} AND station_id IS NOT NULL
+                GROUP BY station_id, bucket_start
+                ON CONFLICT (station_id, bucket_start) DO UPDATE
+                SET {updates}, refreshed_at = CURRENT_TIMESTAMP;
+            """, (unit, str(ROLLUP_TIMEZONE)))
+    
+    def refresh_rollups(self, start_ts=None, end_ts=None):
+        """
+        Rebuild rollups for a time range (default: everything stored).
+        
+        Inserts keep rollups current on their own; this is for data loaded
+        before rollups existed or changed outside insert_observations.
+        """
         conn = self.get_connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM weather_observations;")
-            count = cursor.fetchone()[0]
-            return count
+            if start_ts is None or end_ts is None:
+                cursor.execute("SELECT MIN(ts), MAX(ts) FROM weather_observations;")
+                min_ts, max_ts = cursor.fetchone()
+                start_ts = min_ts if start_ts is None else start_ts
+                end_ts = max_ts if end_ts is None else end_ts
+            
+            if start_ts is None:
+                return
+            
+            # A month at a time keeps each aggregate to one partition
+            month = self._month_start(start_ts)
+            while int(month.timestamp()) <= end_ts:
+                upper = self._next_month(month)
+                self._refresh_rollups(cursor, max(start_ts, int(month.timestamp())),
+                                      min(end_ts, int(upper.timestamp()) - 1))
+                conn.commit()
+                month = upper
+            
+            logger.info("✅ Rollups refreshed")
+        except Exception as e:
+            logger.error(f"Rollup refresh failed: {e}")
+            conn.rollback()
+            raise
         finally:
             cursor.close()
             self.return_connection(conn)
     
-    def get_latest_timestamp(self):
-        """Get the most recent observation timestamp."""
+    def get_completed_chunks(self, station_id, lsid, start_ts, end_ts):
+        """
+        Get backfill chunks already stored for a time range.
+        
+        Returns:
+            Dict of chunk_start -> chunk_end
+        """
         conn = self.get_connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("SELECT MAX(ts) FROM weather_observations;")
-            result = cursor.fetchone()[0]
-            return result
+            cursor.execute("""
+                SELECT chunk_start, chunk_end
+                FROM backfill_checkpoints
+                WHERE station_id = %s AND lsid = %s
+                AND chunk_start >= %s AND chunk_start < %s;
+            """, (str(station_id), lsid, start_ts, end_ts))
+            return dict(cursor.fetchall())
         finally:
             cursor.close()
             self.return_connection(conn)
     
-    def export_to_csv(self, output_path, start_timestamp=None, end_timestamp=None):
+    def mark_chunk_done(self, station_id, lsid, chunk_start, chunk_end, records_fetched, rows_inserted):
+        """Record a completed backfill chunk."""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO backfill_checkpoints
+                    (station_id, lsid, chunk_start, chunk_end, records_fetched, rows_inserted, completed_at)
+                VALUES (%s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+                ON CONFLICT (station_id, lsid, chunk_start) DO UPDATE
+                SET chunk_end = GREATEST(backfill_checkpoints.chunk_end, EXCLUDED.chunk_end),
+                    records_fetched = EXCLUDED.records_fetched,
+                    rows_inserted = EXCLUDED.rows_inserted,
+                    completed_at = EXCLUDED.completed_at;
+            """, (str(station_id), lsid, chunk_start, chunk_end, records_fetched, rows_inserted))
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to save backfill checkpoint: {e}")
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            self.return_connection(conn)
+    
+    def find_gaps(self, start_timestamp=None, end_timestamp=None, default_step=900):
         """
-        Export observations to CSV file.
+        Find missing archive intervals between consecutive observations.
+        
+        Compares each ts with the previous one (window over the ts index);
+        a gap is any step longer than the record's archive interval.
         
         Args:
-            output_path: Path to save CSV
             start_timestamp: Unix timestamp for start (optional)
             end_timestamp: Unix timestamp for end (optional)
-        """
-        import csv
+            default_step: Expected step in seconds when arch_int is missing
         
+        Returns:
+            List of dicts with start_ts/end_ts (last and next present
+            observation) and missing_intervals
+        """
         conn = self.get_connection()
         try:
             cursor = conn.cursor()
             
-            # Build query
-            query = "SELECT * FROM weather_observations WHERE 1=1"
-            params = []
+            query = """
+            SELECT prev_ts, ts, CEIL((ts - prev_ts)::numeric / step)::int - 1 AS missing_intervals
+            FROM (
+                SELECT ts,
+                       LAG(ts) OVER (ORDER BY ts) AS prev_ts,
+                       COALESCE(NULLIF(arch_int, 0), %s) AS step
+                FROM weather_observations
+                WHERE 1=1
+            """
+            params = [default_step]
             
             if start_timestamp:
                 query += " AND ts >= %s"
@@ -310,28 +1050,214 @@ class DatabaseManager:
                 query += " AND ts <= %s"
                 params.append(end_timestamp)
             
-            query += " ORDER BY ts ASC;"
+            query += """
+            ) steps
+            WHERE ts - prev_ts > step
+            ORDER BY prev_ts;
+            """
             
             cursor.execute(query, params)
             
-            # Get column names
-            colnames = [desc[0] for desc in cursor.description]
+            return [
+                {"start_ts": prev_ts, "end_ts": ts, "missing_intervals": missing}
+                for prev_ts, ts, missing in cursor.fetchall()
+            ]
+        finally:
+            cursor.close()
+            self.return_connection(conn)
+    
+    def get_observation_count(self):
+        """Get total observations in database."""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM weather_observations;")
+            count = cursor.fetchone()[0]
+            return count
+        finally:
+            cursor.close()
+            self.return_connection(conn)
+    
+    def get_latest_timestamp(self):
+        """Get the most recent observation timestamp."""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MAX(ts) FROM weather_observations;")
+            result = cursor.fetchone()[0]
+            return result
+        finally:
+            cursor.close()
+            self.return_connection(conn)
+    
+    def _export_query(self, cursor, start_timestamp=None, end_timestamp=None,
+                      include_diagnostics=False, columns=None):
+        """
+        Build the observations export SELECT with literal parameters.
+        
+        Returns:
+            SQL text (params already bound, so it can be wrapped in COPY)
+        """
+        obs_columns = self._table_columns(cursor, "weather_observations")
+        available = obs_columns + (list(DIAGNOSTIC_COLUMNS) if include_diagnostics else [])
+        
+        if columns:
+            unknown = [c for c in columns if c not in available]
+            if unknown:
+                raise ValueError(f"Unknown export columns: {', '.join(unknown)}")
+            select = ", ".join(f"o.{c}" if c in obs_columns else f"d.{c}" for c in columns)
+        elif include_diagnostics:
+            select = "o.*, " + ", ".join("d." + c for c in DIAGNOSTIC_COLUMNS)
+        else:
+            select = "o.*"
+        
+        # Range predicates repeated on d so both sides prune partitions
+        ranges = ""
+        params = []
+        
+        if start_timestamp:
+            ranges += " AND {t}.ts >= %s"
+            params.append(start_timestamp)
+        
+        if end_timestamp:
+            ranges += " AND {t}.ts <= %s"
+            params.append(end_timestamp)
+        
+        if include_diagnostics:
+            query = f"""
+            SELECT {select}
+            FROM weather_observations o
+            LEFT JOIN weather_diagnostics d
+                ON d.station_id = o.station_id AND d.ts = o.ts{ranges.format(t="d")}
+            WHERE 1=1{ranges.format(t="o")}
+            """
+            params = params + params
+        else:
+            query = f"SELECT {select} FROM weather_observations o WHERE 1=1{ranges.format(t='o')}"
+        
+        query += " ORDER BY o.ts ASC"
+        return cursor.mogrify(query, params).decode("utf-8")
+    
+    def export_to_csv(self, output_path, start_timestamp=None, end_timestamp=None,
+                      include_diagnostics=False, columns=None):
+        """
+        Export observations to CSV file.
+        
+        Streams COPY (SELECT ...) TO STDOUT straight into the file, so
+        memory use stays flat however many years are exported.
+        
+        Args:
+            output_path: Path to save CSV
+            start_timestamp: Unix timestamp for start (optional)
+            end_timestamp: Unix timestamp for end (optional)
+            include_diagnostics: Join weather_diagnostics columns (optional)
+            columns: Column names to export (optional, default all)
+        
+        Returns:
+            Number of rows exported
+        """
+        conn = self.get_read_connection()
+        try:
+            cursor = conn.cursor()
+            query = self._export_query(cursor, start_timestamp, end_timestamp, include_diagnostics, columns)
             
-            # Write to CSV
             with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=colnames)
-                writer.writeheader()
-                
-                for row in cursor:
-                    row_dict = dict(zip(colnames, row))
-                    writer.writerow(row_dict)
+                cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)", f)
             
             row_count = cursor.rowcount
             logger.info(f"✅ Exported {row_count} rows to {output_path}")
+            return row_count
             
         except Exception as e:
             logger.error(f"Export failed: {e}")
             raise
         finally:
             cursor.close()
-            self.return_connection(conn)
\ No newline at end of file
+            self.return_read_connection(conn)
+    
+    def export_to_parquet(self, output_path, start_timestamp=None, end_timestamp=None,
+                          include_diagnostics=False, columns=None, row_group_size=None):
+        """
+        Export observations to a Parquet file (requires pyarrow).
+        
+        Rows are read through a server-side cursor and written one row
+        group at a time, so only row_group_size rows are held in memory.
+        
+        Args:
+            output_path: Path to save Parquet
+            start_timestamp: Unix timestamp for start (optional)
+            end_timestamp: Unix timestamp for end (optional)
+            include_diagnostics: Join weather_diagnostics columns (optional)
+            columns: Column names to export (optional, default all)
+            row_group_size: Rows per row group (default PARQUET_ROW_GROUP_ROWS)
+        
+        Returns:
+            Number of rows exported
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+        
+        row_group_size = row_group_size or PARQUET_ROW_GROUP_ROWS
+        
+        # Postgres type OID -> Arrow type
+        arrow_types = {
+            16: pa.bool_(),
+            20: pa.int64(),
+            21: pa.int16(),
+            23: pa.int32(),
+            700: pa.float32(),
+            701: pa.float64(),
+            1043: pa.string(),
+            25: pa.string(),
+            1114: pa.timestamp("us"),
+            1184: pa.timestamp("us", tz="UTC"),
+        }
+        
+        conn = self.get_read_connection()
+        writer = None
+        row_count = 0
+        try:
+            cursor = conn.cursor()
+            query = self._export_query(cursor, start_timestamp, end_timestamp, include_diagnostics, columns)
+            cursor.close()
+            
+            # Named cursor: rows stay on the server until fetched
+            cursor = conn.cursor(name="export_parquet")
+            cursor.itersize = row_group_size
+            cursor.execute(query)
+            
+            while True:
+                rows = cursor.fetchmany(row_group_size)
+                
+                if writer is None:
+                    schema = pa.schema([
+                        (desc.name, arrow_types.get(desc.type_code, pa.string()))
+                        for desc in cursor.description
+                    ])
+                    writer = pq.ParquetWriter(output_path, schema, compression="zstd")
+                
+                if not rows:
+                    break
+                
+                arrays = [
+                    pa.array([row[i] for row in rows], type=field.type)
+                    for i, field in enumerate(schema)
+                ]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                row_count += len(rows)
+            
+            logger.info(f"✅ Exported {row_count} rows to {output_path}")
+            return row_count
+            
+        except Exception as e:
+            logger.error(f"Parquet export failed: {e}")
+            raise
+        finally:
+            if writer is not None:
+                writer.close()
+            cursor.close()
+            conn.rollback()
+            self.return_read_connection(conn)
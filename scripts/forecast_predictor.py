@@ -15,6 +15,10 @@ import requests
 from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 
+# Add project root to path so backend modules can be imported
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.services.api_quota import get_quota_manager, PRIORITY_ALERT
 from model import predict_from_features, features_from_openweather_json
 from hazard_type_mapping import determine_hazard_type
 from logger_util import get_logger
@@ -25,7 +29,8 @@ logger = get_logger(__name__)
 class OpenWeatherForecastClient:
     """Fetch weather forecast from OpenWeatherMap API."""
     
-    BASE_URL = "https://api.openweathermap.org/data/2.5/forecast"
+    API_ROOT = os.getenv("OPENWEATHER_BASE_URL", "https://api.openweathermap.org/data/2.5").rstrip("/")
+    BASE_URL = f"{API_ROOT}/forecast"
     
     def __init__(self):
         self.api_key = os.getenv("OPENWEATHER_API_KEY")
@@ -46,6 +51,8 @@ class OpenWeatherForecastClient:
         
         logger.info(f"Fetching forecast for lat={self.lat}, lon={self.lon}")
         
+        get_quota_manager().acquire("openweather", PRIORITY_ALERT, wait=60)
+        
         try:
             response = requests.get(self.BASE_URL, params=params, timeout=30)
             response.raise_for_status()
@@ -61,7 +68,7 @@ class OpenWeatherForecastClient:
     
     def get_current(self):
         """Fetch current weather."""
-        current_url = "https://api.openweathermap.org/data/2.5/weather"
+        current_url = f"{self.API_ROOT}/weather"
         params = {
             "lat": self.lat,
             "lon": self.lon,
@@ -69,6 +76,8 @@ class OpenWeatherForecastClient:
             "units": "metric"
         }
         
+        get_quota_manager().acquire("openweather", PRIORITY_ALERT, wait=60)
+        
         try:
             response = requests.get(current_url, params=params, timeout=30)
             response.raise_for_status()
@@ -7,11 +7,19 @@ from google.cloud import firestore
 from datetime import datetime
 import pytz
 import os
-import requests
+import sys
 import logging
 from pathlib import Path
 from dotenv import load_dotenv
 
+# Add project root to path so backend modules can be imported
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.config import Config
+from backend.services.alert_outbox import CHANNEL_IN_APP, CHANNEL_SMS, enqueue_alerts, update_payload
+from backend.services.recipient_roster import get_recipient_roster
+from sms_dispatch import BulkSMSSender
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -31,6 +39,19 @@ IPROG_BASE_URL = os.getenv("IPROG_BASE_URL")
 #     os.getenv("SMS_RECIPIENT_2", "+63987654321"),  # Secondary admin
 # ]
 
+# Firestore accepts at most 500 writes per batch
+FIRESTORE_BATCH_LIMIT = 500
+
+
+class SMSDeliveryError(Exception):
+    """iProg rejected (or never answered) some or all chunks of a bulk send"""
+    
+    def __init__(self, message, failed_recipients=None, sent=0):
+        super().__init__(message)
+        self.failed_recipients = failed_recipients or []
+        self.sent = sent
+
+
 class NotificationService:
     """Combined in-app + SMS notification service"""
     
@@ -47,6 +68,9 @@ class NotificationService:
 
         if not self.api_key:
             logger.warning("⚠️ IPROG_API_TOKEN not set. SMS notifications disabled.")
+        
+        # Pooled session reused by every alert this service sends
+        self.sms_sender = BulkSMSSender(self.api_url, self.api_key)
     
     def send_notification(
         self,
@@ -59,140 +83,154 @@ class NotificationService:
         send_sms=True,
         sms_recipients=None
     ):
-        """Send both in-app and SMS notifications"""
+        """
+        Send both in-app and SMS notifications
+
+        With ALERT_OUTBOX_ENABLED the alert is queued in alert_outbox and
+        delivered (with retries) by alert_worker.py; if it can't be queued
+        it is sent inline as before.
+        """
         now = dt or datetime.now(pytz.timezone("Asia/Manila"))
         
+        in_app = {
+            'dateTime': now.isoformat(),
+            'message': message,
+            'title': title,
+            'type': notif_type,
+            'status': status,
+            'sentTo': sent_to
+        }
+        sms = None
+        if send_sms and self.api_key:
+            sms = {'message': self._create_sms_message(title, message), 'recipients': sms_recipients}
+            if sms_recipients is None:
+                # Everyone verified when the alert was raised; if the roster can't be
+                # loaded, None is queued and the worker resolves it at delivery
+                try:
+                    sms['recipients'] = self._load_registered_users_phones()
+                except Exception as e:
+                    logger.error(f"❌ Failed to get phone numbers: {e}")
+        
+        if Config.ALERT_OUTBOX_ENABLED:
+            try:
+                messages = [(CHANNEL_IN_APP, in_app)] + ([(CHANNEL_SMS, sms)] if sms else [])
+                ids = enqueue_alerts(messages)
+                logger.info(f"📨 Alert queued: {title} (outbox ids {ids})")
+                return
+            except Exception as e:
+                logger.error(f"❌ Failed to queue alert, sending inline: {e}")
+        
         # Save to Firestore
         try:
-            in_app_doc = {
-                'dateTime': firestore.SERVER_TIMESTAMP,
-                'message': message,
-                'title': title,
-                'type': notif_type,
-                'status': status,
-                'sentTo': sent_to
-            }
-            self.db.collection('notifications').add(in_app_doc)
+            self.db.collection('notifications').add(self._in_app_doc(in_app))
             logger.info(f"✓ In-app notification saved: {title}")
         except Exception as e:
             logger.error(f"✗ Failed to save in-app notification: {str(e)}")
         
         # Send SMS
-        if send_sms and self.api_key:
-            if sms_recipients is None:
-                sms_recipients = self._get_registered_users_phones()
+        if sms:
+            recipients = sms['recipients']
+            if recipients is None:
+                recipients = self._get_registered_users_phones()
             
-            if sms_recipients:
-                sms_message = self._create_sms_message(title, message)
-                self._send_sms_batch(sms_recipients, sms_message)
+            if recipients:
+                try:
+                    self._send_sms_batch(recipients, sms['message'])
+                except SMSDeliveryError:
+                    pass  # already logged
+    
+    def _in_app_doc(self, payload):
+        """Firestore document for a queued in-app payload (dateTime is when the alert was raised)"""
+        doc = dict(payload)
+        doc['dateTime'] = datetime.fromisoformat(payload['dateTime']) if payload.get('dateTime') else firestore.SERVER_TIMESTAMP
+        return doc
+    
+    # ===== ALERT OUTBOX HANDLERS (see alert_worker.py) =====
+    
+    def deliver_in_app(self, rows):
+        """Write queued in-app notifications in Firestore batches"""
+        for start in range(0, len(rows), FIRESTORE_BATCH_LIMIT):
+            batch = self.db.batch()
+            for row in rows[start:start + FIRESTORE_BATCH_LIMIT]:
+                # Document id from the outbox row: a retried delivery overwrites instead of duplicating
+                ref = self.db.collection('notifications').document(f"alert-{row['id']}")
+                batch.set(ref, self._in_app_doc(row['payload']))
+            batch.commit()
+        logger.info(f"✓ {len(rows)} in-app notification(s) saved")
+        return {}
+    
+    def deliver_sms(self, rows):
+        """One bulk send per queued SMS alert; failed rows are returned with their error"""
+        errors = {}
+        for row in rows:
+            payload = row['payload']
+            try:
+                recipients = payload.get('recipients')
+                if recipients is None:
+                    recipients = self._load_registered_users_phones()
+                if recipients:
+                    self._send_sms_batch(recipients, payload['message'])
+            except SMSDeliveryError as e:
+                errors[row['id']] = str(e)
+                if e.sent and e.failed_recipients:
+                    # Retry only the numbers whose chunks failed
+                    update_payload(row['id'], {**payload, 'recipients': e.failed_recipients})
+            except Exception as e:
+                errors[row['id']] = f"{type(e).__name__}: {e}"
+        return errors
     
     def _send_sms_batch(self, recipients, message):
-        """Send SMS to multiple recipients using iProg bulk endpoint"""
+        """
+        Send SMS to multiple recipients using iProg bulk endpoint
+        (chunked, concurrent, failed chunks retried; see sms_dispatch.py)
+        Raises SMSDeliveryError unless every chunk was accepted
+        """
         
         if not self.api_key:
             logger.warning("⚠️ SMS disabled - no API key")
-            return
-        
-        # ✅ Format phone numbers as comma-separated string
-        # Convert 09XXXXXXXXX format to required format
-        phone_numbers = ",".join(recipients)
+            raise SMSDeliveryError("IPROG_API_TOKEN not set")
         
         logger.info(f"📱 Attempting to send SMS to {len(recipients)} recipients")
         logger.info(f"   API URL: {self.api_url}")
-        logger.info(f"   Phone numbers: {phone_numbers}")
         logger.info(f"   Message: {message[:50]}...")
         
-        try:
-            # ✅ iProg API format
-            payload = {
-                'api_token': self.api_key,
-                'phone_number': phone_numbers,  # Comma-separated
-                'message': message
-            }
-            
-            logger.debug(f"   Payload: {payload}")
-            
-            response = requests.post(
-                self.api_url,
-                json=payload,
-                timeout=10
+        result = self.sms_sender.send(recipients, message)
+        
+        chunks = result['chunks']
+        failed_chunks = [chunk for chunk in chunks if chunk['error']]
+        retried = sum(1 for chunk in chunks if chunk['attempts'] > 1)
+        logger.info(
+            f"📱 SMS: {result['sent']}/{result['recipients']} sent in {len(chunks)} chunk(s), "
+            f"{retried} retried, {len(failed_chunks)} failed, {result['elapsed']:.2f}s "
+            f"({result['sent'] / max(result['elapsed'], 1e-9):.0f} recipients/s)"
+        )
+        
+        if failed_chunks:
+            for chunk in failed_chunks:
+                logger.error(f"❌ SMS chunk {chunk['index']} ({chunk['size']} recipients, "
+                             f"{chunk['attempts']} attempts): {chunk['error']}")
+            raise SMSDeliveryError(
+                f"{len(failed_chunks)}/{len(chunks)} SMS chunk(s) failed: {failed_chunks[0]['error']}",
+                failed_recipients=result['failed_recipients'],
+                sent=result['sent'],
             )
-            
-            logger.info(f"   Response Status: {response.status_code}")
-            logger.info(f"   Response Body: {response.text[:200]}...")
-            
-            if response.status_code == 200:
-                try:
-                    result = response.json()
-                    logger.info(f"   Response JSON: {result}")
-                    
-                    # Check for success
-                    if result.get("success") or "successfully" in str(result.get("message", "")).lower():
-                        logger.info(f"✅ Bulk SMS sent successfully to {len(recipients)} recipients")
-                        logger.info(f"📱 SMS: {len(recipients)}/{len(recipients)} sent")
-                        return
-                    else:
-                        logger.error(f"❌ iProg API error: {result.get('message', 'Unknown error')}")
-                except Exception as e:
-                    logger.error(f"❌ Failed to parse JSON response: {e}")
-            else:
-                logger.error(f"❌ HTTP error {response.status_code}: {response.text[:200]}")
-            
-            logger.info(f"📱 SMS: 0/{len(recipients)} sent")
-            
-        except requests.exceptions.Timeout:
-            logger.error(f"❌ SMS request timeout")
-            logger.info(f"📱 SMS: 0/{len(recipients)} sent")
-        except Exception as e:
-            logger.error(f"❌ SMS error: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            logger.info(f"📱 SMS: 0/{len(recipients)} sent")
         
+        logger.info(f"✅ Bulk SMS sent successfully to {len(recipients)} recipients")
+        return result['sent']
+        
+    def _load_registered_users_phones(self):
+        """Phone numbers of verified users, from the in-memory roster (raises if it can't be loaded)"""
+        phones = get_recipient_roster().phones()
+        if not phones:
+            logger.warning("⚠️ No registered users found in database")
+        else:
+            logger.info(f"📱 {len(phones)} verified recipients")
+        return phones
+    
     def _get_registered_users_phones(self):
         """Get phone numbers from database"""
         try:
-            import sys
-            import os
-            sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-            from backend.database import get_db_connection
-            
-            logger.info("📱 Fetching registered users from database...")
-            
-            # Use context manager
-            with get_db_connection() as conn:
-                with conn.cursor() as cursor:
-                    # ✅ FIXED: Use correct column names
-                    cursor.execute("""
-                        SELECT phone_number, first_name, last_name 
-                        FROM users 
-                        WHERE phone_number IS NOT NULL 
-                        AND phone_number != ''
-                        AND is_verified = true
-                    """)
-                    users = cursor.fetchall()
-            
-            if not users:
-                logger.warning("⚠️ No registered users found in database")
-                return []
-            
-            # Extract phone numbers and create display names
-            phones = []
-            user_names = []
-            
-            for user in users:
-                phone = user[0]
-                first_name = user[1] or ""
-                last_name = user[2] or ""
-                full_name = f"{first_name} {last_name}".strip() or phone
-                
-                phones.append(phone)
-                user_names.append(full_name)
-            
-            logger.info(f"📱 Found {len(phones)} verified users: {', '.join(user_names)}")
-            
-            return phones
-            
+            return self._load_registered_users_phones()
         except Exception as e:
             logger.error(f"❌ Failed to get phone numbers: {e}")
             
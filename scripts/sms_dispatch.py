@@ -0,0 +1,142 @@
+"""
+Chunked bulk SMS dispatch for the iProg send_bulk endpoint.
+Splits recipients into provider-sized chunks and sends them concurrently
+over one pooled HTTP session, then retries the chunks that failed (and
+only those) with backoff. Every chunk reports its own outcome.
+
+Phone numbers are never logged, only counts.
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from logger_util import get_logger
+
+# Add project root to path so backend modules can be imported
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.config import Config
+
+logger = get_logger(__name__)
+
+
+def iprog_accepted(response):
+    """iProg answers 200 with success=true or a "...successfully..." message when it takes a batch"""
+    if response.status_code != 200:
+        return f"HTTP error {response.status_code}: {response.text[:200]}"
+    try:
+        result = response.json()
+    except ValueError as e:
+        return f"Failed to parse JSON response: {e}"
+    if result.get("success") or "successfully" in str(result.get("message", "")).lower():
+        return None
+    return f"iProg API error: {result.get('message', 'Unknown error')}"
+
+
+class BulkSMSSender:
+    """
+    Sends one message to many recipients in concurrent send_bulk chunks.
+
+    The session (and its connection pool, sized to `concurrency`) lives as
+    long as the sender, so keep one per process rather than one per alert.
+    """
+
+    def __init__(self, api_url, api_key, chunk_size=None, concurrency=None,
+                 timeout=None, retries=None, retry_backoff=None):
+        self.api_url = api_url
+        self.api_key = api_key
+        self.chunk_size = max(1, chunk_size or Config.SMS_CHUNK_SIZE)
+        self.concurrency = max(1, concurrency or Config.SMS_CONCURRENCY)
+        self.timeout = timeout or Config.SMS_TIMEOUT
+        self.retries = Config.SMS_CHUNK_RETRIES if retries is None else retries
+        self.retry_backoff = Config.SMS_RETRY_BACKOFF if retry_backoff is None else retry_backoff
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _send_chunk(self, chunk, message):
+        """POST one chunk; returns (error or None, Retry-After seconds or None)"""
+        try:
+            response = self.session.post(
+                self.api_url,
+                json={
+                    'api_token': self.api_key,
+                    'phone_number': ",".join(chunk['phones']),
+                    'message': message
+                },
+                timeout=self.timeout
+            )
+        except requests.exceptions.Timeout:
+            return "SMS request timeout", None
+        except requests.exceptions.RequestException as e:
+            return f"SMS error: {e}", None
+
+        retry_after = response.headers.get("Retry-After")
+        try:
+            retry_after = float(retry_after) if retry_after else None
+        except ValueError:
+            retry_after = None
+        return iprog_accepted(response), retry_after
+
+    def _attempt(self, chunk, message):
+        started = time.perf_counter()
+        error, retry_after = self._send_chunk(chunk, message)
+        chunk['attempts'] += 1
+        chunk['error'] = error
+        chunk['retry_after'] = retry_after
+        chunk['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        return chunk
+
+    def send(self, recipients, message):
+        """
+        Send `message` to every recipient.
+
+        Returns a summary: counts, elapsed seconds, per-chunk results
+        (index, size, attempts, error) and the numbers still undelivered
+        after the retries (`failed_recipients`).
+        """
+        started = time.perf_counter()
+        chunks = [
+            {'index': i, 'phones': recipients[start:start + self.chunk_size],
+             'attempts': 0, 'error': None, 'retry_after': None, 'duration_ms': 0.0}
+            for i, start in enumerate(range(0, len(recipients), self.chunk_size))
+        ]
+
+        pending = chunks
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, max(1, len(chunks))),
+                                thread_name_prefix="sms-chunk") as executor:
+            for round_number in range(self.retries + 1):
+                if round_number:
+                    # Back off, longer if the provider asked for it (HTTP 429)
+                    delay = self.retry_backoff * 2 ** (round_number - 1)
+                    delay = max([delay] + [c['retry_after'] for c in pending if c['retry_after']])
+                    logger.info(f"🔁 Retrying {len(pending)} failed SMS chunk(s) in {delay:.1f}s")
+                    time.sleep(delay)
+
+                list(executor.map(lambda chunk: self._attempt(chunk, message), pending))
+                pending = [chunk for chunk in pending if chunk['error']]
+                if not pending:
+                    break
+
+        failed_recipients = [phone for chunk in pending for phone in chunk['phones']]
+        return {
+            'recipients': len(recipients),
+            'sent': len(recipients) - len(failed_recipients),
+            'failed': len(failed_recipients),
+            'elapsed': time.perf_counter() - started,
+            'chunks': [
+                {'index': chunk['index'], 'size': len(chunk['phones']), 'attempts': chunk['attempts'],
+                 'error': chunk['error'], 'duration_ms': chunk['duration_ms']}
+                for chunk in chunks
+            ],
+            'failed_recipients': failed_recipients,
+        }
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,358 @@
+"""
+Local record/replay stubs for OpenWeather, WeatherLink and iProg.
+Lets the prediction, ingest and alert paths run offline for load tests.
+
+Usage:
+    python stub_servers.py --port 8089 --latency 0.2 --error-rate 0.05 --rate-limit 20
+    python stub_servers.py --item-latency 0.002  # bulk SMS slows with the number of recipients
+    python stub_servers.py --record      # proxy to the real APIs and save fixtures
+
+Point the clients at the stub through base-URL config:
+    OPENWEATHER_BASE_URL=http://127.0.0.1:8089/openweather/data/2.5
+    WEATHERLINK_BASE_URL=http://127.0.0.1:8089/weatherlink/v2
+    IPROG_BASE_URL=http://127.0.0.1:8089/iprog/api/v1
+"""
+import re
+import json
+import math
+import time
+import random
+import argparse
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "stubs"
+
+# (method, path pattern, fixture name)
+ROUTES = [
+    ("GET", re.compile(r"^/openweather/data/2\.5/forecast/hourly$"), "openweather_forecast_hourly"),
+    ("GET", re.compile(r"^/openweather/data/2\.5/forecast$"), "openweather_forecast"),
+    ("GET", re.compile(r"^/openweather/data/2\.5/weather$"), "openweather_weather"),
+    ("GET", re.compile(r"^/weatherlink/v2/current/[^/]+$"), "weatherlink_current"),
+    ("GET", re.compile(r"^/weatherlink/v2/historic/[^/]+$"), "weatherlink_historic"),
+    ("POST", re.compile(r"^/iprog/api/v1/sms_messages/send_bulk$"), "iprog_send_bulk"),
+    ("POST", re.compile(r"^/iprog/api/v1/sms_messages$"), "iprog_sms_messages"),
+]
+
+# Real hosts used in --record mode (path after the service prefix is kept)
+DEFAULT_UPSTREAMS = {
+    "openweather": "https://api.openweathermap.org",
+    "weatherlink": "https://api.weatherlink.com",
+    "iprog": "https://sms.iprogtech.com",
+}
+
+# Default number of points returned when the request has no `cnt`
+DEFAULT_COUNTS = {
+    "openweather_forecast": (40, 3 * 3600),
+    "openweather_forecast_hourly": (96, 3600),
+}
+
+
+class TokenBucket:
+    """Simple thread-safe token bucket (rate tokens/second, burst = rate)."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+# ===== Replay =====
+
+def _rebase_list(body, cnt, step):
+    """Cycle recorded forecast points to `cnt` entries starting now."""
+    recorded = body.get("list", [])
+    if not recorded:
+        return body
+
+    first_dt = math.ceil(time.time() / step) * step
+    points = []
+    for i in range(cnt):
+        point = json.loads(json.dumps(recorded[i % len(recorded)]))
+        point["dt"] = first_dt + i * step
+        if "dt_txt" in point:
+            point["dt_txt"] = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(point["dt"]))
+        points.append(point)
+
+    return {**body, "cnt": len(points), "list": points}
+
+
+def _rebase_historic(body, start_ts, end_ts):
+    """Re-time recorded archive records onto the requested (start, end] window."""
+    sensors = []
+    for sensor in body.get("sensors", []):
+        recorded = sensor.get("data", [])
+        if not recorded:
+            sensors.append(sensor)
+            continue
+
+        step = recorded[0].get("arch_int") or 900
+        ts = (start_ts // step + 1) * step
+        records = []
+        i = 0
+        while ts <= end_ts:
+            template = recorded[i % len(recorded)]
+            delta = ts - template["ts"]
+            record = {
+                key: (value + delta if key.endswith("_at") and isinstance(value, int) else value)
+                for key, value in template.items()
+            }
+            record["ts"] = ts
+            records.append(record)
+            ts += step
+            i += 1
+
+        sensors.append({**sensor, "data": records})
+
+    return {**body, "sensors": sensors, "start_timestamp": start_ts, "end_timestamp": end_ts}
+
+
+def _bulk_recipients(request_body):
+    """Comma-separated numbers in an iProg send_bulk request."""
+    try:
+        numbers = json.loads(request_body or b"{}").get("phone_number") or ""
+    except ValueError:
+        return 0
+    return len([n for n in str(numbers).split(",") if n.strip()])
+
+
+def render_fixture(name, body, query):
+    """Adapt a recorded response to the request (counts and timestamps)."""
+    if name in DEFAULT_COUNTS:
+        default_cnt, step = DEFAULT_COUNTS[name]
+        cnt = int(query.get("cnt", [default_cnt])[0])
+        return _rebase_list(body, cnt, step)
+
+    if name == "weatherlink_historic":
+        end_ts = int(query.get("end-timestamp", [int(time.time())])[0])
+        start_ts = int(query.get("start-timestamp", [end_ts - 24 * 3600])[0])
+        return _rebase_historic(body, start_ts, end_ts)
+
+    if name == "weatherlink_current":
+        now = int(time.time())
+        sensors = [
+            {**s, "data": [{**d, "ts": now} for d in s.get("data", [])]}
+            for s in body.get("sensors", [])
+        ]
+        return {**body, "sensors": sensors, "generated_at": now}
+
+    if name == "openweather_weather":
+        return {**body, "dt": int(time.time())}
+
+    return body
+
+
+# ===== Server =====
+
+class StubServer(ThreadingHTTPServer):
+    """HTTP server holding the fixtures and fault-injection settings."""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.0, jitter=0.0, error_rate=0.0, rate_limit=0.0,
+                 fixtures_dir=FIXTURES_DIR, record=False, upstreams=None, item_latency=0.0):
+        super().__init__(address, StubHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.item_latency = item_latency
+        self.error_rate = error_rate
+        self.fixtures_dir = Path(fixtures_dir)
+        self.record = record
+        self.upstreams = {**DEFAULT_UPSTREAMS, **(upstreams or {})}
+        self.buckets = {
+            service: TokenBucket(rate_limit) for service in DEFAULT_UPSTREAMS
+        } if rate_limit > 0 else {}
+        self.fixtures = {}
+        self.stats = {}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def base_urls(self):
+        host, port = self.server_address[:2]
+        root = f"http://{host}:{port}"
+        return {
+            "OPENWEATHER_BASE_URL": f"{root}/openweather/data/2.5",
+            "WEATHERLINK_BASE_URL": f"{root}/weatherlink/v2",
+            "IPROG_BASE_URL": f"{root}/iprog/api/v1",
+        }
+
+    def load_fixture(self, name):
+        if name not in self.fixtures:
+            with open(self.fixtures_dir / f"{name}.json", encoding="utf-8") as f:
+                self.fixtures[name] = json.load(f)
+        return self.fixtures[name]
+
+    def save_fixture(self, name, body):
+        self.fixtures_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.fixtures_dir / f"{name}.json", "w", encoding="utf-8") as f:
+            json.dump(body, f, indent=2)
+        self.fixtures[name] = body
+
+    def count(self, name, outcome):
+        with self._stats_lock:
+            entry = self.stats.setdefault(name, {})
+            entry[outcome] = entry.get(outcome, 0) + 1
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _handle(self, method):
+        server = self.server
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        length = int(self.headers.get("Content-Length") or 0)
+        request_body = self.rfile.read(length) if length else b""
+
+        if url.path == "/_stats":
+            return self._send_json(200, server.stats)
+
+        name = next(
+            (fixture for m, pattern, fixture in ROUTES if m == method and pattern.match(url.path)),
+            None
+        )
+        if name is None:
+            return self._send_json(404, {"message": f"No stub for {method} {url.path}"})
+
+        service = url.path.split("/")[1]
+
+        delay = server.latency + random.uniform(0, server.jitter)
+        if server.item_latency and name == "iprog_send_bulk":
+            delay += server.item_latency * _bulk_recipients(request_body)
+        if delay:
+            time.sleep(delay)
+
+        bucket = server.buckets.get(service)
+        if bucket and not bucket.take():
+            server.count(name, "rate_limited")
+            return self._send_json(429, {"message": "Too Many Requests"}, {"Retry-After": "1"})
+
+        if server.error_rate and random.random() < server.error_rate:
+            server.count(name, "error")
+            return self._send_json(500, {"message": "Injected upstream error"})
+
+        if server.record:
+            return self._proxy(method, name, service, url, request_body)
+
+        try:
+            body = render_fixture(name, server.load_fixture(name), query)
+        except FileNotFoundError:
+            return self._send_json(404, {"message": f"Fixture {name}.json not recorded"})
+
+        server.count(name, "ok")
+        self._send_json(200, body)
+
+    def _proxy(self, method, name, service, url, request_body):
+        """Forward to the real API, save the response as the fixture."""
+        import requests
+
+        upstream = self.server.upstreams[service].rstrip("/")
+        path = url.path[len(f"/{service}"):]
+        target = f"{upstream}{path}" + (f"?{url.query}" if url.query else "")
+        headers = {
+            key: value for key, value in self.headers.items()
+            if key.lower() in ("content-type", "x-api-secret", "authorization")
+        }
+
+        response = requests.request(method, target, data=request_body or None, headers=headers, timeout=30)
+        try:
+            body = response.json()
+        except ValueError:
+            body = {"raw": response.text}
+
+        if response.status_code == 200:
+            self.server.save_fixture(name, body)
+            print(f"💾 Recorded {name} from {upstream}")
+
+        self.server.count(name, "recorded")
+        self._send_json(response.status_code, body)
+
+
+def start_stub_server(host="127.0.0.1", port=0, **options):
+    """Start a stub server in a background thread and return it."""
+    server = StubServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record/replay stubs for external weather and SMS APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.0, help="Added latency per request (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency up to N seconds")
+    parser.add_argument("--item-latency", type=float, default=0.0,
+                        help="Extra latency per recipient of an iProg bulk SMS request (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests/second per service before HTTP 429 (0 = off)")
+    parser.add_argument("--fixtures", default=str(FIXTURES_DIR), help="Fixture directory")
+    parser.add_argument("--record", action="store_true", help="Proxy to the real APIs and save fixtures")
+    parser.add_argument("--upstream", action="append", default=[], metavar="SERVICE=URL",
+                        help="Override a real API host for --record (e.g. openweather=https://pro.openweathermap.org)")
+
+    args = parser.parse_args()
+    upstreams = dict(item.split("=", 1) for item in args.upstream)
+
+    server = StubServer(
+        (args.host, args.port),
+        latency=args.latency,
+        jitter=args.jitter,
+        item_latency=args.item_latency,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        fixtures_dir=args.fixtures,
+        record=args.record,
+        upstreams=upstreams,
+    )
+
+    print("=" * 70)
+    print(f"🧪 API stubs {'(RECORDING)' if args.record else '(replay)'} on {args.host}:{args.port}")
+    print(f"   latency={args.latency}s jitter={args.jitter}s item_latency={args.item_latency}s "
+          f"error_rate={args.error_rate} rate_limit={args.rate_limit}/s")
+    print("   Point the clients here with:")
+    for key, value in server.base_urls.items():
+        print(f"     export {key}={value}")
+    print("=" * 70)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Stub server stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()